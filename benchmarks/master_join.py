@@ -0,0 +1,106 @@
+"""
+Benchmark: chained pd.merge vs. the single-pass sort-merge join for the master table.
+
+    python benchmarks/master_join.py                  # 1M, 10M and 50M rows per source
+    python benchmarks/master_join.py --rows 1000000 --check
+
+Each source gets ~`rows` rows over a synthetic national key space (19k pincodes in
+~750 districts across 36 states, as many days as needed), keys typed as in
+preprocessing.schema, rows in key order, with 0.1% duplicate rows like the raw feed.
+--shuffle randomizes row order to measure the unsorted path.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.preprocessing.feature_engineering import create_master_table
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS
+
+N_STATES = 36
+N_DISTRICTS = 750
+N_PINCODES = 19000
+COVERAGE = 0.8  # share of (date, pincode) keys present in each source
+
+
+def make_places(rng):
+    district_of_pin = np.sort(rng.integers(0, N_DISTRICTS, N_PINCODES))
+    state_of_district = np.sort(rng.integers(0, N_STATES, N_DISTRICTS))
+    states = pd.Index([f"State {i:02d}" for i in range(N_STATES)])
+    districts = pd.Index([f"District {i:03d}" for i in range(N_DISTRICTS)])
+    pincodes = pd.Index([str(110000 + i * 37) for i in range(N_PINCODES)])
+    return {
+        'state': pd.Categorical.from_codes(state_of_district[district_of_pin], categories=states),
+        'district': pd.Categorical.from_codes(district_of_pin, categories=districts),
+        'pincode': pd.Categorical.from_codes(np.arange(N_PINCODES), categories=pincodes),
+    }
+
+
+def make_source(rng, source, rows, places, shuffle=False):
+    n_days = int(np.ceil(rows / (COVERAGE * N_PINCODES)))
+    present = np.flatnonzero(rng.random(n_days * N_PINCODES, dtype=np.float32) < COVERAGE)
+    # Duplicate rows, as preserved in the raw stream
+    dups = rng.choice(present, size=max(1, len(present) // 1000), replace=False)
+    # Rows in (date, state, district, pincode) order, like the date-ordered daily feed
+    keys = np.sort(np.concatenate([present, dups]))
+
+    if shuffle:
+        rng.shuffle(keys)
+
+    day, pin = np.divmod(keys, N_PINCODES)
+    frame = {
+        'date': pd.Timestamp('2016-01-01') + pd.to_timedelta(day, unit='D'),
+        'state': places['state'].take(pin),
+        'district': places['district'].take(pin),
+        'pincode': places['pincode'].take(pin),
+    }
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        frame[col] = rng.integers(0, 500, len(keys), dtype=np.int32)
+    return pd.DataFrame(frame)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(rows, check, shuffle=False, seed=42):
+    rng = np.random.default_rng(seed)
+    places = make_places(rng)
+    datasets = {source: make_source(rng, source, rows, places, shuffle) for source in SOURCE_COUNT_COLUMNS}
+    sizes = ", ".join(f"{k}={len(v):,}" for k, v in datasets.items())
+    print(f"\n--- {rows:,} rows per source ({sizes}) ---")
+
+    merged_sm, t_sm = timed(lambda: create_master_table(datasets, engine='sort_merge'))
+    print(f"sort_merge : {t_sm:8.2f}s  -> {len(merged_sm):,} rows")
+    del merged_sm
+
+    merged_pd, t_pd = timed(lambda: create_master_table(datasets, engine='pandas'))
+    print(f"pd.merge x2: {t_pd:8.2f}s  -> {len(merged_pd):,} rows")
+    print(f"speedup    : {t_pd / t_sm:8.2f}x")
+
+    if check:
+        merged_sm = create_master_table(datasets, engine='sort_merge')
+        keys = ['state', 'district', 'pincode']
+        same = merged_pd.astype({k: str for k in keys}).equals(merged_sm.astype({k: str for k in keys}))
+        print(f"identical  : {same}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument('--check', action='store_true', help="Also verify both engines return identical frames")
+    parser.add_argument('--shuffle', action='store_true', help="Shuffle rows instead of feeding them in key order")
+    args = parser.parse_args(argv)
+    for rows in args.rows:
+        run(rows, args.check, args.shuffle)
+
+
+if __name__ == "__main__":
+    main()
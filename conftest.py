@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# Districts of the synthetic district-day frames (two share a state)
+DISTRICTS = [('Bihar', 'Patna'), ('Bihar', 'Gaya'), ('Kerala', 'Kollam')]
+
+
+def _district_days(days=60, start='2025-01-01', districts=DISTRICTS, seed=0, **counts):
+    """
+    One row per district and day (aggregate_by_district layout), with a Poisson
+    count column for every column=mean keyword, drawn in the order given.
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'date': np.repeat(pd.date_range(start, periods=days), len(districts)),
+        'state': np.tile([s for s, _ in districts], days),
+        'district': np.tile([d for _, d in districts], days),
+    })
+    for col, mean in counts.items():
+        frame[col] = rng.poisson(mean, len(frame)).astype('float64')
+    return frame
+
+
+@pytest.fixture
+def district_days():
+    """Factory for synthetic district-day frames, see _district_days."""
+    return _district_days
@@ -11,13 +11,21 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.preprocessing.data_loader import load_all_datasets
 from src.preprocessing.feature_engineering import create_master_table, aggregate_by_district
+from src.preprocessing.storage import MASTER_STORE_NAME, load_master_table, store_exists
+from src.preprocessing.shared_store import SNAPSHOT_COLUMNS, SNAPSHOT_NAME, open_snapshot, publish_frames, snapshot_version
+from src.preprocessing.integrity import INTEGRITY_NAME, SOURCE_DUPLICATES_NAME, build_duplicate_index, query_duplicates
+from src.preprocessing.cube import CUBE_NAME, ROW_COUNT, build_cube, load_cube, query_cube
+from src.preprocessing.sql_layer import DISTRICT_DAILY_VIEW, SOURCE_DUPLICATES_VIEW, open_sql_layer
 from src.metrics.stress_index import calculate_ausi
-from src.models.anomaly_detection import detect_anomalies, specific_fraud_rules
-from src.models.forecasting import predict_biometric_demand
-from src.models.clustering import cluster_districts
-from src.analytics.migration_analysis import classify_growth_patterns, calculate_migration_score
+from src.models.anomaly_detection import MODEL_DIR_NAME, detect_anomalies, load_anomaly_model, specific_fraud_rules
+from src.models.forecasting import FORECASTS_NAME, load_forecasts, predict_biometric_demand
+from src.models.forecast_cache import FORECAST_CACHE_NAME, ForecastCache, district_data_hashes
+from src.models.clustering import CENTROIDS_NAME, PINCODE_PLAN_NAME, cluster_districts, load_centroids
+from src.analytics.migration_analysis import classify_growth_patterns
+from src.analytics.feature_frame import FeatureFrame
 from src.analytics.insights import generate_ai_insights
-from src.utils.geo_utils import get_lat_lon
+from src.utils.geo_utils import lookup_lat_lon
+from src.utils.name_resolver import RESOLVER_CACHE_NAME, load_resolver_cache
 import sys
 
 # Ensure root is in path to import generator
@@ -79,29 +87,31 @@ st.markdown("""
     h2 { color: #4e73df; font-weight: 700; font-size: 1.8rem; }
     h3 { color: #5a5c69; font-weight: 600; font-size: 1.4rem; }
     
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {
+    /* Section navigation styling (horizontal radio rendered as tabs) */
+    .stRadio [role="radiogroup"] {
         gap: 8px;
         background-color: transparent;
         padding-bottom: 2px;
     }
-    .stTabs [data-baseweb="tab"] {
+    .stRadio [role="radiogroup"] > label {
         height: 48px;
         white-space: pre-wrap;
         background-color: white;
         border-radius: 8px 8px 0px 0px;
-        gap: 1px;
         padding: 10px 24px;
         border: 1px solid #e3e6f0;
         border-bottom: none;
         color: #858796;
         font-weight: 600;
     }
-    .stTabs [aria-selected="true"] {
+    .stRadio [role="radiogroup"] > label:has(input:checked) {
         background-color: #4e73df !important;
         color: white !important;
         border: 1px solid #4e73df;
     }
+    .stRadio [role="radiogroup"] > label > div:first-child {
+        display: none;
+    }
 
     /* Chart Containers */
     .chart-box {
@@ -115,13 +125,18 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Data Loading ---
-@st.cache_data
-def get_dashboard_data():
+# Columns of the master table the dashboard actually uses (projected on read)
+DASHBOARD_COLUMNS = SNAPSHOT_COLUMNS
+
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed')
+
+def load_dashboard_frames(processed_dir):
     # Try loading processed data first (Standard Pipeline)
-    processed_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed', 'merged_master_table.csv')
+    has_processed = store_exists(os.path.join(processed_dir, MASTER_STORE_NAME)) or \
+        os.path.exists(os.path.join(processed_dir, 'merged_master_table.csv'))
     
     # Cloud Deployment Fix: Check if data exists, if not, generate synthetic data instantly
-    if not os.path.exists(processed_path):
+    if not has_processed:
         # Check raw data folders
         raw_root = os.path.join(os.path.dirname(__file__), '..')
         # Simple check if enrolment folder has any CSV
@@ -142,11 +157,9 @@ def get_dashboard_data():
                 st.error(f"Failed to generate demo data: {e}")
 
     # Retry pipeline logic
-    if os.path.exists(processed_path):
-        raw_master = pd.read_csv(processed_path)
-        if 'date' in raw_master.columns:
-            raw_master['date'] = pd.to_datetime(raw_master['date'])
-    else:
+    # Parquet store: only the dashboard's columns are decoded, dates arrive already typed
+    raw_master = load_master_table(processed_dir, columns=DASHBOARD_COLUMNS)
+    if raw_master is None:
         # Fallback to raw reconstruction
         data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
         datasets = load_all_datasets(data_dir)
@@ -168,13 +181,66 @@ def get_dashboard_data():
     
     # Calculate global metrics once
     dist_df = calculate_ausi(dist_df)
-    dist_df = detect_anomalies(dist_df)
-    
+    # Score with the pipeline's persisted model (fits one here only if none exists yet)
+    dist_df = detect_anomalies(dist_df, model=load_anomaly_model(os.path.join(processed_dir, MODEL_DIR_NAME)))
     return raw_master, dist_df
 
+@st.cache_resource(max_entries=1)
+def get_dashboard_data(snapshot):
+    # One instance per server process shared by every session (nothing is pickled per
+    # session); `snapshot` is the published version, so a new pipeline run reloads it.
+    # The frames are read-only views of the memory-mapped snapshot files.
+    processed_dir = PROCESSED_DIR
+    snapshot_dir = os.path.join(processed_dir, SNAPSHOT_NAME)
+    frames = open_snapshot(snapshot_dir)
+    if frames is None:
+        # No pipeline snapshot yet: build the frames here and publish them for the other workers
+        raw_master, dist_df = load_dashboard_frames(processed_dir)
+        frames = {'raw_master': raw_master, 'dist_df': dist_df, 'duplicates': build_duplicate_index(raw_master)}
+        try:
+            publish_frames(frames, snapshot_dir)
+            frames = open_snapshot(snapshot_dir)
+        except (ImportError, OSError):
+            pass
+    raw_master, dist_df = frames['raw_master'], frames['dist_df']
+    
+    # Duplicate-key index of the raw stream (snapshots published before it existed lack it)
+    duplicates = frames['duplicates'] if 'duplicates' in frames else build_duplicate_index(raw_master)
+    
+    # District names already resolved by the pipeline
+    load_resolver_cache(os.path.join(processed_dir, RESOLVER_CACHE_NAME))
+    
+    # Aggregate cube for the sidebar filters (written by the pipeline, built here otherwise)
+    cube = load_cube(os.path.join(processed_dir, CUBE_NAME))
+    if cube is None:
+        cube = build_cube(dist_df)
+    
+    # Nightly batch forecasts (None until the pipeline has produced them)
+    forecasts = load_forecasts(os.path.join(processed_dir, FORECASTS_NAME))
+    
+    # Per-district snapshot hashes (forecast cache keys)
+    data_hashes = district_data_hashes(dist_df)
+    
+    return raw_master, dist_df, duplicates, cube, forecasts, data_hashes
+
+@st.cache_resource(max_entries=1)
+def get_sql_layer(snapshot):
+    # In-process SQL over the store, one per worker and published version (None without duckdb)
+    try:
+        return open_sql_layer(PROCESSED_DIR)
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_forecast_cache():
+    # One in-memory LRU per worker process, sharing the on-disk layer
+    return ForecastCache(os.path.join(PROCESSED_DIR, FORECAST_CACHE_NAME))
+
 try:
     with st.spinner("Connecting to Aadhaar Data Lake..."):
-        raw_df, df = get_dashboard_data()
+        snapshot = snapshot_version(os.path.join(PROCESSED_DIR, SNAPSHOT_NAME))
+        raw_df, df, dup_index, cube, forecasts, data_hashes = get_dashboard_data(snapshot)
+        forecast_cache = get_forecast_cache()
 except Exception as e:
     st.error(f"Critical Data Error: {e}")
     st.stop()
@@ -186,9 +252,11 @@ with st.sidebar:
     st.markdown("---")
     
     # Date Filter
-    # Ensure pandas datetime conversion
-    df['date'] = pd.to_datetime(df['date'])
-    raw_df['date'] = pd.to_datetime(raw_df['date'])
+    # Ensure pandas datetime conversion (the shared frames are read-only: rebind, never assign in place)
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=pd.to_datetime(df['date']))
+    if not pd.api.types.is_datetime64_any_dtype(raw_df['date']):
+        raw_df = raw_df.assign(date=pd.to_datetime(raw_df['date']))
     
     min_date = df['date'].min()
     max_date = df['date'].max()
@@ -221,12 +289,82 @@ if selected_state != "All Regions":
 if selected_district != "All Districts":
     mask = mask & (df['district'] == selected_district)
 
-filtered_df = df[mask].copy()
+filtered_df = df[mask]
+
+# Derived columns (migration flux, growth rate...) computed once per rerun and shared by the sections
+features = FeatureFrame(filtered_df)
+
+# Filter + group-by questions for the summary charts are answered from the cube
+cube_filters = dict(
+    start_date=date_range[0], end_date=date_range[1],
+    state=selected_state if selected_state != "All Regions" else None,
+    district=selected_district if selected_district != "All Districts" else None
+)
+
+# --- Derived datasets ---
+# Memoized on (snapshot version, filter state) and computed only by the section that
+# shows them, so a filter change costs the visible section's work. Arguments with a
+# leading underscore are the frames themselves (not hashed: the key identifies them).
+
+@st.cache_data(max_entries=32)
+def get_insights(snapshot, start_date, end_date, state, district, _filtered_df):
+    return generate_ai_insights(_filtered_df, state)
+
+@st.cache_data(max_entries=32)
+def get_growth_patterns(snapshot, start_date, end_date, state, district, _features):
+    # District summary aggregated in SQL next to the store when available (same result)
+    sql_layer = get_sql_layer(snapshot)
+    if sql_layer is not None:
+        return classify_growth_patterns(sql_layer.frame(
+            DISTRICT_DAILY_VIEW, start_date, end_date,
+            states=[state] if state else None, districts=[district] if district else None
+        ))
+    return classify_growth_patterns(_features)
+
+@st.cache_data(max_entries=32)
+def get_duplicate_report(snapshot, start_date, end_date, state, _dup_index):
+    # Raw Data Check: answered from the duplicate-key index (period and state filter)
+    return query_duplicates(_dup_index, start_date, end_date, state)
+
+@st.cache_data(max_entries=1)
+def get_source_duplicates(snapshot):
+    # Which raw split file introduced each duplicate key (written at ingest)
+    sql_layer = get_sql_layer(snapshot)
+    if sql_layer is not None and SOURCE_DUPLICATES_VIEW in sql_layer.views:
+        return sql_layer.query(
+            f"SELECT source, file, first_file, scope, COUNT(*) AS duplicate_keys FROM {SOURCE_DUPLICATES_VIEW} "
+            "GROUP BY source, file, first_file, scope ORDER BY duplicate_keys DESC"
+        )
+    path = os.path.join(PROCESSED_DIR, INTEGRITY_NAME, SOURCE_DUPLICATES_NAME)
+    if not os.path.exists(path):
+        return None
+    report = pd.read_parquet(path)
+    return report.groupby(['source', 'file', 'first_file', 'scope'], observed=True).size().rename('duplicate_keys').reset_index() \
+        .sort_values('duplicate_keys', ascending=False)
+
+# Columns the network plan aggregates (migration_flux is derived on demand)
+PLAN_COLUMNS = ['state', 'district', 'ausi_score', 'total_updates', 'total_enrolment', 'migration_flux']
+
+@st.cache_data(max_entries=32)
+def get_network_plan(snapshot, start_date, end_date, state, district, _features):
+    # One clustering per snapshot and filter selection (the arguments are the cache key).
+    # The pipeline's centroids were fitted on the unfiltered history: only that
+    # selection is warm-started from them, a filtered subset gets its own k-means++ fit
+    unfiltered = state is None and district is None and \
+        pd.Timestamp(start_date) <= min_date and pd.Timestamp(end_date) >= max_date
+    centroids = load_centroids(os.path.join(PROCESSED_DIR, CENTROIDS_NAME)) if unfiltered else None
+    return cluster_districts(_features[PLAN_COLUMNS], locate=True, centroids=centroids)
+
+@st.cache_data(max_entries=1)
+def get_pincode_plan(snapshot):
+    # Pincode-level plan over the whole history (written by the pipeline)
+    path = os.path.join(PROCESSED_DIR, PINCODE_PLAN_NAME)
+    return pd.read_parquet(path) if os.path.exists(path) else None
 
 # --- AI Insight Generator (New Feature) ---
 if not filtered_df.empty:
     with st.expander("🤖 AI Narrative Insights (Auto-Generated)", expanded=True):
-        insights = generate_ai_insights(filtered_df, selected_state if selected_state != "All Regions" else None)
+        insights = get_insights(snapshot, _filtered_df=filtered_df, **cube_filters)
         for insight in insights:
             st.markdown(insight)
 
@@ -240,14 +378,15 @@ with col_head2:
         last_update = filtered_df['date'].max().strftime('%d %b %Y')
         st.markdown(f"<div style='text-align:right; color:gray; padding-top:20px'>Data updated: {last_update}</div>", unsafe_allow_html=True)
 
-# Tabs Structure
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+# Section Navigation: only the selected section runs on a rerun (st.tabs executes every tab)
+SECTIONS = [
     "📊 Executive Summary", 
     "🚚 Migration & Demographics", 
     "⚖️ Fraud & Integrity", 
     "🔮 Predictive Intelligence", 
     "🏥 Network Planning"
-])
+]
+active_section = st.radio("Section", SECTIONS, horizontal=True, key='section', label_visibility="collapsed")
 
 # Utility for Custom Metric Card
 def render_metric(label, value, color="#4e73df", prefix=""):
@@ -259,17 +398,18 @@ def render_metric(label, value, color="#4e73df", prefix=""):
     """, unsafe_allow_html=True)
 
 # --- TAB 1: EXECUTIVE SUMMARY ---
-with tab1:
+if active_section == SECTIONS[0]:
     if filtered_df.empty:
         st.warning("No data available for the selected filters.")
     else:
         # 1. KPI Row
         kpi1, kpi2, kpi3, kpi4 = st.columns(4)
         
-        total_enrol = filtered_df['total_enrolment'].sum()
-        total_updates = filtered_df['total_updates'].sum()
-        total_bio = filtered_df['total_bio_updates'].sum()
-        avg_ausi = filtered_df['ausi_score'].mean()
+        totals = query_cube(cube, by=(), **cube_filters).iloc[0]
+        total_enrol = totals['total_enrolment']
+        total_updates = totals['total_updates']
+        total_bio = totals['total_bio_updates']
+        avg_ausi = totals['ausi_score'] / totals[ROW_COUNT]
         
         with kpi1: render_metric("Total New Enrolments", f"{total_enrol:,.0f}", "#36b9cc")
         with kpi2: render_metric("Total Lifecycle Updates", f"{total_updates:,.0f}", "#4e73df")
@@ -282,23 +422,20 @@ with tab1:
         st.markdown("### 🌍 Real-time Network Stress Heatmap")
         
         # Prepare Map Data
-        map_data = []
         # Group by district to get latest AUSI
-        spatial_df = filtered_df.groupby(['district', 'state'])['ausi_score'].mean().reset_index()
+        spatial_df = query_cube(cube, by=('district', 'state'), measures=['ausi_score'], **cube_filters)
+        spatial_df['ausi_score'] = spatial_df['ausi_score'] / spatial_df[ROW_COUNT]
         
-        for _, row in spatial_df.iterrows():
-            coords = get_lat_lon(row['district'], row['state'])
-            if coords:
-                map_data.append({
-                    'district': row['district'],
-                    'lat': coords['lat'], 
-                    'lon': coords['lon'],
-                    'ausi': row['ausi_score']
-                })
+        # One vectorized coordinate lookup for all districts (unknown ones are dropped)
+        lat, lon = lookup_lat_lon(spatial_df['district'], spatial_df['state'])
+        map_df = pd.DataFrame({
+            'district': spatial_df['district'].astype(str),
+            'lat': lat,
+            'lon': lon,
+            'ausi': spatial_df['ausi_score'].to_numpy()
+        }).dropna(subset=['lat', 'lon'])
         
-        if map_data:
-            map_df = pd.DataFrame(map_data)
-            
+        if not map_df.empty:
             # Mapbox Configuration
             fig_map = px.scatter_mapbox(
                 map_df, 
@@ -326,7 +463,7 @@ with tab1:
         # A. Area Chart (Temporal Trend)
         with col_viz1:
             st.markdown("### 📈 Operational Volume Trends")
-            daily_stats = filtered_df.groupby('date')[['total_enrolment', 'total_updates']].sum().reset_index()
+            daily_stats = query_cube(cube, by=('date',), measures=['total_enrolment', 'total_updates'], **cube_filters)
             
             fig_trend = px.area(
                 daily_stats, x='date', y=['total_enrolment', 'total_updates'],
@@ -353,8 +490,9 @@ with tab1:
                 path = ['district']
                 title = "Volume by District"
                 
+            region_stats = query_cube(cube, by=(path[0],), measures=['total_updates'], **cube_filters)
             fig_sun = px.pie(
-                filtered_df, 
+                region_stats, 
                 names=path[0], 
                 values='total_updates',
                 hole=0.5,
@@ -366,13 +504,13 @@ with tab1:
             st.plotly_chart(fig_sun, use_container_width=True)
 
 # --- TAB 2: MIGRATION & DEMOGRAPHICS ---
-with tab2:
+if active_section == SECTIONS[1]:
     st.markdown("### Urban Shift & Demographic Movement Analysis")
     
     if not filtered_df.empty:
         try:
             # Re-run classification on filtered subset
-            df_mig = classify_growth_patterns(filtered_df)
+            df_mig = get_growth_patterns(snapshot, _features=features, **cube_filters)
             
             col_m1, col_m2 = st.columns([3, 1])
             
@@ -424,7 +562,7 @@ with tab2:
             st.info("Insufficient data range for migration calculations.")
 
 # --- TAB 3: FRAUD & RISK ---
-with tab3:
+if active_section == SECTIONS[2]:
     st.markdown("### ⚖️ Fraud Radar & Data Integrity")
     
     col_f1, col_f2 = st.columns([1, 1])
@@ -437,10 +575,11 @@ with tab3:
         # Ensure is_anomaly exists
         if 'is_anomaly' in filtered_df.columns:
              # Convert boolean to string for categorical coloring
-            filtered_df['Anomaly Status'] = filtered_df['is_anomaly'].apply(lambda x: "Anomaly" if x else "Normal")
+            # (a new frame over the same column data; filtered_df is left unchanged)
+            anomaly_view = filtered_df.assign(**{'Anomaly Status': np.where(filtered_df['is_anomaly'], "Anomaly", "Normal")})
             
             fig_anom = px.scatter(
-                filtered_df,
+                anomaly_view,
                 x='total_enrolment',
                 y='total_updates',
                 color='Anomaly Status',
@@ -460,16 +599,9 @@ with tab3:
         st.markdown("#### Data Integrity Report (Raw Stream)")
         st.caption("Direct integrity check on uncleaned data stream.")
         
-        # Raw Data Check
-        # Filter raw_df based on sidebar selection
-        raw_mask = (raw_df['date'] >= pd.to_datetime(date_range[0])) & (raw_df['date'] <= pd.to_datetime(date_range[1]))
-        if selected_state != "All Regions":
-            raw_mask = raw_mask & (raw_df['state'] == selected_state)
-        
-        raw_view = raw_df[raw_mask]
-        
-        duplicates = raw_view.duplicated(subset=['date', 'state', 'district', 'pincode'])
-        dup_count = duplicates.sum()
+        # Raw Data Check (filtered by the sidebar period and state)
+        dup_count, dup_sample = get_duplicate_report(
+            snapshot, cube_filters['start_date'], cube_filters['end_date'], cube_filters['state'], _dup_index=dup_index)
         
         # Display Metric
         st.markdown(f"""
@@ -483,13 +615,20 @@ with tab3:
         if dup_count > 0:
             st.markdown("**Sample Evidence Table (Raw):**")
             st.dataframe(
-                raw_view[duplicates].head(50),
+                dup_sample,
                 height=250,
                 use_container_width=True
             )
+        
+        source_dups = get_source_duplicates(snapshot)
+        if source_dups is not None and not source_dups.empty:
+            st.markdown("**Duplicates by Source File:**")
+            st.caption("Split file that repeated a key, and the file that first delivered it "
+                       "(scope: repeated across files or within the same file).")
+            st.dataframe(source_dups.head(20), height=250, use_container_width=True, hide_index=True)
 
 # --- TAB 4: FORECASTING ---
-with tab4:
+if active_section == SECTIONS[3]:
     st.markdown("### 🔮 Biometric Demand Forecast")
     
     col_pred1, col_pred2 = st.columns([1, 3])
@@ -516,9 +655,23 @@ with tab4:
     with col_pred2:
         if run_btn:
             with st.spinner(f"Running Regression Model for {pred_dist}..."):
-                hist, forecast = predict_biometric_demand(df, pred_dist, forecast_days)
+                hist = df[(df['state'] == pred_state) & (df['district'] == pred_dist)].sort_values('date')
+                
+                def compute_forecast():
+                    if forecasts is not None:
+                        # Read the precomputed outlook instead of fitting on click
+                        mask = (forecasts['state'] == pred_state) & (forecasts['district'] == pred_dist)
+                        return forecasts[mask].head(forecast_days).reset_index(drop=True)
+                    # Fit on the selected state's district only (names repeat across states)
+                    return predict_biometric_demand(hist, pred_dist, forecast_days)[1]
+                
+                # Reused across clicks and workers until this district's data changes
+                forecast = forecast_cache.get_or_compute(
+                    pred_state, pred_dist, forecast_days,
+                    data_hashes.get(f"{pred_state}|{pred_dist}"), compute_forecast
+                )
                 
-                if hist is not None and not hist.empty:
+                if forecast is not None and not hist.empty and not forecast.empty:
                     fig_cast = go.Figure()
                     
                     # Historical Area
@@ -529,6 +682,14 @@ with tab4:
                         fill='tozeroy', fillcolor='rgba(78, 115, 223, 0.1)'
                     ))
                     
+                    # 95% Prediction Interval
+                    fig_cast.add_trace(go.Scatter(
+                        x=list(forecast['date']) + list(forecast['date'][::-1]),
+                        y=list(forecast['upper']) + list(forecast['lower'][::-1]),
+                        fill='toself', fillcolor='rgba(231, 74, 59, 0.1)',
+                        line=dict(color='rgba(0,0,0,0)'), name='95% Interval', hoverinfo='skip'
+                    ))
+                    
                     # Forecast Line
                     fig_cast.add_trace(go.Scatter(
                         x=forecast['date'], y=forecast['predicted_demand'],
@@ -559,12 +720,11 @@ with tab4:
             st.info("👈 Select parameters and click 'Generate Forecast' to visualize trends.")
 
 # --- TAB 5: INFRASTRUCTURE ---
-with tab5:
+if active_section == SECTIONS[4]:
     st.markdown("### 🏥 Network Optimization & Seva Center Planning")
     
-    # Recalculate clusters
-    df_plan = calculate_migration_score(filtered_df)
-    df_plan = cluster_districts(df_plan)
+    # Clusters for the current filters (cached per selection)
+    df_plan = get_network_plan(snapshot, _features=features, **cube_filters)
     
     col_infra1, col_infra2 = st.columns([2, 1])
     
@@ -613,5 +773,16 @@ with tab5:
         
         st.markdown("#### Priority Districts")
         prio = df_plan[df_plan['recommendation'] != 'Monitor'].sort_values('impact_score', ascending=False).head(5)
-        st.dataframe(prio[['district', 'ausi_score', 'recommendation']], use_container_width=True, hide_index=True)
+        st.dataframe(prio[['district', 'ausi_score', 'recommendation', 'nearest_center_km', 'centers_in_reach']], use_container_width=True, hide_index=True)
+        
+        pincode_plan = get_pincode_plan(snapshot)
+        if pincode_plan is not None:
+            st.markdown("#### Priority Pincodes (full history)")
+            pin_mask = pincode_plan['recommendation'] != 'Monitor'
+            if cube_filters['state'] is not None:
+                pin_mask &= pincode_plan['state'] == cube_filters['state']
+            if cube_filters['district'] is not None:
+                pin_mask &= pincode_plan['district'] == cube_filters['district']
+            pin_prio = pincode_plan[pin_mask].sort_values('impact_score', ascending=False).head(5)
+            st.dataframe(pin_prio[['pincode', 'district', 'ausi_score', 'recommendation']], use_container_width=True, hide_index=True)
 
@@ -1,3 +1,4 @@
+import argparse
 import os
 import pandas as pd
 import sys
@@ -5,42 +6,456 @@ import sys
 # Ensure src is in python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.preprocessing.data_loader import load_all_datasets
-from src.preprocessing.feature_engineering import create_master_table
+from src.metrics.ausi_state import AUSI_STATE_NAME, build_ausi_state, load_ausi_state, save_ausi_state, update_ausi
+from src.models.anomaly_detection import MODEL_DIR_NAME, anomaly_flags, detect_anomalies, ensure_anomaly_model
+from src.models.clustering import (
+    CENTROIDS_NAME, PINCODE_CENTROIDS_NAME, PINCODE_PLAN_NAME, PINCODE_TOTALS_NAME, cluster_districts, cluster_pincodes,
+    load_centroids, load_pincode_totals, pincode_totals, save_centroids, save_pincode_totals
+)
+from src.models.cohort_forecasting import (
+    COHORT_FORECASTS_NAME, COHORT_TOTALS_NAME, cohort_forecast, load_cohort_totals, monthly_cohort_totals,
+    save_cohort_forecasts, save_cohort_totals
+)
+from src.models.forecast_cache import (
+    FORECAST_CACHE_NAME, add_data_hashes, district_data_hashes, invalidate_changed_districts, load_data_hashes
+)
+from src.models.forecasting import FORECASTS_NAME, forecast_demand, load_forecasts, save_forecasts
+from src.models.online_anomaly import ONLINE_STATE_NAME, load_online_state, new_online_state, save_online_state, score_online
+from src.preprocessing.cube import CUBE_NAME, build_cube, load_cube, update_cube, write_cube
+from src.preprocessing.integrity import INTEGRITY_NAME, SourceKeyLedger, build_duplicate_index, partition_duplicate_counts
+from src.preprocessing.data_loader import list_source_files, load_datasets_from_files
+from src.preprocessing.feature_engineering import aggregate_by_district, create_master_table, stream_master_table
+from src.preprocessing.manifest import MANIFEST_NAME, find_new_files, load_manifest, record_files, save_manifest
+from src.preprocessing.schema import empty_frame
+from src.preprocessing.shared_store import (
+    SNAPSHOT_COLUMNS, SNAPSHOT_NAME, SNAPSHOT_VERSION_FORMAT, open_snapshot, publish_frames, snapshot_version
+)
+from src.preprocessing.storage import (
+    MASTER_STORE_NAME, concat_frames, iter_master_store, read_master_store, store_exists, upsert_master_store,
+    write_master_store
+)
+from src.utils.name_resolver import RESOLVER_CACHE_NAME, load_resolver_cache, resolve_district, save_resolver_cache
 
-def main():
-    print("Starting Aadhaar Pulse AI Pipeline...")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Aadhaar Pulse AI ETL pipeline")
+    parser.add_argument('--export-csv', action='store_true',
+                        help="Also write the legacy data/processed/merged_master_table.csv (used by the notebooks)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parse raw CSV files on this many parallel workers (default: sequential)")
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                        help="Worker pool type used with --workers")
+    parser.add_argument('--engine', choices=['c', 'pyarrow'], default=None,
+                        help="CSV parser for raw files (pyarrow is multithreaded)")
+    parser.add_argument('--full-rebuild', action='store_true',
+                        help="Reload every raw file and rewrite the store (default: only ingest new files)")
+    parser.add_argument('--partition-by', choices=['month', 'state'], default=None,
+                        help="Merge and write the master table one partition at a time (bounded memory)")
+    parser.add_argument('--join-engine', choices=['pandas', 'sort_merge'], default='pandas',
+                        help="Three-way join implementation used to build the master table")
+    return parser.parse_args(argv)
+
+# Master-table columns the district-level steps read: the snapshot's plus the cohort model's
+STORE_COLUMNS = SNAPSHOT_COLUMNS + ['age_5_17']
+
+ONLINE_COLUMNS = ['date', 'state', 'district', 'total_enrolment', 'total_bio_updates', 'total_demo_updates', 'total_updates']
+
+# Isolation Forest columns of the published district frame
+ANOMALY_COLUMNS = ['anomaly_score', 'is_anomaly']
+
+# Flagged district-days from the streaming detector
+ALERTS_NAME = 'anomaly_alerts.csv'
+
+def _appends_new_days(state, delta):
+    """True when a persisted state exists and every day in `delta` comes after its last day."""
+    if state is None or not state['last_date'] or delta is None or delta.empty:
+        return False
+    return delta['date'].min() > pd.Timestamp(state['last_date'])
+
+def load_previous_snapshot(snapshot_dir, ausi_state):
+    """
+    The last published snapshot's frames when its district frame ends on the last day
+    the AUSI state scored (so new days can be appended to it), otherwise None.
+    """
+    frames = open_snapshot(snapshot_dir)
+    if frames is None or not {'raw_master', 'dist_df', 'duplicates'} <= set(frames):
+        return None
+    dist_df = frames['dist_df']
+    if dist_df.empty or dist_df['date'].max() != pd.Timestamp(ausi_state['last_date']):
+        return None
+    return frames
+
+def update_online_anomalies(state_path, alerts_path, dist_df, new_rows=None):
+    """
+    Runs the streaming detector over new_rows (the district-days an append-only run
+    added) and appends the flagged district-days to the alerts file; otherwise
+    replays the whole district frame.
+    """
+    state = load_online_state(state_path) if new_rows is not None else None
+    append = _appends_new_days(state, new_rows)
+    if append:
+        scored = score_online(state, new_rows[ONLINE_COLUMNS])
+    else:
+        state = new_online_state()
+        scored = score_online(state, dist_df[ONLINE_COLUMNS])
     
-    # Define paths
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(project_root, 'data', 'raw')
-    processed_dir = os.path.join(project_root, 'data', 'processed')
+    flagged = scored[scored['is_anomaly'] | scored['high_volume_spike'] | scored['suspicious_bio_ratio']]
+    write_header = not append or not os.path.exists(alerts_path)
+    flagged.to_csv(alerts_path, mode='w' if write_header else 'a', header=write_header, index=False)
+    save_online_state(state, state_path)
+    print(f"Streaming anomaly check: {int(scored['is_anomaly'].sum())} anomalies, {len(flagged)} alerts")
+
+def refresh_cube(cube_dir, dist_df, new_rows=None):
+    """
+    Writes the dashboard's aggregate cube (day/week/month x state/district). With
+    new_rows (the district-days an append-only run added) the stored cube is updated
+    from them alone; otherwise, or if there is no stored cube, it is rebuilt from dist_df.
+    """
+    cube = load_cube(cube_dir) if new_rows is not None else None
+    cube = update_cube(cube, new_rows) if cube is not None else build_cube(dist_df)
+    write_cube(cube, cube_dir)
+
+COHORT_COLUMNS = ['date', 'state', 'district', 'age_0_5', 'age_5_17', 'total_bio_updates']
+
+def _rows_of(df, districts):
+    """Mask of df's rows that belong to the (state, district) pairs in `districts`."""
+    return pd.MultiIndex.from_frame(df[['state', 'district']]).isin(districts)
+
+def refresh_forecasts(path, dist_df, new_rows=None):
+    """
+    Biometric demand outlook for every district. With new_rows (the district-days
+    an append-only run added) only the districts they touch are refitted; the stored
+    forecasts of the others still describe unchanged histories and are kept.
+    """
+    previous = load_forecasts(path) if new_rows is not None else None
+    if previous is None:
+        forecasts = forecast_demand(dist_df)
+    else:
+        changed = pd.MultiIndex.from_frame(new_rows[['state', 'district']]).unique()
+        refitted = forecast_demand(dist_df[_rows_of(dist_df, changed)])
+        forecasts = concat_frames([previous[~_rows_of(previous, changed)], refitted])
+    save_forecasts(forecasts, path)
+    return forecasts
+
+def scan_store(store_path):
+    """
+    Reads the store one calendar year at a time and reduces each year before the
+    next one is read. Returns the district-day frame, the duplicate-key index of the
+    snapshot columns, the district-month cohort totals and the per-pincode totals.
+    """
+    district_parts, duplicate_parts, totals, pincodes = [], [], None, None
+    for chunk in iter_master_store(store_path, columns=STORE_COLUMNS):
+        rows = chunk[SNAPSHOT_COLUMNS]
+        district_parts.append(aggregate_by_district(rows))
+        # Keys include the date, so no duplicate group spans two years
+        duplicate_parts.append(build_duplicate_index(rows))
+        totals = monthly_cohort_totals(chunk, totals=totals)
+        pincodes = pincode_totals(rows, totals=pincodes)
+    if not district_parts:
+        raise ValueError(f"The master store at {store_path} is empty.")
+    return concat_frames(district_parts), concat_frames(duplicate_parts), totals, pincodes
+
+def refresh_cohort_forecasts(store_path, totals_path, path, totals=None, new_rows=None):
+    """
+    Monthly cohort-lag outlook for every district, fitted on persisted district-month
+    totals: `totals` when the run built them from the store (scan_store), otherwise
+    the stored ones plus new_rows (the raw rows an append-only run added). Without
+    stored totals they are rebuilt from the store one year at a time.
+    """
+    if totals is None:
+        totals = load_cohort_totals(totals_path)
+        if totals is None:
+            totals = monthly_cohort_totals(iter_master_store(store_path, columns=COHORT_COLUMNS))
+        else:
+            totals = monthly_cohort_totals(new_rows, totals=totals)
+    save_cohort_totals(totals, totals_path)
+    forecasts = cohort_forecast(totals=totals)
+    save_cohort_forecasts(forecasts, path)
+    return forecasts
+
+def refresh_data_hashes(cache_dir, dist_df, new_rows=None):
+    """
+    Per-district data hashes of this ingest (extended with new_rows alone when an
+    append-only run has the last ones), and drops the cached forecasts of districts
+    whose hash changed.
+    """
+    hashes = load_data_hashes(cache_dir) if new_rows is not None else {}
+    hashes = add_data_hashes(hashes, new_rows) if hashes else district_data_hashes(dist_df)
+    return invalidate_changed_districts(cache_dir, hashes)
+
+def refresh_cluster_centroids(dist_df, path):
+    """
+    Re-clusters all districts starting from the previous run's centroids and stores
+    the new ones (warm start for the next run and for the dashboard's unfiltered plan).
+    """
+    summary, centroids = cluster_districts(dist_df, centroids=load_centroids(path), return_centroids=True)
+    if centroids is not None:
+        save_centroids(centroids, path)
+    return summary
+
+def refresh_pincode_plan(store_path, totals_path, centroids_path, path, totals=None, new_rows=None):
+    """
+    Pincode-level network plan over the whole history, clustered from persisted
+    per-pincode totals (kept like the cohort totals: `totals` from scan_store, else
+    the stored ones plus new_rows, else a year-by-year scan of the store) and
+    warm-started from the previous pincode-level centroids.
+    """
+    if totals is None:
+        totals = load_pincode_totals(totals_path)
+        if totals is None:
+            totals = pincode_totals(iter_master_store(store_path, columns=SNAPSHOT_COLUMNS))
+        else:
+            totals = pincode_totals(new_rows, totals=totals)
+    save_pincode_totals(totals, totals_path)
+    plan, centroids = cluster_pincodes(totals, centroids=load_centroids(centroids_path, level='pincode'),
+                                       return_centroids=True)
+    if centroids is not None:
+        save_centroids(centroids, centroids_path, level='pincode')
+    tmp_path = path + '.tmp'
+    plan.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return plan
+
+def publish_dashboard_snapshot(snapshot_dir, raw_chunks, dist_df, duplicates):
+    """
+    Publishes the dashboard's frames once for all sessions: the projected master
+    table (written from raw_chunks, e.g. the store one year at a time, or the last
+    published rows followed by the appended days), the district frame with AUSI and
+    anomaly flags and the duplicate-key index of the master table.
+    """
+    partitions = partition_duplicate_counts(duplicates)
+    print(f"Duplicate keys: {len(duplicates)} repeated rows in {len(partitions)} partitions")
+    return publish_frames({'raw_master': raw_chunks, 'dist_df': dist_df, 'duplicates': duplicates}, snapshot_dir)
+
+def refresh_name_cache(dist_df, cache_path):
+    """Resolves every (state, district) pair of the feed once and persists the results."""
+    load_resolver_cache(cache_path)
+    pairs = dist_df[['state', 'district']].drop_duplicates()
+    for state, district in pairs.itertuples(index=False):
+        resolve_district(district, state)
+    save_resolver_cache(cache_path)
+
+def load_raw_files(args, source_files, manifest, ledger, incremental):
+    """
+    Step 1: loads the raw files to ingest, feeding each to the source ledger. An
+    incremental run only loads the files the manifest has not seen (or whose content
+    changed); sources without such files join as empty frames so the merge still runs.
+    Returns (datasets, ingested paths), datasets being None when there is nothing new.
+    """
+    if not incremental:
+        print("Loading datasets...")
+        datasets = load_datasets_from_files(source_files, workers=args.workers, executor=args.executor,
+                                            engine=args.engine, on_file=ledger.add_file)
+        return datasets, [path for paths in source_files.values() for path in paths]
+
+    print("Incremental run: checking manifest for new raw files...")
+    new_files = {key: find_new_files(manifest, paths) for key, paths in source_files.items()}
+    if not any(new_files.values()):
+        return None, []
+    datasets = load_datasets_from_files(new_files, workers=args.workers, executor=args.executor, engine=args.engine,
+                                        on_file=ledger.add_file)
+    for key, frame in datasets.items():
+        if frame is None:
+            datasets[key] = empty_frame(key)
+    return datasets, [path for paths in new_files.values() for path in paths]
+
+def write_master(args, datasets, store_path, incremental):
+    """
+    Steps 2-3: merges the sources and writes the master store (upserts the merged
+    rows on an incremental run). Returns the merged rows, or None when --partition-by
+    streamed a full rebuild into the store partition by partition.
+    """
+    if args.partition_by and not incremental:
+        # Streaming mode: each partition is merged and written before the next one starts
+        print(f"Streaming merge by {args.partition_by} into {store_path}...")
+        total_rows = stream_master_table(datasets, store_path, partition_by=args.partition_by, engine=args.join_engine)
+        print(f"Total records: {total_rows}")
+        return None
+
+    master_df = create_master_table(datasets, partition_by=args.partition_by, engine=args.join_engine)
+    # Typed Parquet store partitioned by state/month
+    if incremental:
+        print(f"Upserting {len(master_df)} merged rows into {store_path}...")
+        upsert_master_store(master_df, store_path)
+    else:
+        print(f"Saving merged data to {store_path}...")
+        write_master_store(master_df, store_path)
+    return master_df
+
+def append_new_days(store_path, previous, ausi_state, new_start):
+    """
+    Step 4 for days appended after the last scored day: reads them back from the store
+    (so partially arrived sources are coalesced), scores them against the AUSI state
+    and appends them to the previous snapshot's frames.
+    """
+    print(f"Updating AUSI state with days from {new_start.date()}...")
+    raw_rows = read_master_store(store_path, columns=STORE_COLUMNS, start_date=new_start)
+    new_rows = update_ausi(ausi_state, aggregate_by_district(raw_rows[SNAPSHOT_COLUMNS]))
+    return {
+        'dist_df': concat_frames([previous['dist_df'].drop(columns=ANOMALY_COLUMNS), new_rows]),
+        # Keys include the date, so no duplicate group spans old and new days
+        'duplicates': concat_frames([previous['duplicates'], build_duplicate_index(raw_rows[SNAPSHOT_COLUMNS])]),
+        'raw_chunks': [previous['raw_master'], raw_rows[SNAPSHOT_COLUMNS]],
+        'raw_rows': raw_rows,
+        'new_rows': new_rows,
+        'cohort_totals': None,
+        'pincodes': None,
+        'previous': previous,
+        'ausi_state': ausi_state,
+    }
+
+def rebuild_from_store(store_path):
+    """Step 4 for everything else (full rebuild, backfilled or corrected days): a year-by-year scan of the store."""
+    print("Rebuilding AUSI state from the store, one year at a time...")
+    district_df, duplicates, cohort_totals, pincodes = scan_store(store_path)
+    ausi_state, dist_df = build_ausi_state(district_df)
+    return {
+        'dist_df': dist_df,
+        'duplicates': duplicates,
+        'raw_chunks': iter_master_store(store_path, columns=SNAPSHOT_COLUMNS),
+        'raw_rows': None,
+        'new_rows': None,
+        'cohort_totals': cohort_totals,
+        'pincodes': pincodes,
+        'previous': None,
+        'ausi_state': ausi_state,
+    }
+
+def refresh_outputs(processed_dir, store_path, stage):
+    """Steps 5-13: every derived output, from an append_new_days / rebuild_from_store stage."""
+    dist_df, new_rows, raw_rows, previous = stage['dist_df'], stage['new_rows'], stage['raw_rows'], stage['previous']
+    snapshot_dir = os.path.join(processed_dir, SNAPSHOT_NAME)
+
+    # 5. Streaming anomaly flags for the newly landed days
+    update_online_anomalies(os.path.join(processed_dir, ONLINE_STATE_NAME), os.path.join(processed_dir, ALERTS_NAME),
+                            dist_df, new_rows)
+    
+    # 6. Materialize the aggregate cube used by the dashboard filters
+    print("Building aggregate cube...")
+    refresh_cube(os.path.join(processed_dir, CUBE_NAME), dist_df, new_rows)
+    
+    # 7. Resolve raw district names to known coordinates (persistent cache; new days only)
+    refresh_name_cache(dist_df if new_rows is None else new_rows, os.path.join(processed_dir, RESOLVER_CACHE_NAME))
     
+    # 8. Anomaly model: refit only when the current version is stale or the data drifted
+    bundle = ensure_anomaly_model(dist_df, os.path.join(processed_dir, MODEL_DIR_NAME))
+    print(f"Anomaly model version: {bundle['version']} (trained {bundle['trained_at']})")
+    published_at = pd.to_datetime(snapshot_version(snapshot_dir), format=SNAPSHOT_VERSION_FORMAT) if previous is not None else None
+    if previous is not None and pd.Timestamp(bundle['trained_at']) < published_at:
+        # Same model as the published labels: only the new days are scored
+        flags = pd.concat([previous['dist_df'][ANOMALY_COLUMNS], anomaly_flags(new_rows, model=bundle)], ignore_index=True)
+        dist_df = dist_df.assign(**{col: flags[col].to_numpy() for col in ANOMALY_COLUMNS})
+    else:
+        dist_df = detect_anomalies(dist_df, model=bundle)
+    
+    # 9. Memory-mapped snapshot shared by all dashboard sessions
+    version = publish_dashboard_snapshot(snapshot_dir, stage['raw_chunks'], dist_df, stage['duplicates'])
+    print(f"Dashboard snapshot published: {version}")
+    
+    # 10. Nightly biometric demand outlook (refitted for the districts with new days)
+    forecasts = refresh_forecasts(os.path.join(processed_dir, FORECASTS_NAME), dist_df, new_rows)
+    print(f"Forecasts written for {forecasts[['state', 'district']].drop_duplicates().shape[0]} districts")
+    
+    # 11. Cohort-lag (age 5 / age 15 transitions) monthly outlook
+    cohort = refresh_cohort_forecasts(store_path, os.path.join(processed_dir, COHORT_TOTALS_NAME),
+                                      os.path.join(processed_dir, COHORT_FORECASTS_NAME), stage['cohort_totals'], raw_rows)
+    print(f"Cohort forecasts: {cohort['method'].value_counts().to_dict()}")
+    
+    # 12. Network-planning clusters (district and pincode level), warm-started from the last run
+    summary = refresh_cluster_centroids(dist_df, os.path.join(processed_dir, CENTROIDS_NAME))
+    print(f"Center plan: {summary['recommendation'].value_counts().to_dict()}")
+    pincode_plan = refresh_pincode_plan(store_path, os.path.join(processed_dir, PINCODE_TOTALS_NAME),
+                                        os.path.join(processed_dir, PINCODE_CENTROIDS_NAME),
+                                        os.path.join(processed_dir, PINCODE_PLAN_NAME), stage['pincodes'], raw_rows)
+    print(f"Pincode plan: {pincode_plan['recommendation'].value_counts().to_dict()}")
+    
+    # 13. Drop cached dashboard forecasts of districts whose data changed
+    changed = refresh_data_hashes(os.path.join(processed_dir, FORECAST_CACHE_NAME), dist_df, new_rows)
+    print(f"Forecast cache: {len(changed)} districts invalidated")
+
+def run(args, source_files, processed_dir):
+    """
+    Runs the pipeline over source_files ({source: [paths]}, see list_source_files)
+    into processed_dir.
+    """
     os.makedirs(processed_dir, exist_ok=True)
+    store_path = os.path.join(processed_dir, MASTER_STORE_NAME)
+    manifest_path = os.path.join(processed_dir, MANIFEST_NAME)
+    integrity_dir = os.path.join(processed_dir, INTEGRITY_NAME)
+    
+    # Incremental unless asked otherwise (or there is nothing to increment on)
+    incremental = not args.full_rebuild and store_exists(store_path) and os.path.exists(manifest_path)
+    manifest = load_manifest(manifest_path) if incremental else {'files': {}}
+    # Key hashes of every ingested raw file: reports duplicates across split files
+    ledger = SourceKeyLedger(integrity_dir if incremental else None)
     
     # 1. Load Data
-    print("Loading datasets...")
-    datasets = load_all_datasets(data_dir)
+    datasets, ingested = load_raw_files(args, source_files, manifest, ledger, incremental)
+    if datasets is None:
+        save_manifest(manifest, manifest_path)
+        print("No new raw files. Processed store is up to date.")
+        return
     
-    # 2. Merge and Create Master Table
+    # 2-3. Merge, then write or upsert the master store
     print("Creating master table...")
     try:
-        master_df = create_master_table(datasets)
+        master_df = write_master(args, datasets, store_path, incremental)
     except Exception as e:
         print(f"Error creating master table: {e}")
         return
+    
+    # Only mark files as ingested once the store write succeeded
+    record_files(manifest, ingested)
+    save_manifest(manifest, manifest_path)
+    ledger.save(integrity_dir)
+    counts = ledger.counts()
+    print(f"Source integrity: {counts['cross_file']} duplicate keys across raw files, "
+          f"{counts['within_file']} repeated within a file")
+
+    # 4. District-day frame with AUSI: days appended after the last scored day are read
+    # and scored alone against the persisted state; anything else rebuilds everything
+    ausi_state_path = os.path.join(processed_dir, AUSI_STATE_NAME)
+    ausi_state = load_ausi_state(ausi_state_path) if incremental else None
+    previous = None
+    if _appends_new_days(ausi_state, master_df):
+        previous = load_previous_snapshot(os.path.join(processed_dir, SNAPSHOT_NAME), ausi_state)
+    if previous is not None:
+        stage = append_new_days(store_path, previous, ausi_state, master_df['date'].min())
+    else:
+        stage = rebuild_from_store(store_path)
+    save_ausi_state(stage['ausi_state'], ausi_state_path)
 
-    # 3. Save
-    output_path = os.path.join(processed_dir, 'merged_master_table.csv')
-    print(f"Saving merged data to {output_path}...")
-    master_df.to_csv(output_path, index=False)
+    refresh_outputs(processed_dir, store_path, stage)
+
+    if args.export_csv:
+        output_path = os.path.join(processed_dir, 'merged_master_table.csv')
+        print(f"Exporting legacy CSV to {output_path}...")
+        if master_df is not None and not incremental:
+            master_df.to_csv(output_path, index=False)
+        else:
+            for i, chunk in enumerate(iter_master_store(store_path)):
+                chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
     
-    # Verification
-    if not master_df.empty and 'date' in master_df.columns:
-        print(f"Data range: {pd.to_datetime(master_df['date']).min()} to {pd.to_datetime(master_df['date']).max()}")
-        print(f"Total records: {len(master_df)}")
+    # Verification (an incremental run only holds the rows it ingested)
+    if master_df is not None and not master_df.empty and 'date' in master_df.columns:
+        if incremental:
+            print(f"Ingested range: {master_df['date'].min()} to {master_df['date'].max()}")
+            print(f"Ingested records: {len(master_df)}")
+        else:
+            print(f"Data range: {master_df['date'].min()} to {master_df['date'].max()}")
+            print(f"Total records: {len(master_df)}")
     
     print("Pipeline completed successfully.")
 
+def main(argv=None):
+    args = parse_args(argv)
+    print("Starting Aadhaar Pulse AI Pipeline...")
+    
+    # Define paths
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(project_root, 'data', 'raw')
+    processed_dir = os.path.join(project_root, 'data', 'processed')
+    
+    run(args, list_source_files(data_dir), processed_dir)
+
 if __name__ == "__main__":
     main()
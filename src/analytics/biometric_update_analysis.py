@@ -1,18 +1,33 @@
 import pandas as pd
 import numpy as np
 
-def analyze_mandatory_update_lag(df):
+def analyze_mandatory_update_lag(df, lag_years=None):
     """
     Analyzes the relationship between past child enrolments (0-5) 
     and current mandatory biometric updates (5-15).
     
-    Note: In a real temporal dataset, we would shift the enrolment column by ~5 years.
-    Here we look for direct correlation in valid date ranges.
+    lag_years=None keeps the direct correlation of the two columns.
+    With lag_years (e.g. 5), each district's monthly age_0_5 enrolments are shifted
+    forward by that many years and correlated with the bio_age_5_17 updates of the
+    month they land in (NaN if the history is shorter than the lag).
     """
-    # Simple correlation matrix
     cols = ['age_0_5', 'bio_age_5_17']
-    correlation = df[cols].corr().iloc[0, 1]
-    return correlation
+    if lag_years is None:
+        # Simple correlation matrix
+        correlation = df[cols].corr().iloc[0, 1]
+        return correlation
+    
+    # District-month totals, then the enrolment cohort moved to the month its update is due
+    keys = ['state', 'district', 'month']
+    monthly = (
+        df[['state', 'district'] + cols]
+        .assign(month=pd.to_datetime(df['date']).dt.to_period('M'))
+        .groupby(keys, observed=True)[cols].sum()
+        .reset_index()
+    )
+    cohort = monthly[keys + ['age_0_5']].assign(month=monthly['month'] + 12 * lag_years)
+    paired = monthly[keys + ['bio_age_5_17']].merge(cohort, on=keys, how='inner')
+    return paired['age_0_5'].corr(paired['bio_age_5_17'])
 
 def forecast_bio_demand_simple(df, growth_rate=0.05):
     """
@@ -1,13 +1,16 @@
 import pandas as pd
 
+from src.preprocessing.lazy_store import group_aggregate
+
 def rank_districts_by_updates(df, top_n=10):
     """
     Ranks districts based on total demographic updates.
+    df may be a DataFrame or a lazy_store.StoreFrame (aggregated out-of-core).
     """
     if 'total_demo_updates' not in df.columns:
         return pd.DataFrame()
         
-    ranked = df.groupby(['state', 'district'])['total_demo_updates'].sum().reset_index()
+    ranked = group_aggregate(df, ['state', 'district'], total_demo_updates=('total_demo_updates', 'sum'))
     ranked = ranked.sort_values('total_demo_updates', ascending=False).head(top_n)
     return ranked
 
@@ -15,11 +18,12 @@ def analyze_demo_vs_enrolment(df):
     """
     Compares demographic updates against enrolments to find anomalies.
     Returns rows where updates exceed enrolments significantly (indicative of heavy correction/migration load).
+    df may be a DataFrame or a lazy_store.StoreFrame (aggregated out-of-core).
     """
     # Group to avoid daily noise
     # Only sum numeric columns relevant to the analysis to avoid datetime errors
     cols_to_sum = ['total_demo_updates', 'total_enrolment']
-    grouped = df.groupby(['state', 'district'])[cols_to_sum].sum().reset_index()
+    grouped = group_aggregate(df, ['state', 'district'], **{c: (c, 'sum') for c in cols_to_sum})
     
     # Avoid division by zero
     grouped['update_ratio'] = grouped['total_demo_updates'] / (grouped['total_enrolment'] + 1)
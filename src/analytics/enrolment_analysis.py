@@ -1,14 +1,18 @@
 import pandas as pd
 
+from src.preprocessing.lazy_store import group_aggregate
+
 def get_state_enrolment_stats(df):
     """
     Aggregates enrolment data by State.
     Returns a dataframe with total enrolments per state.
+    df may be a DataFrame or a lazy_store.StoreFrame (aggregated out-of-core).
     """
     if df is None or df.empty:
         return pd.DataFrame()
         
-    stats = df.groupby('state')[['age_0_5', 'age_5_17', 'age_18_greater', 'total_enrolment']].sum().reset_index()
+    cols = ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enrolment']
+    stats = group_aggregate(df, ['state'], **{c: (c, 'sum') for c in cols})
     stats = stats.sort_values('total_enrolment', ascending=False)
     return stats
 
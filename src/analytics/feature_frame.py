@@ -0,0 +1,94 @@
+import pandas as pd
+
+from src.metrics.stress_index import ausi_columns
+from src.models.anomaly_detection import anomaly_flags, fraud_flags
+from .migration_analysis import migration_flux, organic_growth_rate
+
+# Derived column -> function(frame) returning it (a Series) or a DataFrame that
+# contains it; every column of a returned DataFrame is cached at once
+FEATURES = {
+    'migration_flux': migration_flux,
+    'organic_growth_rate': organic_growth_rate,
+    'cumulative_base': ausi_columns,
+    'ausi_daily': ausi_columns,
+    'ausi_smooth': ausi_columns,
+    'ausi_score': ausi_columns,
+    'suspicious_bio_ratio': fraud_flags,
+    'high_volume_spike': fraud_flags,
+}
+
+
+class FeatureFrame:
+    """
+    A base frame plus derived columns computed on first access and then shared.
+
+    Analytics functions take it wherever they take a DataFrame (frame['col'],
+    frame[['a', 'b']], .columns, .index), so the tabs of a dashboard rerun compute
+    each derived column once and never copy the base frame. Base columns win over
+    derived ones of the same name.
+
+    anomaly_model (a bundle from load_anomaly_model) adds anomaly_score / is_anomaly.
+    """
+
+    def __init__(self, base, anomaly_model=None, features=None):
+        self.base = base
+        self._features = dict(FEATURES if features is None else features)
+        if anomaly_model is not None:
+            def _anomalies(frame):
+                return anomaly_flags(frame, model=anomaly_model)
+            self._features['anomaly_score'] = _anomalies
+            self._features['is_anomaly'] = _anomalies
+        self._cache = {}
+
+    @property
+    def index(self):
+        return self.base.index
+
+    @property
+    def columns(self):
+        derived = [c for c in self._features if c not in self.base.columns]
+        return self.base.columns.append(pd.Index(derived))
+
+    @property
+    def empty(self):
+        return self.base.empty
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._column(key)
+        return self.frame(list(key))
+
+    def _column(self, name):
+        if name in self.base.columns:
+            return self.base[name]
+        if name not in self._cache:
+            if name not in self._features:
+                raise KeyError(name)
+            value = self._features[name](self)
+            if isinstance(value, pd.DataFrame):
+                for col in value.columns:
+                    self._cache.setdefault(col, value[col])
+            else:
+                self._cache[name] = value.rename(name)
+        return self._cache[name]
+
+    def frame(self, columns=None):
+        """
+        DataFrame of the requested base and derived columns (the base columns by
+        default), sharing their data with the base frame and the cache.
+        """
+        names = list(self.base.columns) if columns is None else list(columns)
+        return pd.DataFrame({name: self._column(name) for name in names}, index=self.index, copy=False)
+
+    def subset(self, mask):
+        """
+        FeatureFrame of the rows selected by mask. Already computed columns are
+        sliced (so frame-wide ones such as ausi_score keep their full-frame values);
+        the others are computed on the subset when first used.
+        """
+        child = FeatureFrame(self.base[mask], features=self._features)
+        child._cache = {name: values[mask] for name, values in self._cache.items()}
+        return child
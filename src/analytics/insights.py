@@ -21,7 +21,7 @@ def generate_ai_insights(df, selected_state=None):
     if 'ausi_score' in df.columns:
         high_stress = df[df['ausi_score'] > 80]
         if not high_stress.empty:
-            top_districts = high_stress.groupby('district')['ausi_score'].mean().nlargest(3).index.tolist()
+            top_districts = high_stress.groupby('district', observed=True)['ausi_score'].mean().nlargest(3).index.tolist()
             insights.append(f"🚨 **Critical Stress Alert**: {', '.join(top_districts)} are facing extreme update loads (AUSI > 80). Immediate infrastructure expansion recommended.")
     
     # 2. Demand Spikes (Biometric)
@@ -36,7 +36,7 @@ def generate_ai_insights(df, selected_state=None):
 
     # 3. Migration Trends
     if 'migration_flux' in df.columns:
-        mig_hubs = df.groupby('district')['migration_flux'].mean().nlargest(3).index.tolist()
+        mig_hubs = df.groupby('district', observed=True)['migration_flux'].mean().nlargest(3).index.tolist()
         insights.append(f"🚚 **Migration Corridor**: Highest demographic shifts observed in {', '.join(mig_hubs)}. Expect address update queues.")
         
     # 4. Operational Efficiency
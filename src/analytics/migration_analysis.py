@@ -1,23 +1,45 @@
 import pandas as pd
 
+from src.preprocessing.lazy_store import StoreFrame
+from src.utils.rules import apply_rules
+
+def migration_flux(df):
+    """
+    Migration Score per row (derived column only, the frame is not copied).
+    Logic: High Volume of Demographic Updates (Address Changes) relative to New Enrolments.
+    """
+    # Adding 1 to denominator to handle zero division
+    return (df['total_demo_updates'] / (df['total_enrolment'] + 1)).rename('migration_flux')
+
+def organic_growth_rate(df):
+    """Proportion of new child enrolments (0-5) per row (derived column only)."""
+    # Using a small epsilon to avoid division by zero
+    return (df['age_0_5'] / (df['total_enrolment'] + 1)).rename('organic_growth_rate')
+
+def _feature(df, name, compute):
+    # Reuse a column the frame already has (e.g. a FeatureFrame's cached one)
+    return df[name] if name in df.columns else compute(df)
+
 def calculate_migration_score(df):
     """
     Calculates a 'Migration Score' acting as a proxy for movement.
     Logic: High Volume of Demographic Updates (Address Changes) relative to New Enrolments.
+    Returns a new frame with migration_flux added; the caller's frame is unchanged
+    (use migration_flux for the column alone).
     """
-    df = df.copy()
-    # Adding 1 to denominator to handle zero division
-    df['migration_flux'] = df['total_demo_updates'] / (df['total_enrolment'] + 1)
-    return df
+    return df.assign(migration_flux=migration_flux(df))
 
 def identify_migration_corridors(df, threshold_percentile=0.90):
     """
     Identifies districts that are potential migration hubs based on the Migration Score.
+    df may be a lazy_store.StoreFrame: the per-district means are then computed out-of-core.
     """
-    df_scored = calculate_migration_score(df)
-    
     # Aggregate by district
-    dist_scores = df_scored.groupby(['state', 'district'])['migration_flux'].mean().reset_index()
+    if isinstance(df, StoreFrame):
+        dist_scores = df.group_aggregate(['state', 'district'], migration_flux=('migration_flux', 'mean'))
+    else:
+        flux = _feature(df, 'migration_flux', migration_flux)
+        dist_scores = flux.groupby([df['state'], df['district']], observed=True).mean().reset_index()
     
     threshold = dist_scores['migration_flux'].quantile(threshold_percentile)
     hubs = dist_scores[dist_scores['migration_flux'] > threshold].sort_values('migration_flux', ascending=False)
@@ -27,39 +49,39 @@ def identify_migration_corridors(df, threshold_percentile=0.90):
 def classify_growth_patterns(df):
     """
     Classifies districts into growth quadrants based on Migration Flux vs Organic Growth.
-    Returns the dataframe with a 'growth_category' column.
+    Returns the district summary with a 'growth_category' column.
+    df may be a lazy_store.StoreFrame: the district summary is then aggregated out-of-core.
     """
-    df = calculate_migration_score(df)
-    
-    # Organic Growth Rate: Proportion of new child enrolments (0-5)
-    # Using a small epsilon to avoid division by zero
-    df['organic_growth_rate'] = df['age_0_5'] / (df['total_enrolment'] + 1)
-    
-    # Calculate thresholds (Median) to classify
-    # We aggregate by district first to get the classification per district
-    dist_summary = df.groupby(['state', 'district']).agg({
+    keys = ['state', 'district']
+    aggregations = {
         'migration_flux': 'mean',
         'organic_growth_rate': 'mean',
         'total_enrolment': 'sum',
         'total_updates': 'sum'
-    }).reset_index()
+    }
+    
+    # Calculate thresholds (Median) to classify
+    # We aggregate by district first to get the classification per district
+    if isinstance(df, StoreFrame):
+        dist_summary = df.group_aggregate(keys, **{col: (col, func) for col, func in aggregations.items()})
+    else:
+        # Only the keys and the four aggregated columns are gathered (no copy of df)
+        features = pd.DataFrame({
+            'migration_flux': _feature(df, 'migration_flux', migration_flux),
+            'organic_growth_rate': _feature(df, 'organic_growth_rate', organic_growth_rate),
+            'total_enrolment': df['total_enrolment'],
+            'total_updates': df['total_updates'],
+        })
+        dist_summary = features.groupby([df[k] for k in keys], observed=True).agg(aggregations).reset_index()
     
     flux_median = dist_summary['migration_flux'].median()
     growth_median = dist_summary['organic_growth_rate'].median()
     
-    def get_category(row):
-        high_flux = row['migration_flux'] > flux_median
-        high_growth = row['organic_growth_rate'] > growth_median
-        
-        if high_flux and high_growth:
-            return "Urban Boom (High Flow + High Births)"
-        elif high_flux and not high_growth:
-            return "Migration Hub (Inflow Dominant)"
-        elif not high_flux and high_growth:
-            return "Organic Growth (Birth Dominant)"
-        else:
-            return "Stable / Stagnant"
-            
-    dist_summary['growth_category'] = dist_summary.apply(get_category, axis=1)
+    # Quadrants: first matching rule wins (vectorized)
+    dist_summary['growth_category'] = apply_rules(dist_summary, [
+        ("Urban Boom (High Flow + High Births)", [('migration_flux', '>', flux_median), ('organic_growth_rate', '>', growth_median)]),
+        ("Migration Hub (Inflow Dominant)", [('migration_flux', '>', flux_median)]),
+        ("Organic Growth (Birth Dominant)", [('organic_growth_rate', '>', growth_median)]),
+    ], default="Stable / Stagnant")
     
     return dist_summary
@@ -0,0 +1,177 @@
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from .stress_index import BASE_OFFSET, GROUP_KEYS, _rolling_mean_by_group, calculate_ausi
+
+# Stored next to the processed store in data/processed
+AUSI_STATE_NAME = 'ausi_state.json'
+
+# Reference quantile for the 0-100 normalization (same as calculate_ausi)
+SCORE_QUANTILE = 0.95
+
+
+# --- Streaming quantile sketch ---
+# Log-bucketed histogram (DDSketch-style): a value x > 0 falls in bucket ceil(log_gamma(x)),
+# so any quantile is answered within `relative_accuracy` of the exact one, with a few
+# hundred buckets whatever the number of rows. Updates are a vectorized bincount.
+
+def new_quantile_sketch(relative_accuracy=0.01):
+    """Creates an empty sketch answering quantiles within the given relative error."""
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    return {'gamma': gamma, 'zero_count': 0, 'count': 0, 'buckets': {}}
+
+
+def sketch_add(sketch, values):
+    """Adds an array of non-negative values (NaN is ignored, like Series.quantile)."""
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return sketch
+
+    positive = values[values > 0]
+    sketch['zero_count'] += int(len(values) - len(positive))
+    sketch['count'] += int(len(values))
+    if len(positive):
+        indices = np.ceil(np.log(positive) / math.log(sketch['gamma'])).astype(np.int64)
+        uniq, counts = np.unique(indices, return_counts=True)
+        buckets = sketch['buckets']
+        for idx, cnt in zip(uniq.tolist(), counts.tolist()):
+            key = str(idx)
+            buckets[key] = buckets.get(key, 0) + cnt
+    return sketch
+
+
+def sketch_quantile(sketch, q):
+    """Approximate q-quantile of everything added so far (NaN if empty)."""
+    if sketch['count'] == 0:
+        return float('nan')
+
+    rank = q * (sketch['count'] - 1)
+    if rank < sketch['zero_count']:
+        return 0.0
+
+    seen = sketch['zero_count']
+    gamma = sketch['gamma']
+    for idx in sorted(int(k) for k in sketch['buckets']):
+        seen += sketch['buckets'][str(idx)]
+        if seen > rank:
+            # Bucket midpoint (in relative terms) of (gamma^(idx-1), gamma^idx]
+            return 2 * gamma ** idx / (gamma + 1)
+    return 2 * gamma ** max(int(k) for k in sketch['buckets']) / (gamma + 1)
+
+
+# --- Per-district AUSI state ---
+
+def _district_key(state_name, district_name):
+    return f"{state_name}|{district_name}"
+
+
+def build_ausi_state(district_df, window=7, relative_accuracy=0.01):
+    """
+    Builds the persisted AUSI state from a district-level history
+    (aggregate_by_district output): per district the running enrolment total and the
+    last window-1 daily values, plus the quantile sketch of every ausi_smooth value.
+    Returns (state, scored_history).
+    """
+    scored = calculate_ausi(district_df, window=window)
+
+    districts = {}
+    tails = scored.groupby(GROUP_KEYS, observed=True, sort=False).tail(max(window - 1, 0))
+    last = scored.groupby(GROUP_KEYS, observed=True, sort=False)['cumulative_base'].last()
+    for (state_name, district_name), base in last.items():
+        districts[_district_key(state_name, district_name)] = {
+            'state': state_name,
+            'district': district_name,
+            'enrolment_total': float(base - BASE_OFFSET),
+            'tail': [],
+        }
+    for state_name, district_name, daily in tails[GROUP_KEYS + ['ausi_daily']].itertuples(index=False):
+        districts[_district_key(state_name, district_name)]['tail'].append(float(daily))
+
+    state = {
+        'window': window,
+        'last_date': scored['date'].max().isoformat() if len(scored) else None,
+        'districts': districts,
+        'sketch': sketch_add(new_quantile_sketch(relative_accuracy), scored['ausi_smooth']),
+    }
+    return state, scored
+
+
+def update_ausi(state, new_df):
+    """
+    Scores new district-level days against the stored state in O(new rows) and
+    advances the state. Returns new_df with cumulative_base, ausi_daily, ausi_smooth
+    and ausi_score; history is never re-read.
+
+    The rolling values match calculate_ausi on the full history. ausi_score uses the
+    sketch's running 95th percentile, so it is within the sketch's relative accuracy
+    of the batch normalization and earlier days keep the score they were given.
+    """
+    if new_df is None or new_df.empty:
+        return new_df
+
+    window = state['window']
+    new_df = new_df.sort_values('date')
+    keys = [_district_key(s, d) for s, d in zip(new_df['state'], new_df['district'])]
+    districts = state['districts']
+
+    # Cumulative base continues from each district's stored enrolment total
+    prev_total = np.array([districts[k]['enrolment_total'] if k in districts else 0.0 for k in keys])
+    running = new_df.groupby(GROUP_KEYS, observed=True, sort=False)['total_enrolment'].cumsum().to_numpy()
+    new_df['cumulative_base'] = prev_total + running + BASE_OFFSET
+    new_df['ausi_daily'] = new_df['total_updates'] / new_df['cumulative_base']
+
+    # Rolling window seeded with the stored tails (only for districts present today)
+    seed_keys, seed_values = [], []
+    for k in dict.fromkeys(keys):
+        if k in districts:
+            tail = districts[k]['tail']
+            seed_keys.extend([k] * len(tail))
+            seed_values.extend(tail)
+    all_keys = pd.Series(seed_keys + keys)
+    all_values = np.concatenate([np.asarray(seed_values, dtype='float64'), new_df['ausi_daily'].to_numpy(dtype='float64')])
+    group_ids, _ = pd.factorize(all_keys)
+    smooth = _rolling_mean_by_group(all_values, group_ids.astype('float64'), window)
+    new_df['ausi_smooth'] = smooth[len(seed_keys):]
+
+    # Normalization against the running reference quantile
+    sketch_add(state['sketch'], new_df['ausi_smooth'])
+    max_ref = sketch_quantile(state['sketch'], SCORE_QUANTILE)
+    new_df['ausi_score'] = ((new_df['ausi_smooth'] / max_ref) * 100).clip(0, 100)
+
+    # Advance the state
+    window_frame = pd.DataFrame({'key': all_keys, 'ausi_daily': all_values})
+    new_tails = window_frame.groupby('key', sort=False).tail(max(window - 1, 0))
+    for k in dict.fromkeys(keys):
+        if k not in districts:
+            s, d = k.split('|', 1)
+            districts[k] = {'state': s, 'district': d, 'enrolment_total': 0.0, 'tail': []}
+        districts[k]['tail'] = []
+    for k, daily in new_tails.itertuples(index=False):
+        districts[k]['tail'].append(float(daily))
+    final_base = new_df.assign(_key=keys).groupby('_key', sort=False)['cumulative_base'].last()
+    for k, base in final_base.items():
+        districts[k]['enrolment_total'] = float(base - BASE_OFFSET)
+    state['last_date'] = max(pd.Timestamp(state['last_date']) if state['last_date'] else new_df['date'].max(),
+                             new_df['date'].max()).isoformat()
+    return new_df
+
+
+def save_ausi_state(state, path):
+    """Writes the state as JSON (temp file + rename)."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh)
+    os.replace(tmp_path, path)
+
+
+def load_ausi_state(path):
+    """Loads a state written by save_ausi_state, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
@@ -1,36 +1,103 @@
 import pandas as pd
 import numpy as np
 
+from src.preprocessing.lazy_store import StoreFrame
+
+GROUP_KEYS = ['state', 'district']
+
+# Constant added to the running enrolment total to simulate an existing Aadhaar base
+BASE_OFFSET = 1000
+
+def _rolling_mean_by_group(values, group_ids, window):
+    """
+    Rolling mean of `values` within each group id, in one groupby-rolling pass.
+    Rows are taken in their current order; rows without a group (NaN id) get NaN.
+    """
+    positional = pd.Series(np.asarray(values, dtype='float64'))
+    valid = ~np.isnan(group_ids)
+    rolled = positional[valid].groupby(group_ids[valid].astype(np.int64), sort=False).rolling(window, min_periods=1).mean()
+    # Drop the group level and put the results back at their row positions
+    return rolled.droplevel(0).reindex(positional.index).to_numpy()
+
+def _score(df):
+    """
+    Normalize AUSI to 0-100 scale for easier interpretation.
+    Using 95th percentile as max reference to avoid outliers skewing the graph.
+    """
+    max_ref = df['ausi_smooth'].quantile(0.95)
+    df['ausi_score'] = (df['ausi_smooth'] / max_ref) * 100
+    df['ausi_score'] = df['ausi_score'].clip(0, 100) # Cap at 100
+    return df
+
+def ausi_columns(df, window=7):
+    """
+    The AUSI columns (cumulative_base, ausi_daily, ausi_smooth, ausi_score) for df,
+    aligned to its rows and computed from the key, date and volume columns only:
+    the caller's frame is neither copied nor modified.
+    """
+    # Same row order calculate_ausi processes (df.sort_values('date'))
+    order = pd.Series(df['date'].to_numpy()).sort_values().index.to_numpy()
+    keys = [df[k].to_numpy()[order] for k in GROUP_KEYS]
+    enrolment = pd.Series(df['total_enrolment'].to_numpy()[order])
+    grouped = enrolment.groupby(keys, observed=True, sort=False)
+
+    # Calculate Cumulative Enrolment (Proxy for Aadhaar Base in that region)
+    derived = pd.DataFrame({'cumulative_base': grouped.cumsum().to_numpy() + BASE_OFFSET})
+    derived['ausi_daily'] = df['total_updates'].to_numpy()[order] / derived['cumulative_base'].to_numpy()
+    derived['ausi_smooth'] = _rolling_mean_by_group(derived['ausi_daily'], grouped.ngroup().to_numpy(dtype='float64'), window)
+    derived = _score(derived)
+
+    # Back to the caller's row order and index
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    derived = derived.iloc[inverse]
+    derived.index = df.index
+    return derived
+
 def calculate_ausi(df, window=7):
     """
     Calculates Aadhaar Update Stress Index (AUSI).
-    
+
     Formula:
     AUSI = (Biometric Updates + Demographic Updates) / (Cumulative Enrolment Base)
-    
-    Note: Since we don't have total historical base, we use a running cumulative sum of enrolments 
+
+    Note: Since we don't have total historical base, we use a running cumulative sum of enrolments
     plus a base smooth factor to avoid division by zero.
+
+    Returns df sorted by date with the AUSI columns added (see ausi_columns for the
+    derived columns alone). For a lazy_store.StoreFrame the same columns are computed
+    out-of-core and a lazy StoreFrame is returned (see _ausi_sql).
     """
-    
+    if isinstance(df, StoreFrame):
+        return df.query(_ausi_sql(window))
+    derived = ausi_columns(df, window)
     # Ensure data is sorted
-    df = df.sort_values('date')
-    
-    # Calculate Cumulative Enrolment (Proxy for Aadhaar Base in that region)
-    # Adding a small constant to simulate existing base if data starts from 0
-    df['cumulative_base'] = df.groupby(['state', 'district'])['total_enrolment'].cumsum() + 1000 
-    
-    # Calculate Daily Stress
-    df['ausi_daily'] = df['total_updates'] / df['cumulative_base']
-    
-    # Apply Rolling Average for smoothness (7-day window)
-    df['ausi_smooth'] = df.groupby(['state', 'district'])['ausi_daily'].transform(
-        lambda x: x.rolling(window, min_periods=1).mean()
-    )
-    
-    # Normalize AUSI to 0-100 scale for easier interpretation
-    # Using 95th percentile as max reference to avoid outliers skewing the graph
-    max_ref = df['ausi_smooth'].quantile(0.95)
-    df['ausi_score'] = (df['ausi_smooth'] / max_ref) * 100
-    df['ausi_score'] = df['ausi_score'].clip(0, 100) # Cap at 100
-    
-    return df
+    return df.assign(**{col: derived[col] for col in derived.columns}).sort_values('date')
+
+def _ausi_sql(window):
+    """
+    calculate_ausi as window SQL over {source}: running base and rolling mean per
+    district in date order, scored against the 95th percentile of ausi_smooth.
+    Matches the pandas path when there is one row per district and date (e.g. after
+    aggregate_by_district), which is how the pipeline calls it.
+    """
+    keyed = "state IS NOT NULL AND district IS NOT NULL"
+    ordered = "PARTITION BY state, district ORDER BY date"
+    return f"""
+        WITH base AS (
+            SELECT *, CASE WHEN {keyed} AND total_enrolment IS NOT NULL
+                THEN SUM(total_enrolment) OVER (w ROWS UNBOUNDED PRECEDING) + {BASE_OFFSET} END AS cumulative_base
+            FROM {{source}}
+            WINDOW w AS ({ordered})
+        ), daily AS (
+            SELECT *, total_updates / cumulative_base AS ausi_daily FROM base
+        ), smooth AS (
+            SELECT *, CASE WHEN {keyed}
+                THEN AVG(ausi_daily) OVER (w ROWS {window - 1} PRECEDING) END AS ausi_smooth
+            FROM daily
+            WINDOW w AS ({ordered})
+        )
+        SELECT *, LEAST(GREATEST(ausi_smooth / quantile_cont(ausi_smooth, 0.95) OVER () * 100, 0), 100) AS ausi_score
+        FROM smooth
+        ORDER BY date, state, district
+    """
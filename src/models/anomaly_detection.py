@@ -1,40 +1,190 @@
 from sklearn.ensemble import IsolationForest
+import glob
+import os
+import re
+
+import joblib
+import numpy as np
 import pandas as pd
+import sklearn
+
+# Features for detection
+ANOMALY_FEATURES = ['total_enrolment', 'total_bio_updates', 'total_demo_updates']
+
+# Persisted models live in data/processed/models/isolation_forest_v<N>.joblib
+MODEL_DIR_NAME = 'models'
+MODEL_PREFIX = 'isolation_forest_v'
+
+# Refit policy: model age and feature drift (population stability index)
+MAX_MODEL_AGE_DAYS = 7
+PSI_THRESHOLD = 0.2
+DRIFT_BINS = 10
+
+# Rows per scoring task
+SCORE_CHUNK_SIZE = 50_000
+
+def _feature_matrix(df, features):
+    # Handle NaNs just in case
+    return df[features].fillna(0).to_numpy(dtype='float64')
+
+def _reference_bins(X):
+    """Per-feature decile edges and bin shares of the training data (drift baseline)."""
+    reference = []
+    for col in X.T:
+        edges = np.unique(np.quantile(col, np.linspace(0, 1, DRIFT_BINS + 1)[1:-1]))
+        shares = np.bincount(np.searchsorted(edges, col, side='right'), minlength=len(edges) + 1) / len(col)
+        reference.append({'edges': edges, 'shares': shares})
+    return reference
 
-def detect_anomalies(df, contamination=0.01):
+def fit_anomaly_model(df, contamination=0.01, n_jobs=-1):
     """
-    Detects anomalies in update volumes using Isolation Forest.
+    Fits an Isolation Forest on the district frame and returns a model bundle:
+    the estimator plus the metadata needed to version it and to check for drift.
+    """
+    X = _feature_matrix(df, ANOMALY_FEATURES)
+    iso_forest = IsolationForest(contamination=contamination, random_state=42, n_jobs=n_jobs)
+    iso_forest.fit(X)
+    return {
+        'model': iso_forest,
+        'features': list(ANOMALY_FEATURES),
+        'contamination': contamination,
+        'trained_at': pd.Timestamp.now().isoformat(),
+        'n_rows': len(X),
+        'reference': _reference_bins(X),
+        'sklearn_version': sklearn.__version__,
+        'version': None,
+    }
+
+def _versions(model_dir):
+    found = {}
+    for path in glob.glob(os.path.join(model_dir, f"{MODEL_PREFIX}*.joblib")):
+        match = re.search(rf"{MODEL_PREFIX}(\d+)\.joblib$", path)
+        if match:
+            found[int(match.group(1))] = path
+    return found
+
+def save_anomaly_model(bundle, model_dir):
+    """Writes the bundle as the next version in model_dir and returns its path."""
+    os.makedirs(model_dir, exist_ok=True)
+    versions = _versions(model_dir)
+    bundle['version'] = max(versions, default=0) + 1
+    path = os.path.join(model_dir, f"{MODEL_PREFIX}{bundle['version']}.joblib")
+    tmp_path = path + '.tmp'
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def load_anomaly_model(model_dir, version=None):
+    """
+    Loads the latest (or a given) model version, or None if there is none or it was
+    saved by another scikit-learn version (a pickled forest is only guaranteed to
+    score the same under the version that fitted it).
+    """
+    versions = _versions(model_dir)
+    if not versions:
+        return None
+    path = versions.get(version) if version is not None else versions[max(versions)]
+    if not path:
+        return None
+    bundle = joblib.load(path)
+    if bundle.get('sklearn_version') != sklearn.__version__:
+        return None
+    return bundle
+
+def feature_drift(bundle, df):
+    """Population stability index of each feature against the training distribution."""
+    X = _feature_matrix(df, bundle['features'])
+    drift = {}
+    for name, col, ref in zip(bundle['features'], X.T, bundle['reference']):
+        shares = np.bincount(np.searchsorted(ref['edges'], col, side='right'), minlength=len(ref['shares'])) / max(len(col), 1)
+        expected = np.clip(ref['shares'], 1e-4, None)
+        actual = np.clip(shares, 1e-4, None)
+        drift[name] = float(np.sum((actual - expected) * np.log(actual / expected)))
+    return drift
+
+def needs_refit(bundle, df, max_age_days=MAX_MODEL_AGE_DAYS, psi_threshold=PSI_THRESHOLD):
+    """
+    True when there is no model, it was fitted with other features or another
+    scikit-learn version, it is older than max_age_days, or any feature drifted.
+    """
+    if bundle is None or bundle['features'] != ANOMALY_FEATURES:
+        return True
+    if bundle.get('sklearn_version') != sklearn.__version__:
+        return True
+    age = pd.Timestamp.now() - pd.Timestamp(bundle['trained_at'])
+    if age > pd.Timedelta(days=max_age_days):
+        return True
+    return max(feature_drift(bundle, df).values()) > psi_threshold
+
+def ensure_anomaly_model(df, model_dir, contamination=0.01, **policy):
+    """Loads the latest model, refitting and saving a new version only when needs_refit says so."""
+    bundle = load_anomaly_model(model_dir)
+    if needs_refit(bundle, df, **policy):
+        bundle = fit_anomaly_model(df, contamination=contamination)
+        save_anomaly_model(bundle, model_dir)
+    return bundle
+
+def score_anomalies(bundle, df, n_jobs=-1, chunk_size=SCORE_CHUNK_SIZE):
+    """
+    Score-only path: Isolation Forest labels (-1 anomaly / 1 normal) for df,
+    predicted in row chunks spread over n_jobs threads.
+    """
+    X = _feature_matrix(df, bundle['features'])
+    model = bundle['model']
+    if len(X) <= chunk_size:
+        return model.predict(X)
+
+    chunks = [X[start:start + chunk_size] for start in range(0, len(X), chunk_size)]
+    labels = joblib.Parallel(n_jobs=n_jobs, prefer='threads')(joblib.delayed(model.predict)(chunk) for chunk in chunks)
+    return np.concatenate(labels)
+
+def anomaly_flags(df, contamination=0.01, model=None):
+    """
+    Isolation Forest columns (anomaly_score, is_anomaly) for df, aligned to its rows;
+    df itself is not modified. Fits a model on df first when none is given.
+    """
+    if model is None:
+        model = fit_anomaly_model(df, contamination=contamination)
+    flags = pd.DataFrame({'anomaly_score': score_anomalies(model, df)}, index=df.index)
     
+    # -1 marks an anomaly, 1 a normal row
+    flags['is_anomaly'] = flags['anomaly_score'].eq(-1)
+    return flags
+
+def detect_anomalies(df, contamination=0.01, model=None):
+    """
+    Detects anomalies in update volumes using Isolation Forest.
+
     Features used:
     - total_enrolment
     - total_bio_updates
     - total_demo_updates
+
+    With a persisted model bundle (ensure_anomaly_model / load_anomaly_model) the
+    rows are only scored; otherwise a model is fitted on df first.
+    Returns df with the anomaly_flags columns added; the caller's frame is not modified.
     """
+    flags = anomaly_flags(df, contamination=contamination, model=model)
+    return df.assign(**flags)
+
+def fraud_flags(df):
+    """
+    Rule-based flag columns (suspicious_bio_ratio, high_volume_spike) for df,
+    aligned to its rows; df itself is not modified.
+    """
+    flags = pd.DataFrame(index=df.index)
+    flags['suspicious_bio_ratio'] = df['total_bio_updates'] > (df['total_demo_updates'] * 5)
     
-    # Features for detection
-    features = ['total_enrolment', 'total_bio_updates', 'total_demo_updates']
-    
-    # Handle NaNs just in case
-    data_for_model = df[features].fillna(0)
-    
-    # Fit model
-    iso_forest = IsolationForest(contamination=contamination, random_state=42)
-    df['anomaly_score'] = iso_forest.fit_predict(data_for_model)
-    
-    # Map -1 to "Anomaly" and 1 to "Normal"
-    df['is_anomaly'] = df['anomaly_score'].apply(lambda x: True if x == -1 else False)
+    # High volume single day check
+    threshold = df['total_updates'].quantile(0.99)
+    flags['high_volume_spike'] = df['total_updates'] > threshold
     
-    return df
+    return flags
 
 def specific_fraud_rules(df):
     """
     Rule-based fraud detection on top of ML.
     Example: Biometric updates > 5x Demographic updates (Unusual)
+    Returns df with the fraud_flags columns added; the caller's frame is not modified.
     """
-    df['suspicious_bio_ratio'] = df['total_bio_updates'] > (df['total_demo_updates'] * 5)
-    
-    # High volume single day check
-    threshold = df['total_updates'].quantile(0.99)
-    df['high_volume_spike'] = df['total_updates'] > threshold
-    
-    return df
+    return df.assign(**fraud_flags(df))
@@ -1,82 +1,245 @@
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+import json
+import os
+
+import numpy as np
 import pandas as pd
 
-def cluster_districts(df):
+from src.utils.geo_index import GeoIndex
+from src.utils.geo_utils import lookup_lat_lon
+from src.utils.rules import apply_rules
+
+# Centroids of the last pipeline run (data/processed), reused as warm starts
+CENTROIDS_NAME = 'cluster_centroids.json'
+PINCODE_CENTROIDS_NAME = 'pincode_centroids.json'
+
+# Pincode-level planning (data/processed): additive per-pincode sums and the last plan
+PINCODE_TOTALS_NAME = 'pincode_totals.parquet'
+PINCODE_PLAN_NAME = 'pincode_plan.parquet'
+PINCODE_KEYS = ['state', 'district', 'pincode']
+PINCODE_SUM_COLUMNS = ['total_updates', 'total_enrolment']
+
+# Constant added to a pincode's enrolments (the stress index's simulated existing base)
+PINCODE_BASE_OFFSET = 1000
+
+# Radius (km) within which a proposed new center counts as covering a district
+COVERAGE_RADIUS_KM = 50
+
+# Clustering features (Strictly Load & Stress) and recommendations by cluster rank
+CLUSTER_FEATURES = ['ausi_score', 'total_updates']
+RECOMMENDATIONS = ['Monitor', 'Mobile Van Required', 'New Center Required']
+
+# Fallback thresholds when there are too few units to cluster: High stress > 60, Medium > 30
+FALLBACK_RULES = [
+    ('New Center Required', [('ausi_score', '>', 60), ('total_updates', '>', 10000)], 'any'),
+    ('Mobile Van Required', [('ausi_score', '>', 30)]),
+]
+
+# Above this many rows method='auto' switches to mini-batch k-means
+MINIBATCH_THRESHOLD = 5000
+MINIBATCH_SIZE = 4096
+
+def fit_clusters(X, centroids=None, method='auto', n_clusters=3):
     """
-    Clusters districts based on AUSI and Total Load to recommend center types.
-    Updates: Now considers Migration Flux if available for targeted Mobile Van deployment.
+    K-Means on X returning (labels, centroids) with clusters ranked by intensity
+    (sum of centroid coordinates): label 0 is the lowest, n_clusters-1 the highest,
+    so labels keep their meaning across runs.
+
+    - centroids: previous (ranked) centroids; the fit starts from them instead of k-means++
+    - method: 'kmeans', 'minibatch' or 'auto' (minibatch above MINIBATCH_THRESHOLD rows)
     """
-    # Aggregate data by district
-    agg_dict = {
-        'ausi_score': 'mean',
-        'total_updates': 'sum',
-        'total_enrolment': 'sum'
-    }
+    if method == 'auto':
+        method = 'minibatch' if len(X) > MINIBATCH_THRESHOLD else 'kmeans'
+    init = {}
+    if centroids is not None and np.shape(centroids) == (n_clusters, X.shape[1]):
+        init = {'init': np.asarray(centroids, dtype='float64'), 'n_init': 1}
     
-    # If migration_flux is in df, include its mean in aggregation
-    if 'migration_flux' in df.columns:
-        agg_dict['migration_flux'] = 'mean'
-        
-    district_summary = df.groupby(['state', 'district']).agg(agg_dict).reset_index()
+    if method == 'minibatch':
+        model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, batch_size=MINIBATCH_SIZE, **init)
+    else:
+        model = KMeans(n_clusters=n_clusters, random_state=42, **init)
+    labels = model.fit_predict(X)
     
+    # Rank clusters by intensity: rank[label] is the stable label
+    order = np.argsort(model.cluster_centers_.sum(axis=1), kind='stable')
+    rank = np.empty(n_clusters, dtype=np.int64)
+    rank[order] = np.arange(n_clusters)
+    return rank[labels], model.cluster_centers_[order]
+
+def save_centroids(centroids, path, level='district'):
+    """
+    Writes ranked centroids as JSON (temp file + rename), tagged with the features
+    and the planning unit ('district' or 'pincode') they were fitted on. The pipeline
+    fits them on the whole, unfiltered history.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump({'features': CLUSTER_FEATURES, 'level': level, 'centroids': np.asarray(centroids).tolist()}, fh)
+    os.replace(tmp_path, path)
+
+def load_centroids(path, level='district'):
+    """
+    Centroids written by save_centroids, or None (missing file, other features or
+    another planning unit). They describe the unfiltered history: only warm-start a
+    fit over the same selection with them.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fh:
+        saved = json.load(fh)
+    if saved.get('features') != CLUSTER_FEATURES or saved.get('level', 'district') != level:
+        return None
+    return np.asarray(saved['centroids'], dtype='float64')
+
+def add_nearest_center(district_summary):
+    """
+    Adds lat / lon and, for every district, the nearest district recommended a
+    'New Center Required' (nearest_center, nearest_center_km; 0 km for those districts)
+    and how many of them lie within COVERAGE_RADIUS_KM (centers_in_reach).
+    """
+    lat, lon = lookup_lat_lon(district_summary['district'], district_summary['state'])
+    district_summary['lat'] = lat
+    district_summary['lon'] = lon
+    
+    is_center = (district_summary['recommendation'] == 'New Center Required').to_numpy() & ~np.isnan(lat)
+    district_summary['nearest_center'] = None
+    district_summary['nearest_center_km'] = np.nan
+    district_summary['centers_in_reach'] = 0
+    if is_center.any():
+        centers = GeoIndex(lat[is_center], lon[is_center], labels=district_summary['district'].astype(str).to_numpy()[is_center])
+        dist, idx = centers.nearest(lat, lon, k=1)
+        found = idx[:, 0] >= 0
+        district_summary.loc[found, 'nearest_center'] = centers.labels[idx[found, 0]]
+        district_summary.loc[found, 'nearest_center_km'] = dist[found, 0]
+        district_summary['centers_in_reach'] = centers.count_within(lat, lon, COVERAGE_RADIUS_KM)
+    return district_summary
+
+def _plan_units(summary, centroids=None, method='auto'):
+    """
+    Cluster ranks, recommendations and impact scores for a frame of planning units
+    (one row per district or pincode with the CLUSTER_FEATURES, in place).
+    Returns the ranked centroids, or None when there were too few units to cluster.
+    """
     # Features for K-Means (Strictly Load & Stress)
-    X = district_summary[['ausi_score', 'total_updates']]
+    X = summary[CLUSTER_FEATURES].to_numpy(dtype='float64')
     
     # Check if we have enough data points for 3 clusters
-    n_samples = len(district_summary)
+    n_samples = len(summary)
     
     if n_samples < 3:
         # Fallback for small datasets: Rule-based assignment
         # If we filter down to just 1 or 2 districts, clustering fails.
-        def simple_rule(row):
-            # Fallback thresholds: High stress > 60, Medium > 30
-            if row['ausi_score'] > 60 or row['total_updates'] > 10000:
-                return 'New Center Required'
-            elif row['ausi_score'] > 30:
-                return 'Mobile Van Required'
-            else:
-                return 'Monitor'
-                
-        district_summary['recommendation'] = district_summary.apply(simple_rule, axis=1)
-        district_summary['cluster'] = 0 # Dummy
+        summary['recommendation'] = apply_rules(summary, FALLBACK_RULES, default='Monitor')
+        summary['cluster'] = 0 # Dummy
+        fitted = None
     else:
-        # K-Means Clustering (3 Clusters: Low, Medium, High Priority)
-        kmeans = KMeans(n_clusters=3, random_state=42)
-        district_summary['cluster'] = kmeans.fit_predict(X)
-        
-        # Map clusters to recommendations
-        centroids = kmeans.cluster_centers_
-        # Sum of centroid coords to determine intensity
-        intensity = centroids.sum(axis=1)
-        cluster_mapping = {i: val for i, val in enumerate(intensity)}
-        sorted_clusters = sorted(cluster_mapping, key=cluster_mapping.get)
-        
-        # Base Map: 0 -> Low (Monitor), 1 -> Medium (Mobile Van), 2 -> High (New Center)
-        base_map = {
-            sorted_clusters[0]: 'Monitor',
-            sorted_clusters[1]: 'Mobile Van Required',
-            sorted_clusters[2]: 'New Center Required'
-        }
-        
-        district_summary['recommendation'] = district_summary['cluster'].map(base_map)
+        # K-Means Clustering (3 Clusters: Low, Medium, High Priority), labels ranked by intensity
+        # 0 -> Low (Monitor), 1 -> Medium (Mobile Van), 2 -> High (New Center)
+        labels, fitted = fit_clusters(X, centroids=centroids, method=method)
+        summary['cluster'] = labels
+        summary['recommendation'] = np.asarray(RECOMMENDATIONS, dtype=object)[labels]
     
     # REFINEMENT: Logic 5 - Smart Aadhaar Seva Center Planner
     # "Recommend Mobile Vans for sporadic high spikes (Migration zones)"
-    if 'migration_flux' in district_summary.columns:
+    if 'migration_flux' in summary.columns:
         # Use 90th percentile of migration flux as threshold for "High Migration Zone"
-        mig_threshold = district_summary['migration_flux'].quantile(0.90)
+        mig_threshold = summary['migration_flux'].quantile(0.90)
         
         # If a district is marked as 'Monitor' but has HIGH migration flux, upgrade to 'Mobile Van'
-        mask_mig = (district_summary['recommendation'] == 'Monitor') & (district_summary['migration_flux'] > mig_threshold)
-        district_summary.loc[mask_mig, 'recommendation'] = 'Mobile Van Required (Migration Hub)'
+        mask_mig = (summary['recommendation'] == 'Monitor') & (summary['migration_flux'] > mig_threshold)
+        summary.loc[mask_mig, 'recommendation'] = 'Mobile Van Required (Migration Hub)'
         
     # IMPACT SCORE CALCULATION (For Prioritization)
     # Impact = Stress (AUSI) * Volume (Total Updates)
     # This helps decide WHICH 'New Center' to build first.
-    district_summary['impact_score'] = district_summary['ausi_score'] * (district_summary['total_updates'] + 1)
+    summary['impact_score'] = summary['ausi_score'] * (summary['total_updates'] + 1)
     
     # Normalize Impact Score for readability (0-100)
-    max_impact = district_summary['impact_score'].max()
-    district_summary['impact_score'] = (district_summary['impact_score'] / max_impact) * 100
+    max_impact = summary['impact_score'].max()
+    summary['impact_score'] = (summary['impact_score'] / max_impact) * 100
+    return fitted
+
+def cluster_districts(df, locate=False, centroids=None, method='auto', return_centroids=False):
+    """
+    Clusters districts based on AUSI and Total Load to recommend center types.
+    Updates: Now considers Migration Flux if available for targeted Mobile Van deployment.
+    With locate=True, also adds coordinates and the distance to the nearest new center (add_nearest_center).
+    
+    centroids (e.g. load_centroids) warm-start the fit and method is passed to
+    fit_clusters. With return_centroids=True, returns (summary, ranked centroids),
+    centroids being None when there were too few districts to cluster.
+    """
+    # Aggregate data by district
+    agg_dict = {
+        'ausi_score': 'mean',
+        'total_updates': 'sum',
+        'total_enrolment': 'sum'
+    }
+    
+    # If migration_flux is in df, include its mean in aggregation
+    if 'migration_flux' in df.columns:
+        agg_dict['migration_flux'] = 'mean'
         
+    district_summary = df.groupby(['state', 'district'], observed=True).agg(agg_dict).reset_index()
+    fitted = _plan_units(district_summary, centroids, method)
+    
+    if locate:
+        district_summary = add_nearest_center(district_summary)
+        
+    if return_centroids:
+        return district_summary, fitted
     return district_summary
+
+def pincode_totals(frames, totals=None):
+    """
+    Per-pincode sums of PINCODE_SUM_COLUMNS over master-table rows. `frames` is a
+    DataFrame or an iterable of chunks (e.g. storage.iter_master_store), each reduced
+    before the next is read; earlier `totals` are added to, so an append-only run
+    only aggregates its new rows.
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    partials = [] if totals is None else [totals.set_index(PINCODE_KEYS)[PINCODE_SUM_COLUMNS]]
+    for frame in frames:
+        partials.append(frame.groupby(PINCODE_KEYS, observed=True)[PINCODE_SUM_COLUMNS].sum())
+    combined = pd.concat(partials)
+    # Keys from different chunks compare as text (their categories differ)
+    combined.index = pd.MultiIndex.from_arrays(
+        [combined.index.get_level_values(k).astype(str) for k in PINCODE_KEYS], names=PINCODE_KEYS
+    )
+    return combined.groupby(level=PINCODE_KEYS).sum().reset_index()
+
+def pincode_summary(totals):
+    """
+    Pincode planning units from pincode_totals: the summed volumes and an
+    ausi_score, the pincode's updates over its enrolment base (plus the simulated
+    existing base) on the 0-100 scale of the stress index (95th percentile = 100).
+    """
+    summary = totals.copy()
+    stress = summary['total_updates'] / (summary['total_enrolment'] + PINCODE_BASE_OFFSET)
+    summary['ausi_score'] = (stress / stress.quantile(0.95) * 100).clip(0, 100)
+    return summary
+
+def save_pincode_totals(totals, path):
+    """Writes pincode_totals output (Parquet, written via a temp file)."""
+    tmp_path = path + '.tmp'
+    totals.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def load_pincode_totals(path):
+    """Reads totals written by save_pincode_totals, or None if there are none yet."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+def cluster_pincodes(totals, centroids=None, method='auto', return_centroids=False):
+    """
+    Pincode-level network plan: the pincode_summary units clustered like
+    cluster_districts (with some 19k pincodes method='auto' runs mini-batch k-means).
+    centroids must come from an earlier pincode-level fit (load_centroids(level='pincode')).
+    """
+    summary = pincode_summary(totals)
+    fitted = _plan_units(summary, centroids, method)
+    if return_centroids:
+        return summary, fitted
+    return summary
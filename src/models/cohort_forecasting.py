@@ -0,0 +1,190 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Nightly cohort outlook and the district-month totals it is fitted on (data/processed)
+COHORT_FORECASTS_NAME = 'cohort_forecasts.parquet'
+COHORT_TOTALS_NAME = 'cohort_monthly.parquet'
+
+# Mandatory biometric update transitions: (enrolment column, years until the update is due)
+# - children enrolled at 0-5 reach the age-5 update ~5 years later and the age-15 update ~15 years later
+# - children enrolled at 5-17 reach the age-15 update ~10 years later
+COHORT_LAGS = [('age_0_5', 5), ('age_0_5', 15), ('age_5_17', 10)]
+
+TARGET = 'total_bio_updates'
+
+# Months of fitted history a lag feature needs before it is used
+MIN_FIT_MONTHS = 12
+
+# Small ridge penalty on the lag coefficients (keeps all-zero cohorts solvable)
+RIDGE = 1e-6
+
+
+def _month_index(dates):
+    """Months since 1970-01 for a datetime column."""
+    months = pd.to_datetime(dates).to_numpy().astype('datetime64[M]').astype(np.int64)
+    return months
+
+
+def monthly_cohort_totals(frames, keys=('state', 'district'), totals=None):
+    """
+    District-month sums of the cohort columns and the target: (keys..., month,
+    columns) with month counted from 1970-01.
+
+    `frames` is a DataFrame or an iterable of DataFrames of any grain (pincode-day,
+    district-day...; e.g. one per year read from the store), so a decade of pincode
+    data never has to be in memory at once: each chunk is reduced to district-month
+    sums before the next one is read. Earlier `totals` from this function are added
+    to, so a run that appends days only has to aggregate its new rows.
+    """
+    keys = list(keys)
+    columns = sorted({col for col, _ in COHORT_LAGS} | {TARGET})
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+
+    partials = [] if totals is None else [totals.set_index(keys + ['month'])[columns]]
+    for frame in frames:
+        chunk = frame[keys + [c for c in columns if c in frame.columns]].copy()
+        for col in columns:
+            if col not in chunk.columns:
+                chunk[col] = 0.0
+        chunk['month'] = _month_index(frame['date'])
+        partials.append(chunk.groupby(keys + ['month'], observed=True)[columns].sum())
+    combined = pd.concat(partials)
+    # Keys from different chunks compare as text (their categories differ)
+    combined.index = pd.MultiIndex.from_arrays(
+        [combined.index.get_level_values(k).astype(str) for k in keys] + [combined.index.get_level_values('month')],
+        names=keys + ['month']
+    )
+    return combined.groupby(level=keys + ['month']).sum().reset_index()
+
+
+def monthly_cohort_panel(frames=None, keys=('state', 'district'), totals=None):
+    """
+    Aggregates district rows into a dense district x month panel of the enrolment
+    cohorts and the target (see monthly_cohort_totals; with frames=None the panel is
+    built from `totals` alone).
+
+    Returns (districts, first_month, {column: 2-D array [district, month]}).
+    """
+    keys = list(keys)
+    columns = sorted({col for col, _ in COHORT_LAGS} | {TARGET})
+    monthly = totals if frames is None else monthly_cohort_totals(frames, keys, totals)
+
+    district_codes, districts = pd.factorize(pd.MultiIndex.from_frame(monthly[keys].astype(object)), sort=True)
+    first_month = int(monthly['month'].min())
+    month_pos = (monthly['month'] - first_month).to_numpy()
+    n_months = int(month_pos.max()) + 1
+
+    panel = {}
+    for col in columns:
+        grid = np.zeros((len(districts), n_months))
+        grid[district_codes, month_pos] = monthly[col].fillna(0).to_numpy(dtype='float64')
+        panel[col] = grid
+    return districts, first_month, panel
+
+
+def _lagged(grid, lag_months, n_months):
+    """grid shifted right by lag_months along the month axis (NaN where unknown), extended to n_months."""
+    out = np.full((grid.shape[0], n_months), np.nan)
+    if lag_months < n_months:
+        width = min(grid.shape[1], n_months - lag_months)
+        out[:, lag_months:lag_months + width] = grid[:, :width]
+    return out
+
+
+def _solve(xtx, xty, n_fixed):
+    """
+    Solves a batch of normal equations. Columns after the first n_fixed get a ridge
+    penalty relative to their own scale; a tiny floor keeps all-zero columns solvable.
+    """
+    diag = np.diagonal(xtx, axis1=1, axis2=2).copy()
+    reg = np.full(diag.shape, 1e-9)
+    reg[:, n_fixed:] += RIDGE * diag[:, n_fixed:]
+    system = xtx + reg[:, :, None] * np.eye(xtx.shape[1])
+    return np.linalg.solve(system, xty[..., None])[..., 0]
+
+
+def cohort_forecast(frames=None, months_ahead=12, keys=('state', 'district'), totals=None):
+    """
+    Forecasts monthly biometric update demand for every district in one pass.
+
+    Model per district: total_bio_updates ~ 1 + month + lagged cohort enrolments
+    (COHORT_LAGS). All district regressions are solved together as one batch of
+    normal equations. Lags whose shifted series do not cover MIN_FIT_MONTHS of the
+    history are left out (a decade is needed for the 10-year lag), and districts
+    without any cohort signal fall back to the linear trend.
+
+    frames / totals are as in monthly_cohort_panel. Returns a tidy frame
+    (keys..., month, predicted_demand, method) where method is 'cohort' or 'trend'.
+    """
+    keys = list(keys)
+    districts, first_month, panel = monthly_cohort_panel(frames, keys, totals)
+    y = panel[TARGET]
+    n_districts, n_hist = y.shape
+    n_total = n_hist + months_ahead
+
+    # Design tensor [district, month, feature]: intercept, trend, usable lags
+    t = np.arange(n_total, dtype='float64')
+    features = [np.ones((n_districts, n_total)), np.broadcast_to(t, (n_districts, n_total))]
+    for col, years in COHORT_LAGS:
+        lag = _lagged(panel[col], 12 * years, n_total)
+        if np.isfinite(lag[0, :n_hist]).sum() >= MIN_FIT_MONTHS:
+            features.append(lag)
+    X = np.stack(features, axis=2)
+    n_lags = X.shape[2] - 2
+
+    # Fit on the history months where every used lag is known
+    fit_rows = np.isfinite(X[0, :n_hist]).all(axis=1)
+    Xf = np.nan_to_num(X[:, :n_hist][:, fit_rows])
+    yf = y[:, fit_rows]
+
+    # Batched normal equations: (X'X + ridge) b = X'y for every district at once
+    xtx = np.einsum('dtp,dtq->dpq', Xf, Xf)
+    xty = np.einsum('dtp,dt->dp', Xf, yf)
+    beta = _solve(xtx, xty, n_fixed=2)
+
+    has_cohort = np.zeros(n_districts, dtype=bool)
+    if n_lags:
+        has_cohort = np.abs(Xf[:, :, 2:]).sum(axis=(1, 2)) > 0
+
+    # Trend fallback: intercept + trend on the whole history where there is no cohort signal
+    if (~has_cohort).any():
+        Xt = X[~has_cohort, :n_hist, :2]
+        xtx_t = np.einsum('dtp,dtq->dpq', Xt, Xt)
+        xty_t = np.einsum('dtp,dt->dp', Xt, y[~has_cohort])
+        beta[~has_cohort] = 0.0
+        beta[~has_cohort, :2] = _solve(xtx_t, xty_t, n_fixed=2)
+
+    future = np.nan_to_num(X[:, n_hist:])
+    predicted = np.einsum('dtp,dp->dt', future, beta)
+
+    index = districts.to_frame(index=False, name=keys)
+    out = index.iloc[np.repeat(np.arange(n_districts), months_ahead)].reset_index(drop=True)
+    months = first_month + n_hist + np.tile(np.arange(months_ahead), n_districts)
+    out['month'] = months.astype('datetime64[M]').astype('datetime64[ns]')
+    out['predicted_demand'] = np.maximum(predicted.reshape(-1), 0)
+    out['method'] = np.repeat(np.where(has_cohort, 'cohort', 'trend'), months_ahead)
+    return out
+
+
+def save_cohort_forecasts(forecasts, path):
+    """Writes the cohort forecasts (Parquet, written via a temp file)."""
+    tmp_path = path + '.tmp'
+    forecasts.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def save_cohort_totals(totals, path):
+    """Writes monthly_cohort_totals output (Parquet, written via a temp file)."""
+    tmp_path = path + '.tmp'
+    totals.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_cohort_totals(path):
+    """Reads totals written by save_cohort_totals, or None if there are none yet."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
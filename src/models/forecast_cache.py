@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .forecasting import FORECAST_MODEL_VERSION
+
+# On-disk layer shared by dashboard workers (data/processed)
+FORECAST_CACHE_NAME = 'forecast_cache'
+
+# Per-district data hashes of the last ingest, used to invalidate changed districts
+DATA_HASHES_NAME = 'data_hashes.json'
+
+# In-memory budget per process
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _district_key(state, district):
+    return f"{state}|{district}"
+
+
+def district_data_hashes(df, keys=('state', 'district'), target='total_bio_updates'):
+    """
+    Snapshot hash of each district's history (date and target), as hex strings keyed
+    'state|district'. Row order does not matter; any changed, added or removed row
+    changes the district's hash.
+    """
+    keys = list(keys)
+    rows = pd.util.hash_pandas_object(df[['date', target]], index=False).to_numpy()
+    # Sum of row hashes (mod 2^64) per district: order independent
+    sums = pd.Series(rows.view(np.int64)).groupby([df[k].to_numpy() for k in keys], sort=False).sum()
+    return {_district_key(*idx): format(int(val) & _HASH_MASK, '016x') for idx, val in sums.items()}
+
+
+def add_data_hashes(hashes, df, keys=('state', 'district'), target='total_bio_updates'):
+    """
+    district_data_hashes after appending df's rows to the histories `hashes` was
+    computed on: each hash is a sum of row hashes, so only the new rows are hashed.
+    """
+    updated = dict(hashes)
+    for key, added in district_data_hashes(df, keys, target).items():
+        updated[key] = format((int(updated.get(key, '0'), 16) + int(added, 16)) & _HASH_MASK, '016x')
+    return updated
+
+
+def load_data_hashes(cache_dir):
+    """Per-district hashes stored by the last invalidate_changed_districts ({} if none)."""
+    hashes_path = os.path.join(cache_dir, DATA_HASHES_NAME)
+    if not os.path.exists(hashes_path):
+        return {}
+    with open(hashes_path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+class ForecastCache:
+    """
+    LRU cache of forecast frames keyed by (state, district, horizon, model version,
+    data hash), bounded by `memory_budget` bytes, with an optional on-disk layer
+    (one Parquet file per entry) that every worker process reads and fills.
+    """
+
+    def __init__(self, cache_dir=None, memory_budget=DEFAULT_MEMORY_BUDGET, model_version=FORECAST_MODEL_VERSION):
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_budget
+        self.model_version = model_version
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, state, district, horizon, data_hash):
+        return (str(state), str(district), int(horizon), self.model_version, data_hash)
+
+    def _path(self, key):
+        # File name: district prefix (for invalidation) + digest of the full key
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+        prefix = hashlib.sha1(_district_key(key[0], key[1]).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{prefix}-{digest}.parquet")
+
+    def _remember(self, key, frame):
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (frame, size)
+            self._bytes += size
+            # Evict least recently used entries beyond the budget (keep the newest one)
+            while self._bytes > self.memory_budget and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+
+    def get(self, state, district, horizon, data_hash):
+        """Cached forecast or None (memory first, then disk)."""
+        key = self._key(state, district, horizon, data_hash)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        if self.cache_dir and os.path.exists(self._path(key)):
+            frame = pd.read_parquet(self._path(key))
+            self._remember(key, frame)
+            self.hits += 1
+            return frame
+        self.misses += 1
+        return None
+
+    def put(self, state, district, horizon, data_hash, frame):
+        key = self._key(state, district, horizon, data_hash)
+        self._remember(key, frame)
+        if self.cache_dir:
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+    def get_or_compute(self, state, district, horizon, data_hash, compute):
+        """Returns the cached forecast, or calls compute() and caches its (non-None) result."""
+        frame = self.get(state, district, horizon, data_hash)
+        if frame is None:
+            frame = compute()
+            if frame is not None:
+                self.put(state, district, horizon, data_hash, frame)
+        return frame
+
+    def invalidate(self, districts):
+        """Drops every entry (memory and disk) of the given (state, district) pairs."""
+        targets = {(str(s), str(d)) for s, d in districts}
+        with self._lock:
+            for key in [k for k in self._entries if (k[0], k[1]) in targets]:
+                self._bytes -= self._entries.pop(key)[1]
+        if self.cache_dir:
+            prefixes = {hashlib.sha1(_district_key(s, d).encode('utf-8')).hexdigest()[:12] for s, d in targets}
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.parquet') and name.split('-', 1)[0] in prefixes:
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+def invalidate_changed_districts(cache_dir, new_hashes):
+    """
+    Compares per-district data hashes with those stored at the last ingest, drops the
+    on-disk forecasts of districts whose data changed (or disappeared) and stores the
+    new hashes. Returns the list of invalidated 'state|district' keys.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    hashes_path = os.path.join(cache_dir, DATA_HASHES_NAME)
+    old_hashes = load_data_hashes(cache_dir)
+
+    changed = [k for k, h in old_hashes.items() if new_hashes.get(k) != h]
+    ForecastCache(cache_dir).invalidate(k.split('|', 1) for k in changed)
+
+    tmp_path = hashes_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(new_hashes, fh)
+    os.replace(tmp_path, hashes_path)
+    return changed
@@ -1,44 +1,129 @@
-from sklearn.linear_model import LinearRegression
+import os
+
 import pandas as pd
 import numpy as np
+from scipy import stats
+
+# Nightly batch output read by the dashboard (data/processed)
+FORECASTS_NAME = 'demand_forecasts.parquet'
+
+# Bumped whenever the forecasting method changes (part of the forecast cache key)
+FORECAST_MODEL_VERSION = 'linear-trend-1'
+
+# Longest horizon the dashboard offers
+FORECAST_HORIZON = 60
+
+# Groups with fewer observations are not forecast (same cut-off as predict_biometric_demand)
+MIN_POINTS = 10
+
+# date.toordinal() of 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+def _ordinals(dates):
+    """Vectorized date.toordinal() for a datetime column."""
+    days = pd.to_datetime(dates).to_numpy().astype('datetime64[D]').astype(np.int64)
+    return days + _EPOCH_ORDINAL
+
+def _fit_trends(frame, keys, target):
+    """
+    Closed-form least squares fit of target = a + b * time_idx for every group in one pass.
+    Returns one row per group: n, x_mean, y_mean, slope, sxx, sse and last_date.
+    """
+    data = pd.DataFrame({
+        'x': _ordinals(frame['date']).astype('float64'),
+        'y': frame[target].to_numpy(dtype='float64'),
+        'date': pd.to_datetime(frame['date']).to_numpy(),
+    })
+    for key in keys:
+        data[key] = frame[key].to_numpy()
+    grouped = data.groupby(keys, observed=True, sort=True)
+
+    # Centered per group: exact and numerically stable (ordinals are ~7e5)
+    xc = data['x'] - grouped['x'].transform('mean')
+    yc = data['y'] - grouped['y'].transform('mean')
+    data['xx'] = xc * xc
+    data['xy'] = xc * yc
+    data['yy'] = yc * yc
+
+    fits = data.groupby(keys, observed=True, sort=True).agg(
+        n=('y', 'size'), x_mean=('x', 'mean'), y_mean=('y', 'mean'),
+        sxx=('xx', 'sum'), sxy=('xy', 'sum'), syy=('yy', 'sum'), last_date=('date', 'max'))
+    # A single distinct day has no trend: flat forecast (as LinearRegression's minimum-norm fit)
+    fits['slope'] = np.where(fits['sxx'] > 0, fits['sxy'] / fits['sxx'].where(fits['sxx'] > 0, 1), 0.0)
+    fits['sse'] = (fits['syy'] - fits['slope'] * fits['sxy']).clip(lower=0)
+    return fits.reset_index()
+
+def forecast_demand(df, days_ahead=FORECAST_HORIZON, keys=('state', 'district'),
+                    target='total_bio_updates', interval=0.95, min_points=MIN_POINTS):
+    """
+    Batch linear-trend forecast for every group (district by default) at once.
+
+    Returns a tidy frame (keys..., date, predicted_demand, lower, upper) with
+    `days_ahead` days after each group's last date. lower / upper are the
+    `interval` prediction bounds of the OLS fit (Student t, n-2 dof).
+    Predictions are floored at 0. Groups with fewer than min_points rows are skipped.
+    """
+    keys = list(keys)
+    fits = _fit_trends(df, keys, target)
+    fits = fits[fits['n'] >= min_points].reset_index(drop=True)
+    if fits.empty:
+        return pd.DataFrame(columns=keys + ['date', 'predicted_demand', 'lower', 'upper'])
+
+    # Future grid: days_ahead rows per group
+    rows = np.repeat(np.arange(len(fits)), days_ahead)
+    step = np.tile(np.arange(1, days_ahead + 1), len(fits))
+    g = fits.iloc[rows].reset_index(drop=True)
+    dates = g['last_date'] + pd.to_timedelta(step, unit='D')
+    x0 = _ordinals(dates).astype('float64')
+
+    predicted = g['y_mean'].to_numpy() + g['slope'].to_numpy() * (x0 - g['x_mean'].to_numpy())
+
+    # Prediction interval: t * s * sqrt(1 + 1/n + (x0 - x_mean)^2 / Sxx)
+    n = g['n'].to_numpy(dtype='float64')
+    dof = np.maximum(n - 2, 1)
+    s = np.sqrt(g['sse'].to_numpy() / dof)
+    sxx = g['sxx'].to_numpy()
+    leverage = np.where(sxx > 0, (x0 - g['x_mean'].to_numpy()) ** 2 / np.where(sxx > 0, sxx, 1), 0.0)
+    half_width = stats.t.ppf(0.5 + interval / 2, dof) * s * np.sqrt(1 + 1 / n + leverage)
+
+    results = g[keys].copy()
+    results['date'] = dates
+    # Ensure no negative predictions
+    results['predicted_demand'] = np.maximum(predicted, 0)
+    results['lower'] = np.maximum(predicted - half_width, 0)
+    results['upper'] = np.maximum(predicted + half_width, 0)
+    return results
+
+def save_forecasts(forecasts, path):
+    """Writes the batch forecasts (Parquet, written via a temp file)."""
+    tmp_path = path + '.tmp'
+    forecasts.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def load_forecasts(path):
+    """Reads forecasts written by save_forecasts, or None if there are none yet."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
 
 def predict_biometric_demand(df, district_name, days_ahead=30):
     """
     Simple regression model to forecast biometric updates for a specific district.
-    Uses 'age_0_5' enrolments (lagged) if available, otherwise uses trend.
+    Linear trend on the daily series: single-district view of forecast_demand (same
+    fit, interval columns included). The lagged age_0_5 cohort model is
+    cohort_forecasting.cohort_forecast.
     """
-    
+
     district_data = df[df['district'] == district_name].copy()
     district_data = district_data.sort_values('date')
-    
-    if len(district_data) < 10:
+
+    if len(district_data) < MIN_POINTS:
         return None, None
-        
+
     # Feature: Time ordinal
-    district_data['time_idx'] = pd.to_datetime(district_data['date']).apply(lambda x: x.toordinal())
-    
-    X = district_data[['time_idx']]
-    y = district_data['total_bio_updates']
-    
-    model = LinearRegression()
-    model.fit(X, y)
-    
-    # Future dates
-    last_date = district_data['date'].max()
-    future_dates = [last_date + pd.Timedelta(days=i) for i in range(1, days_ahead + 1)]
-    future_ordinals = [d.toordinal() for d in future_dates]
-    
-    # Create DataFrame for prediction to match feature names
-    X_future = pd.DataFrame({'time_idx': future_ordinals})
-    
-    predictions = model.predict(X_future)
-    
-    results = pd.DataFrame({
-        'date': future_dates,
-        'predicted_demand': predictions
-    })
-    
-    # Ensure no negative predictions
-    results['predicted_demand'] = results['predicted_demand'].apply(lambda x: max(0, x))
-    
+    district_data['time_idx'] = _ordinals(district_data['date'])
+
+    results = forecast_demand(district_data, days_ahead=days_ahead, keys=['district'])
+    results = results[['date', 'predicted_demand', 'lower', 'upper']].reset_index(drop=True)
+
     return district_data, results
@@ -0,0 +1,131 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .anomaly_detection import ANOMALY_FEATURES
+
+# Stored next to the processed store in data/processed
+ONLINE_STATE_NAME = 'online_anomaly_state.json'
+
+# Same volume column the batch spike rule uses
+VOLUME_COLUMN = 'total_updates'
+
+# Bio updates above this multiple of demo updates are suspicious (as in specific_fraud_rules)
+BIO_RATIO_LIMIT = 5
+
+
+def new_online_state(keys=('state', 'district'), alpha=0.1, z_threshold=4.0, warmup=7):
+    """
+    Empty streaming detector state.
+
+    - keys: columns identifying a series (add 'pincode' for pincode-level rows)
+    - alpha: EWMA weight of the newest observation
+    - z_threshold: deviations (in EWMA standard deviations) that raise a flag
+    - warmup: observations a series needs before it can be flagged
+    """
+    return {
+        'keys': list(keys),
+        'alpha': alpha,
+        'z_threshold': z_threshold,
+        'warmup': warmup,
+        'last_date': None,
+        'series': {},
+    }
+
+
+def _series_key(values):
+    return '|'.join(str(v) for v in values)
+
+
+def _stats_frame(state, keys):
+    """Current statistics of the given series as aligned arrays (zeros for unseen series)."""
+    columns = [VOLUME_COLUMN] + ANOMALY_FEATURES
+    n = np.zeros(len(keys), dtype=np.int64)
+    mean = np.zeros((len(keys), len(columns)))
+    var = np.zeros((len(keys), len(columns)))
+    for i, key in enumerate(keys):
+        stats = state['series'].get(key)
+        if stats is not None:
+            n[i] = stats['n']
+            mean[i] = stats['mean']
+            var[i] = stats['var']
+    return n, mean, var
+
+
+def _score_step(state, keys, X):
+    """Scores one observation per series (rows of X), then folds them into the EWMA stats."""
+    n, mean, var = _stats_frame(state, keys)
+
+    # Deviation against the statistics before this observation; the std has a
+    # Poisson-style floor so flat series do not flag on +/-1 changes
+    std = np.maximum(np.sqrt(var), np.maximum(1.0, np.sqrt(np.abs(mean))))
+    z = (X - mean) / std
+    z[n < state['warmup']] = 0.0
+
+    # EWMA mean / variance update (first observation initializes the series)
+    alpha = state['alpha']
+    diff = X - mean
+    incr = alpha * diff
+    new_mean = np.where(n[:, None] == 0, X, mean + incr)
+    new_var = np.where(n[:, None] == 0, 0.0, (1 - alpha) * (var + diff * incr))
+    for i, key in enumerate(keys):
+        state['series'][key] = {'n': int(n[i] + 1), 'mean': new_mean[i].tolist(), 'var': new_var[i].tolist()}
+    return z
+
+
+def score_online(state, batch):
+    """
+    Scores incoming rows against each series' running statistics and updates them,
+    in O(1) per row. Rows are taken in date order; a series seen several times in
+    the batch is updated once per row.
+
+    Adds the batch-compatible flags:
+    - is_anomaly / anomaly_score (-1 / 1): any feature deviates more than z_threshold
+    - high_volume_spike: total_updates above its running mean by more than z_threshold
+    - suspicious_bio_ratio: bio updates > 5x demo updates
+    plus anomaly_z, the largest absolute feature deviation.
+    """
+    if batch is None or batch.empty:
+        return batch
+
+    batch = batch.sort_values('date', kind='stable').reset_index(drop=True)
+    keys = np.array([_series_key(v) for v in batch[state['keys']].itertuples(index=False)], dtype=object)
+    X = batch[[VOLUME_COLUMN] + ANOMALY_FEATURES].fillna(0).to_numpy(dtype='float64')
+
+    # Occurrence rank of each row within its series: every rank is one vectorized step
+    rank = pd.Series(keys).groupby(keys, sort=False).cumcount().to_numpy()
+    z = np.zeros_like(X)
+    for r in range(rank.max() + 1):
+        rows = np.flatnonzero(rank == r)
+        z[rows] = _score_step(state, keys[rows], X[rows])
+
+    feature_z = np.abs(z[:, 1:])
+    batch['anomaly_z'] = feature_z.max(axis=1)
+    batch['is_anomaly'] = batch['anomaly_z'] > state['z_threshold']
+    batch['anomaly_score'] = np.where(batch['is_anomaly'], -1, 1)
+    batch['high_volume_spike'] = z[:, 0] > state['z_threshold']
+    batch['suspicious_bio_ratio'] = batch['total_bio_updates'] > (batch['total_demo_updates'] * BIO_RATIO_LIMIT)
+
+    last = batch['date'].max()
+    if state['last_date'] is not None:
+        last = max(last, pd.Timestamp(state['last_date']))
+    state['last_date'] = pd.Timestamp(last).isoformat()
+    return batch
+
+
+def save_online_state(state, path):
+    """Writes the state as JSON (temp file + rename)."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh)
+    os.replace(tmp_path, path)
+
+
+def load_online_state(path):
+    """Loads a state written by save_online_state, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
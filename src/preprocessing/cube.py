@@ -0,0 +1,226 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .storage import concat_frames
+
+# Default location of the cube (relative to data/processed)
+CUBE_NAME = 'aggregate_cube'
+
+# Geographic levels and the key columns each one is grouped by
+LEVEL_KEYS = {
+    'state': ['state'],
+    'district': ['state', 'district'],
+}
+
+# Time grains, finest last (range queries use the coarsest whole periods first)
+GRAINS = ['month', 'week', 'day']
+
+# Summed measures (ausi_score is summed too: mean = ausi_score / rows)
+CUBE_MEASURES = [
+    'total_enrolment', 'total_updates', 'total_bio_updates', 'total_demo_updates',
+    'age_0_5', 'ausi_score'
+]
+
+ROW_COUNT = 'rows'
+
+_ONE_DAY = pd.Timedelta(days=1)
+
+
+def period_start(dates, grain):
+    """First day of the day / week (Monday) / month each date falls in."""
+    dates = pd.to_datetime(dates)
+    if grain == 'day':
+        return dates.dt.normalize() if isinstance(dates, pd.Series) else dates.normalize()
+    if grain == 'week':
+        if isinstance(dates, pd.Series):
+            return dates.dt.normalize() - pd.to_timedelta(dates.dt.dayofweek, unit='D')
+        return dates.normalize() - pd.Timedelta(days=dates.dayofweek)
+    if grain == 'month':
+        if isinstance(dates, pd.Series):
+            return dates.dt.to_period('M').dt.start_time
+        return dates.to_period('M').start_time
+    raise ValueError(f"Unknown grain '{grain}', expected one of {GRAINS}")
+
+
+def _next_period(start, grain):
+    if grain == 'day':
+        return start + _ONE_DAY
+    if grain == 'week':
+        return start + pd.Timedelta(days=7)
+    return start + pd.offsets.MonthBegin(1)
+
+
+def build_cube(district_df, measures=None):
+    """
+    Builds the aggregate cube from a district-level daily frame
+    (aggregate_by_district output, optionally with ausi_score).
+
+    Returns {(level, grain): DataFrame} with one row per period start ('date')
+    and level keys, holding the summed measures and the number of district-days.
+    Each table is sorted by date so range queries are a binary search.
+    """
+    measures = [m for m in (measures or CUBE_MEASURES) if m in district_df.columns]
+    base = district_df[['date', 'state', 'district'] + measures].copy()
+    base['date'] = pd.to_datetime(base['date'])
+    base[ROW_COUNT] = 1
+
+    cube = {}
+    for grain in GRAINS:
+        framed = base.assign(date=period_start(base['date'], grain))
+        for level, keys in LEVEL_KEYS.items():
+            table = (
+                framed.groupby(['date'] + keys, observed=True, sort=True)[measures + [ROW_COUNT]]
+                .sum()
+                .reset_index()
+            )
+            cube[(level, grain)] = table
+    return cube
+
+
+def update_cube(cube, district_df):
+    """
+    Adds district-days that are not in the cube yet (e.g. the days after its last
+    date) to a build_cube / load_cube cube. Only the rows of the periods they fall in
+    are summed again; earlier periods are kept as they are. Returns the new cube.
+    """
+    delta = build_cube(district_df)
+    first_day = pd.to_datetime(district_df['date']).min()
+
+    updated = {}
+    for (level, grain), table in cube.items():
+        keys = ['date'] + LEVEL_KEYS[level]
+        # Tables are sorted by date: everything from the first touched period on is re-summed
+        split = np.searchsorted(table['date'].to_numpy(), np.datetime64(period_start(first_day, grain)), side='left')
+        tail = concat_frames([table.iloc[split:], delta[(level, grain)][table.columns]])
+        tail = tail.groupby(keys, observed=True, sort=True).sum().reset_index()
+        updated[(level, grain)] = concat_frames([table.iloc[:split], tail[table.columns]])
+    return updated
+
+
+def write_cube(cube, cube_dir):
+    """Writes each table as <level>_<grain>.parquet in cube_dir."""
+    os.makedirs(cube_dir, exist_ok=True)
+    for (level, grain), table in cube.items():
+        table.to_parquet(os.path.join(cube_dir, f"{level}_{grain}.parquet"), index=False)
+
+
+def load_cube(cube_dir):
+    """Reads a cube written by write_cube, or None if it is missing or incomplete."""
+    cube = {}
+    for level in LEVEL_KEYS:
+        for grain in GRAINS:
+            path = os.path.join(cube_dir, f"{level}_{grain}.parquet")
+            if not os.path.exists(path):
+                return None
+            cube[(level, grain)] = pd.read_parquet(path)
+    return cube
+
+
+def _cover(start, end, grains):
+    """
+    Splits the day range [start, end] into (grain, first_period, last_period) pieces:
+    whole months first, then whole weeks, then single days at the edges.
+    """
+    grain, rest = grains[0], grains[1:]
+    if grain == 'day':
+        return [('day', start, end)]
+
+    first = period_start(start, grain)
+    if first < start:
+        first = _next_period(first, grain)
+    # Last period that ends on or before `end`
+    last = period_start(end + _ONE_DAY, grain) - _ONE_DAY
+    last_start = period_start(last, grain)
+    if first > last:
+        return _cover(start, end, rest)
+
+    pieces = [(grain, first, last_start)]
+    if start < first:
+        pieces = _cover(start, first - _ONE_DAY, rest) + pieces
+    if last < end:
+        pieces = pieces + _cover(last + _ONE_DAY, end, rest)
+    return pieces
+
+
+def _slice_periods(table, first, last):
+    """Rows whose period start lies in [first, last] (table is sorted by date)."""
+    dates = table['date'].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(first), side='left')
+    hi = np.searchsorted(dates, np.datetime64(last), side='right')
+    return table.iloc[lo:hi]
+
+
+def _period_rows(cube, level, grain, start, end):
+    """
+    Rows of the `grain` periods that overlap [start, end]. Whole periods come from
+    the grain table; a period that sticks out of the range at either edge is summed
+    again from the days inside the range, so it only counts those days.
+    """
+    table = cube[(level, grain)]
+    first = period_start(start, grain)
+    first_whole = first if first == start else _next_period(first, grain)
+    # Start of the period `end` falls in, unless `end` closes it
+    after = period_start(end + _ONE_DAY, grain)
+
+    if first_whole >= after:
+        whole, edges = table.iloc[:0], [(start, end)]
+    else:
+        whole = _slice_periods(table, first_whole, after - _ONE_DAY)
+        edges = [(s, e) for s, e in ((start, first_whole - _ONE_DAY), (after, end)) if s <= e]
+    if not edges:
+        return whole
+
+    days = pd.concat([_slice_periods(cube[(level, 'day')], s, e) for s, e in edges], ignore_index=True)
+    days = (
+        days.assign(date=period_start(days['date'], grain))
+        .groupby(['date'] + LEVEL_KEYS[level], observed=True, sort=True)[table.columns[1 + len(LEVEL_KEYS[level]):]]
+        .sum()
+        .reset_index()
+    )
+    return pd.concat([whole, days[table.columns]], ignore_index=True)
+
+
+def query_cube(cube, start_date=None, end_date=None, state=None, district=None,
+               by=('date',), grain='day', measures=None):
+    """
+    Answers a filter + group-by question from the cube.
+
+    - start_date / end_date: inclusive day range (None = whole cube)
+    - state / district: optional single-value filters
+    - by: any of 'date', 'state', 'district' (empty = grand total)
+    - grain: period of the 'date' column when grouping by date
+
+    Without 'date' in `by`, the range is covered by whole months, then whole
+    weeks, then days, so totals are exact for any range. With 'date', rows are the
+    `grain` periods overlapping the range (labelled by period start); edge periods
+    only count the days inside the range.
+    Returns the summed measures plus ROW_COUNT (district-days aggregated).
+    """
+    by = list(by)
+    level = 'district' if district is not None or 'district' in by else 'state'
+    day_table = cube[(level, 'day')]
+    value_cols = [c for c in day_table.columns if c not in ['date'] + LEVEL_KEYS[level]]
+    if measures is not None:
+        value_cols = [c for c in value_cols if c in measures or c == ROW_COUNT]
+    if day_table.empty:
+        return pd.DataFrame(columns=by + value_cols)
+
+    start = pd.Timestamp(start_date).normalize() if start_date is not None else day_table['date'].iloc[0]
+    end = pd.Timestamp(end_date).normalize() if end_date is not None else day_table['date'].iloc[-1]
+
+    if 'date' in by:
+        rows = _period_rows(cube, level, grain, start, end)
+    else:
+        pieces = [_slice_periods(cube[(level, g)], first, last) for g, first, last in _cover(start, end, GRAINS)]
+        rows = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+
+    if state is not None:
+        rows = rows[rows['state'] == state]
+    if district is not None:
+        rows = rows[rows['district'] == district]
+
+    if not by:
+        return rows[value_cols].sum().to_frame().T
+    return rows.groupby(by, observed=True, sort=True)[value_cols].sum().reset_index()
@@ -2,58 +2,112 @@ import pandas as pd
 import os
 
 import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-def load_dataset(filepath):
+from .schema import DATE_FORMAT, enforce_schema, non_whole_counts, parse_dates_cached, read_dtypes
+
+def load_dataset(filepath, source=None, engine=None):
     """
     Load a dataset and parse the 'date' column.
+
+    source ('enrolment', 'biometric', 'demographic') applies the declared column
+    types from preprocessing.schema; without it only the key columns are typed.
+    engine='pyarrow' uses the multithreaded Arrow CSV reader instead of the C parser.
     """
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"File not found: {filepath}")
     
-    df = pd.read_csv(filepath)
+    # Map declared dtypes onto the raw header (which may carry stray spaces)
+    header = pd.read_csv(filepath, nrows=0).columns
+    declared = read_dtypes(source)
+    dtypes = {c: declared[c.strip()] for c in header if c.strip() in declared}
+
+    read_kwargs = {'dtype': dtypes}
+    if engine is not None:
+        read_kwargs['engine'] = engine
+    df = pd.read_csv(filepath, **read_kwargs)
     # Standardize column names if necessary (strip spaces)
     df.columns = [c.strip() for c in df.columns]
     
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+        df['date'] = parse_dates_cached(df['date'], DATE_FORMAT)
+
+    # Fractional counts are kept (as float64), but reported with their CSV line numbers
+    for col, rows in non_whole_counts(df, source).items():
+        lines = ', '.join(str(i + 2) for i in rows[:5]) + (', ...' if len(rows) > 5 else '')
+        print(f"Warning: {filepath}: {len(rows)} non-whole value(s) in count column '{col}' (lines {lines})")
     
-    return df
+    return enforce_schema(df, source)
 
-def load_from_folder(folder_path):
-    """
-    Loads and concatenates all CSV files from a directory.
-    """
-    all_files = glob.glob(os.path.join(folder_path, "*.csv"))
-    if not all_files:
-        return None
-        
-    print(f"Found {len(all_files)} files in {folder_path}. Merging...")
+# Map key -> (single_filename_in_data_dir, folder_name_in_root)
+SOURCES = {
+    'enrolment': ('aadhaar_enrolment.csv', 'api_data_aadhar_enrolment'),
+    'biometric': ('aadhaar_biometric_update.csv', 'api_data_aadhar_biometric'),
+    'demographic': ('aadhaar_demographic_update.csv', 'api_data_aadhar_demographic')
+}
+
+def _make_executor(workers, executor='thread'):
+    """Creates the worker pool used for parallel ingestion ('thread' or 'process')."""
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor '{executor}'. Use 'thread' or 'process'.")
+
+def _submit_files(pool, files, source, engine):
+    """Queues one load_dataset call per file on pool (None = load them in _collect_files)."""
+    if pool is None:
+        return [None] * len(files)
+    return [pool.submit(load_dataset, f, source, engine) for f in files]
+
+def _collect_files(files, futures, source, engine, on_file):
+    """Loaded frames of files in the order given (failed files are skipped), calling on_file for each."""
     dfs = []
-    for f in all_files:
+    # Collect in submission order (not completion order) to keep row order stable
+    for f, future in zip(files, futures):
         try:
-            dfs.append(load_dataset(f))
+            dfs.append(future.result() if future is not None else load_dataset(f, source, engine))
         except Exception as e:
             print(f"Warning: Failed to load {f}: {e}")
-            
+            continue
+        if on_file is not None:
+            on_file(source, f, dfs[-1])
     if dfs:
-        return pd.concat(dfs, ignore_index=True)
+        return enforce_schema(pd.concat(dfs, ignore_index=True), source)
     return None
 
-def load_all_datasets(data_dir):
+def load_files(files, workers=None, executor='thread', source=None, engine=None, on_file=None):
     """
-    Loads all three primary datasets.
-    Prioritizes split folders (api_data_*) in the project root.
-    Falls back to single files in data_dir.
+    Loads and concatenates a list of CSV files.
+
+    workers > 1 parses the files concurrently on a pool of `executor` workers
+    ('thread' or 'process'). Files are concatenated in the order given, so the
+    result is identical to the sequential path.
+    on_file(source, path, df) is called for every loaded file, in that same order
+    (e.g. integrity.SourceKeyLedger.add_file).
     """
-    # Map key -> (single_filename_in_data_dir, folder_name_in_root)
-    sources = {
-        'enrolment': ('aadhaar_enrolment.csv', 'api_data_aadhar_enrolment'),
-        'biometric': ('aadhaar_biometric_update.csv', 'api_data_aadhar_biometric'),
-        'demographic': ('aadhaar_demographic_update.csv', 'api_data_aadhar_demographic')
-    }
-    
-    datasets = {}
-    
+    if workers and workers > 1 and len(files) > 1:
+        with _make_executor(min(workers, len(files)), executor) as pool:
+            return _collect_files(files, _submit_files(pool, files, source, engine), source, engine, on_file)
+    return _collect_files(files, _submit_files(None, files, source, engine), source, engine, on_file)
+
+def _folder_files(folder_path):
+    """CSV files of a folder, sorted by name so every run reads them in the same order."""
+    return sorted(glob.glob(os.path.join(folder_path, "*.csv")))
+
+def load_from_folder(folder_path, workers=None, executor='thread', source=None, engine=None, on_file=None):
+    """
+    Loads and concatenates all CSV files from a directory, in file name order.
+    See load_files for the parallel options and on_file; source / engine are passed through to load_dataset.
+    """
+    all_files = _folder_files(folder_path)
+    if not all_files:
+        return None
+        
+    print(f"Found {len(all_files)} files in {folder_path}. Merging...")
+    return load_files(all_files, workers=workers, executor=executor, source=source, engine=engine, on_file=on_file)
+
+def _find_project_root():
     # Robustly find project root relative to this script file
     # file matches: src/preprocessing/data_loader.py
     # dirname -> src/preprocessing
@@ -62,36 +116,66 @@ def load_all_datasets(data_dir):
     try:
         current_script_path = os.path.abspath(__file__)
         src_dir = os.path.dirname(os.path.dirname(current_script_path))
-        project_root = os.path.dirname(src_dir)
+        return os.path.dirname(src_dir)
     except NameError:
         # Fallback if __file__ is not defined (e.g. interactive mode)
-        project_root = os.getcwd()
+        return os.getcwd()
 
-    for key, (filename, foldername) in sources.items():
-        parts = []
-        
-        # 1. Try loading from split folder in project root (Pure Merge, No Cleaning)
-        folder_path = os.path.join(project_root, foldername)
-        if os.path.exists(folder_path) and os.path.isdir(folder_path):
-            print(f"Loading {key} from split folder: {foldername}")
-            ds_folder = load_from_folder(folder_path)
-            if ds_folder is not None:
-                parts.append(ds_folder)
-
-        # 2. ALSO Load from single file in data_dir
-        path = os.path.join(data_dir, filename)
-        if os.path.exists(path):
-            print(f"Loading {key} from file: {path}")
-            ds_file = load_dataset(path)
-            if ds_file is not None:
-                parts.append(ds_file)
-        
-        if parts:
-            print(f"Combining {len(parts)} sources for {key}")
-            # Concatenate all found pieces (Folder parts + Single file)
-            datasets[key] = pd.concat(parts, ignore_index=True)
+def list_source_files(data_dir):
+    """
+    Lists the raw files load_all_datasets reads, per source, in reading order:
+    {'enrolment': [split folder files (sorted)..., single file], ...}
+    """
+    project_root = _find_project_root()
+    files = {}
+    for key, (filename, foldername) in SOURCES.items():
+        paths = _folder_files(os.path.join(project_root, foldername))
+        single = os.path.join(data_dir, filename)
+        if os.path.exists(single):
+            paths.append(single)
+        files[key] = paths
+    return files
+
+def load_all_datasets(data_dir, workers=None, executor='thread', engine=None, on_file=None):
+    """
+    Loads all three primary datasets.
+    Reads the split folders (api_data_*) in the project root and the single
+    files in data_dir (see list_source_files).
+
+    workers > 1 parses the files of all three datasets on one shared pool of that
+    many workers (see load_datasets_from_files).
+    Each source is read with its declared schema; engine selects the CSV parser.
+    on_file(source, path, df) is called for every file read (see load_files).
+    """
+    files_by_source = list_source_files(data_dir)
+    for key, files in files_by_source.items():
+        if not files:
+            filename, foldername = SOURCES[key]
+            print(f"Warning: {key} data not found (checked {foldername} and {os.path.join(data_dir, filename)})")
+    return load_datasets_from_files(files_by_source, workers=workers, executor=executor, engine=engine, on_file=on_file)
+
+def load_datasets_from_files(files_by_source, workers=None, executor='thread', engine=None, on_file=None):
+    """
+    Loads an explicit set of files per source (e.g. only the files not yet ingested).
+    Sources without files map to None, like load_all_datasets.
+
+    workers > 1 queues every file of every source on one pool up front, so sources
+    parse concurrently without nesting pools; frames and on_file calls still follow
+    the source and file order.
+    """
+    n_files = sum(len(files) for files in files_by_source.values())
+    if workers and workers > 1 and n_files > 1:
+        with _make_executor(min(workers, n_files), executor) as pool:
+            return _load_sources(files_by_source, pool, engine, on_file)
+    return _load_sources(files_by_source, None, engine, on_file)
+
+def _load_sources(files_by_source, pool, engine, on_file):
+    futures = {key: _submit_files(pool, files, key, engine) for key, files in files_by_source.items()}
+    datasets = {}
+    for key, files in files_by_source.items():
+        if files:
+            print(f"Loading {len(files)} file(s) for {key}")
+            datasets[key] = _collect_files(files, futures[key], key, engine, on_file)
         else:
-            print(f"Warning: {key} data not found (checked {foldername} and {path})")
             datasets[key] = None
-            
     return datasets
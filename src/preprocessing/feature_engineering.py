@@ -1,10 +1,130 @@
 import pandas as pd
 
-def create_master_table(datasets):
+from .lazy_store import StoreFrame
+
+MERGE_KEYS = ['date', 'state', 'district', 'pincode']
+TOTAL_COLUMNS = ['total_enrolment', 'total_bio_updates', 'total_demo_updates', 'total_updates']
+
+def add_total_columns(merged):
+    """
+    Adds the total_* columns to a merged master frame (in place, also returned).
+    """
+    # We use sum(axis=1, min_count=0) to treat NaNs as 0 during sum, but the logic 
+    # ensures that if all are NaN, it might return 0. 
+    # For anomaly detection, input columns remain NaN, but Total columns will be calculated.
+
+    # Total Enrolments
+    merged['total_enrolment'] = merged[['age_0_5', 'age_5_17', 'age_18_greater']].sum(axis=1)
+    
+    # Total Biometric Updates
+    merged['total_bio_updates'] = merged[['bio_age_5_17', 'bio_age_17_']].sum(axis=1)
+    
+    # Total Demographic Updates
+    merged['total_demo_updates'] = merged[['demo_age_5_17', 'demo_age_17_']].sum(axis=1)
+    
+    # Total Updates
+    merged['total_updates'] = merged[['total_bio_updates', 'total_demo_updates']].sum(axis=1)
+    
+    return merged
+
+# Partition label for rows without a date/state (placed by _ordered_labels)
+_MISSING_LABEL = ''
+
+def _partition_labels(df, partition_by):
+    """String label of each row's partition: 'YYYY-MM' of 'date', or 'state'."""
+    if partition_by == 'month':
+        labels = df['date'].dt.strftime('%Y-%m')
+    elif partition_by == 'state':
+        labels = df['state'].astype(object)
+    else:
+        raise ValueError(f"Unknown partition_by '{partition_by}'. Use 'month' or 'state'.")
+    return labels.astype(object).where(labels.notna(), _MISSING_LABEL)
+
+def _ordered_labels(labels, frames, partition_by):
+    """
+    Partition labels in the order their rows take in the full outer merge: real
+    labels sorted, the missing label where pd.merge puts null keys of that column
+    (NaT dates first; null states per join.nulls_sort_first).
+    """
+    from .join import nulls_sort_first
+
+    ordered = sorted(label for label in labels if label != _MISSING_LABEL)
+    if _MISSING_LABEL in labels:
+        first = partition_by == 'month' or nulls_sort_first([frame['state'] for frame in frames])
+        ordered = [_MISSING_LABEL] + ordered if first else ordered + [_MISSING_LABEL]
+    return ordered
+
+def iter_master_partitions(datasets, partition_by='month', engine='pandas'):
+    """
+    Splits the three sources by calendar month (or state) and yields
+    (label, merged_partition) one partition at a time.
+
+    Every merge key lives in exactly one partition, so merging per partition gives the
+    same rows as the full merge; peak memory is bounded by the largest partition
+    instead of the whole year. Partitions come out in label order, the rows without
+    a date or state where the full merge puts those null keys. For months the
+    concatenated partitions are the full merge's row order; state partitions group
+    the rows by state instead (the full merge orders by date first).
+    """
+    enrol = datasets.get('enrolment')
+    bio = datasets.get('biometric')
+    demo = datasets.get('demographic')
+
+    if enrol is None or bio is None or demo is None:
+        raise ValueError("One or more datasets are missing.")
+
+    frames = {'enrolment': enrol, 'biometric': bio, 'demographic': demo}
+    # Row positions per partition label, computed once per source
+    positions = {
+        key: frame.groupby(_partition_labels(frame, partition_by), sort=False).indices
+        for key, frame in frames.items()
+    }
+    ordered = _ordered_labels(set().union(*(indices.keys() for indices in positions.values())), frames.values(), partition_by)
+
+    for label in ordered:
+        parts = {
+            key: frame.iloc[positions[key].get(label, [])]
+            for key, frame in frames.items()
+        }
+        yield label, _merge_sources(parts['enrolment'], parts['biometric'], parts['demographic'], engine)
+
+def stream_master_table(datasets, store_path, partition_by='month', engine='pandas'):
+    """
+    Builds the master table partition by partition and writes each one to the Parquet
+    store as soon as it is merged (see iter_master_partitions). Returns the row count.
+    """
+    from .storage import write_master_store
+
+    # Start from an empty store, then append one file per partition
+    write_master_store(None, store_path)
+    total_rows = 0
+    for i, (label, part) in enumerate(iter_master_partitions(datasets, partition_by, engine)):
+        print(f"Merged partition {label}: {len(part)} rows")
+        write_master_store(
+            part, store_path,
+            overwrite=False, replace_partitions=False,
+            basename_template=f"chunk-{i}-{{i}}.parquet"
+        )
+        total_rows += len(part)
+    return total_rows
+
+def create_master_table(datasets, partition_by=None, engine='pandas'):
     """
     Merges Enrolment, Biometric, and Demographic datasets into a single master table.
     grouped by date and district (or pincode if granular enough).
+
+    partition_by='month' or 'state' merges partition by partition (lower peak memory)
+    and concatenates the results. With 'month' the output is identical to the full
+    merge, null keys included; with 'state' it has the same rows, grouped by state.
+
+    engine='sort_merge' runs the three-way join in one pass on integer-encoded keys
+    (see preprocessing.join); same rows and order (null keys where pd.merge puts
+    them), categorical key columns.
     """
+    if partition_by is not None:
+        parts = [part for _, part in iter_master_partitions(datasets, partition_by, engine)]
+        return pd.concat(parts, ignore_index=True)
+
     # Extract dfs
     enrol = datasets.get('enrolment')
     bio = datasets.get('biometric')
@@ -13,13 +133,23 @@ def create_master_table(datasets):
     if enrol is None or bio is None or demo is None:
         raise ValueError("One or more datasets are missing.")
 
+    return _merge_sources(enrol, bio, demo, engine)
+
+def _merge_sources(enrol, bio, demo, engine='pandas'):
+    """Outer-joins the three sources on the merge keys and adds the total_* columns."""
+    if engine == 'sort_merge':
+        from .join import sort_merge_master_table
+        return sort_merge_master_table({'enrolment': enrol, 'biometric': bio, 'demographic': demo})
+    if engine != 'pandas':
+        raise ValueError(f"Unknown engine '{engine}'. Use 'pandas' or 'sort_merge'.")
+
     # Note: We do NOT fillna(0) here to preserve missing data patterns for anomaly detection.
     # enrol = enrol.fillna(0)
     # bio = bio.fillna(0)
     # demo = demo.fillna(0)
 
     # Merge strategy: Outer join on keys
-    keys = ['date', 'state', 'district', 'pincode']
+    keys = MERGE_KEYS
     
     # Merge Enrol + Bio
     merged = pd.merge(enrol, bio, on=keys, how='outer', suffixes=('_enrol', '_bio'))
@@ -31,21 +161,7 @@ def create_master_table(datasets):
     # merged = merged.fillna(0)
     
     # Feature Engineering
-    # We use sum(axis=1, min_count=0) to treat NaNs as 0 during sum, but the logic 
-    # ensures that if all are NaN, it might return 0. 
-    # For anomaly detection, input columns remain NaN, but Total columns will be calculated.
-
-    # Total Enrolments
-    merged['total_enrolment'] = merged[['age_0_5', 'age_5_17', 'age_18_greater']].sum(axis=1)
-    
-    # Total Biometric Updates
-    merged['total_bio_updates'] = merged[['bio_age_5_17', 'bio_age_17_']].sum(axis=1)
-    
-    # Total Demographic Updates
-    merged['total_demo_updates'] = merged[['demo_age_5_17', 'demo_age_17_']].sum(axis=1)
-    
-    # Total Updates
-    merged['total_updates'] = merged[['total_bio_updates', 'total_demo_updates']].sum(axis=1)
+    merged = add_total_columns(merged)
     
     # Lat/Long placeholder (In a real app, join with a Pincode master DB)
     # We will simulate migration signals here if needed
@@ -53,10 +169,15 @@ def create_master_table(datasets):
     return merged
 
 def aggregate_by_district(df):
-    """Aggregates the master dataframe by Date and District."""
+    """
+    Aggregates the master dataframe by Date and District.
+    For a lazy_store.StoreFrame the aggregation stays lazy (a StoreFrame is returned).
+    """
     numeric_cols = [c for c in df.columns if c not in ['date', 'state', 'district', 'pincode']]
     
     # Group by Date, State, District
-    grouped = df.groupby(['date', 'state', 'district'])[numeric_cols].sum().reset_index()
+    if isinstance(df, StoreFrame):
+        return df.aggregate(['date', 'state', 'district'], **{c: (c, 'sum') for c in numeric_cols})
+    grouped = df.groupby(['date', 'state', 'district'], observed=True)[numeric_cols].sum().reset_index()
     
     return grouped
@@ -0,0 +1,213 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import MERGE_KEYS
+
+# Persisted integrity state (data/processed/integrity)
+INTEGRITY_NAME = 'integrity'
+KEY_LEDGER_NAME = 'key_ledger.parquet'
+SOURCE_DUPLICATES_NAME = 'source_duplicates.parquet'
+
+# Columns of the source duplicate report; scope tells the two kinds of duplicate apart
+SOURCE_REPORT_COLUMNS = ['source', 'file', 'first_file', 'scope'] + MERGE_KEYS
+CROSS_FILE = 'cross_file'
+WITHIN_FILE = 'within_file'
+
+
+def key_hashes(df, keys=None):
+    """
+    64-bit hash of each row's composite (date, state, district, pincode) key.
+
+    Categorical, object and string key columns hash alike (categoricals only hash
+    their categories), and dates are hashed at nanosecond resolution, so the same
+    key gets the same hash in every file and in the merged store.
+    """
+    keys = keys or MERGE_KEYS
+    columns = {}
+    for key in keys:
+        values = df[key]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.astype('datetime64[ns]')
+        columns[key] = values
+    frame = pd.DataFrame(columns, index=df.index)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def _occurrence(hashes):
+    """Occurrence number of each row within its hash group (0 = first), in row order."""
+    return pd.Series(hashes).groupby(hashes, sort=False).cumcount().to_numpy()
+
+
+def build_duplicate_index(df, keys=None):
+    """
+    Index of duplicate keys in the merged master table: one row per repeated
+    occurrence (the rows df.duplicated(subset=keys) flags), with all of df's
+    columns, the key hash, the occurrence number (1 = first repeat) and the
+    store partition ('state', 'month') it lives in.
+
+    Duplicate groups never span partitions (state and date are part of the key),
+    so any date/state filter selects whole groups and the repeat count for the
+    filter is simply the number of index rows it selects.
+    """
+    keys = keys or MERGE_KEYS
+    hashes = key_hashes(df, keys)
+    occurrence = _occurrence(hashes)
+    repeats = occurrence > 0
+
+    index = df[repeats].copy()
+    index['key_hash'] = hashes[repeats]
+    index['occurrence'] = occurrence[repeats]
+    index['month'] = pd.to_datetime(index['date']).dt.strftime('%Y-%m')
+    return index.reset_index(drop=True)
+
+
+def query_duplicates(index, start_date=None, end_date=None, state=None, sample_size=50):
+    """
+    Repeat count and the first sample_size repeated rows for a date range / state,
+    answered from a build_duplicate_index frame.
+    """
+    mask = np.ones(len(index), dtype=bool)
+    if start_date is not None:
+        mask &= (index['date'] >= pd.to_datetime(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (index['date'] <= pd.to_datetime(end_date)).to_numpy()
+    if state is not None:
+        mask &= (index['state'] == state).to_numpy()
+    selected = index[mask]
+    return len(selected), selected.drop(columns=['key_hash', 'occurrence', 'month']).head(sample_size)
+
+
+def partition_duplicate_counts(index):
+    """Repeat rows per store partition (state, month)."""
+    return index.groupby(['state', 'month'], observed=True).size().rename('duplicates').reset_index()
+
+
+class SourceKeyLedger:
+    """
+    Key hashes of every raw file ingested so far, per source, used to report which
+    split file introduced a duplicate key (a key already present in an earlier file
+    of the same source, or repeated within one file).
+
+    add_file(source, path, df) is the data_loader on_file hook; the ledger and the
+    report persist in ledger_dir so incremental runs check new files against all
+    previously ingested ones. A file ingested again under the same name (changed
+    content) replaces its earlier keys and report rows instead of matching them.
+    """
+
+    def __init__(self, ledger_dir=None):
+        self.ledger_dir = ledger_dir
+        self._ledger = {}
+        self._reports = []
+        # add_file may be called from several threads (e.g. a caller's own loader threads)
+        self._lock = threading.Lock()
+        if ledger_dir:
+            ledger_path = os.path.join(ledger_dir, KEY_LEDGER_NAME)
+            report_path = os.path.join(ledger_dir, SOURCE_DUPLICATES_NAME)
+            if os.path.exists(ledger_path):
+                stored = pd.read_parquet(ledger_path)
+                for source, part in stored.groupby('source', sort=False):
+                    self._ledger[source] = pd.Series(part['file'].to_numpy(), index=part['key_hash'].to_numpy(dtype=np.uint64))
+            if os.path.exists(report_path):
+                report = pd.read_parquet(report_path)
+                if 'scope' not in report.columns:
+                    # Reports written before the scope column: a file is its own first file only for in-file repeats
+                    report['scope'] = np.where(report['file'] == report['first_file'], WITHIN_FILE, CROSS_FILE)
+                self._reports.append(report)
+
+    def add_file(self, source, path, df):
+        """Checks one loaded file against the ledger, records its duplicates and its new keys."""
+        if df is None or df.empty:
+            return
+        file_name = os.path.basename(path)
+        hashes = key_hashes(df)
+        with self._lock:
+            self._check_file(source, file_name, hashes, df)
+
+    def _forget_file(self, source, file_name):
+        # Drops what an earlier ingest of this file recorded, so it is not its own duplicate
+        seen = self._ledger.get(source)
+        if seen is not None:
+            self._ledger[source] = seen[seen.to_numpy() != file_name]
+        reports = [
+            report[~((report['source'] == source) & (report['file'] == file_name)).to_numpy()]
+            for report in self._reports
+        ]
+        self._reports = [self._release_keys(source, file_name, pd.concat(reports, ignore_index=True))] if reports else []
+
+    def _release_keys(self, source, file_name, report):
+        # Keys later files repeated after file_name delivered them now belong to the first
+        # of those files, as if file_name had never been ingested before
+        orphaned = ((report['source'] == source) & (report['first_file'] == file_name)).to_numpy()
+        if not orphaned.any():
+            return report
+        rows = report[orphaned]
+        hashes = key_hashes(rows)
+        owner = _occurrence(hashes) == 0
+        owners = pd.Series(rows['file'].to_numpy()[owner], index=pd.Index(hashes[owner], dtype=np.uint64), dtype=object)
+        seen = self._ledger.get(source)
+        self._ledger[source] = owners if seen is None else pd.concat([seen, owners])
+
+        # The owner's row leaves the report, the other repeats now point at the owner
+        first_file = owners.to_numpy()[owners.index.get_indexer(hashes)]
+        report = report.assign(first_file=report['first_file'].to_numpy(dtype=object), scope=report['scope'].to_numpy(dtype=object))
+        report.loc[orphaned, 'first_file'] = first_file
+        report.loc[orphaned, 'scope'] = np.where(rows['file'].to_numpy() == first_file, WITHIN_FILE, CROSS_FILE)
+        keep = np.ones(len(report), dtype=bool)
+        keep[np.flatnonzero(orphaned)[owner]] = False
+        return report[keep]
+
+    def _check_file(self, source, file_name, hashes, df):
+        self._forget_file(source, file_name)
+        seen = self._ledger.get(source)
+
+        # Keys already ingested from an earlier file, then repeats within this file
+        earlier = seen.index.get_indexer(hashes) if seen is not None else np.full(len(hashes), -1)
+        flagged = (earlier >= 0) | (_occurrence(hashes) > 0)
+        if flagged.any():
+            first_file = np.full(len(hashes), file_name, dtype=object)
+            known = earlier >= 0
+            if known.any():
+                first_file[known] = seen.to_numpy()[earlier[known]]
+            scope = np.where(known, CROSS_FILE, WITHIN_FILE)
+            report = pd.DataFrame({'source': source, 'file': file_name, 'first_file': first_file[flagged],
+                                   'scope': scope[flagged]})
+            for key in MERGE_KEYS:
+                report[key] = df[key].to_numpy()[flagged]
+            self._reports.append(report)
+
+        # First occurrences of unseen keys join the ledger (its index stays unique)
+        added = pd.Series(file_name, index=pd.Index(hashes[~flagged], dtype=np.uint64), dtype=object)
+        self._ledger[source] = added if seen is None else pd.concat([seen, added])
+
+    def report(self):
+        """Duplicate keys: source, file, first_file, scope (cross_file / within_file) and the key columns."""
+        if not self._reports:
+            return pd.DataFrame(columns=SOURCE_REPORT_COLUMNS)
+        return pd.concat(self._reports, ignore_index=True)[SOURCE_REPORT_COLUMNS]
+
+    def counts(self):
+        """Number of reported keys per scope: {'cross_file': n, 'within_file': n}."""
+        scopes = self.report()['scope']
+        return {scope: int((scopes == scope).sum()) for scope in (CROSS_FILE, WITHIN_FILE)}
+
+    def save(self, ledger_dir=None):
+        """Writes the ledger and the report (Parquet, temp file + rename)."""
+        ledger_dir = ledger_dir or self.ledger_dir
+        os.makedirs(ledger_dir, exist_ok=True)
+        parts = [
+            pd.DataFrame({'source': source, 'key_hash': keys.index.to_numpy(dtype=np.uint64), 'file': keys.to_numpy(dtype=object)})
+            for source, keys in self._ledger.items()
+        ]
+        ledger = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['source', 'key_hash', 'file'])
+        report = self.report()
+        report['date'] = pd.to_datetime(report['date'])
+        for key in MERGE_KEYS[1:]:
+            report[key] = report[key].astype(object)
+        for frame, name in ((ledger, KEY_LEDGER_NAME), (report, SOURCE_DUPLICATES_NAME)):
+            path = os.path.join(ledger_dir, name)
+            tmp_path = path + '.tmp'
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
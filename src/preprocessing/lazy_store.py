@@ -0,0 +1,205 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    # duckdb is optional: only the out-of-core backend needs it
+    duckdb = None
+
+from .storage import CATEGORICAL_COLUMNS
+
+# Row-level measures the analytics derive, as SQL over the store's columns
+DERIVED_SQL = {
+    'migration_flux': 'total_demo_updates / (total_enrolment + 1)',
+    'organic_growth_rate': 'age_0_5 / (total_enrolment + 1)',
+}
+
+# Aggregations group_aggregate understands (pandas name -> SQL)
+AGGREGATES = {
+    'sum': 'COALESCE(SUM({expr}), 0)',
+    'mean': 'AVG({expr})',
+    'min': 'MIN({expr})',
+    'max': 'MAX({expr})',
+    'count': 'COUNT({expr})',
+    'size': 'COUNT(*)',
+}
+
+
+def _require_duckdb():
+    if duckdb is None:
+        raise ImportError("duckdb is required for the out-of-core backend. Install it with 'pip install duckdb'.")
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value):
+    """Renders a Python value as a SQL literal (quotes escaped)."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(_literal(v) for v in value) + ']'
+    if isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, 'isoformat'):
+        return f"TIMESTAMP '{pd.Timestamp(value).isoformat(sep=' ')}'"
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def store_scan_sql(store_path):
+    """SELECT over every Parquet file of the store (keys first, as in read_master_store)."""
+    pattern = os.path.join(store_path, '**', '*.parquet')
+    # Partition column 'month' is a layout detail, not data
+    return (f"SELECT date, state, * EXCLUDE (date, state, month) FROM read_parquet({_literal(pattern)}, "
+            f"hive_partitioning = true, union_by_name = true)")
+
+
+def filter_sql(start_date=None, end_date=None, states=None, districts=None):
+    """
+    WHERE clause and named parameters for the store filters (same semantics as
+    storage.read_master_store). Only the filters given appear in the clause, so one
+    filter shape is one SQL text whatever the values.
+    """
+    conditions, params = [], {}
+    if start_date is not None:
+        conditions.append("date >= $start_date")
+        params['start_date'] = pd.Timestamp(start_date).to_pydatetime()
+    if end_date is not None:
+        conditions.append("date <= $end_date")
+        params['end_date'] = pd.Timestamp(end_date).to_pydatetime()
+    if states is not None:
+        conditions.append("list_contains($states, state)")
+        params['states'] = [str(s) for s in ([states] if isinstance(states, str) else states)]
+    if districts is not None:
+        conditions.append("list_contains($districts, district)")
+        params['districts'] = [str(d) for d in ([districts] if isinstance(districts, str) else districts)]
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    return where, params
+
+
+class StoreFrame:
+    """
+    Lazy, out-of-core view of the processed Parquet store (or of a query over it),
+    executed by DuckDB: scans are multithreaded, filters and projections are pushed
+    into the Parquet reader and large group-bys / sorts spill to temp_directory
+    instead of exhausting RAM.
+
+    The analytics functions that support it (get_state_enrolment_stats,
+    rank_districts_by_updates, analyze_demo_vs_enrolment, identify_migration_corridors,
+    classify_growth_patterns, calculate_ausi) accept a StoreFrame wherever they take a
+    DataFrame and return the same result the pandas path would give on the
+    materialized store. Filters are bound as named parameters; a sql_layer.SqlLayer
+    runs its frames through its query().
+    """
+
+    def __init__(self, store_path, start_date=None, end_date=None, states=None, districts=None,
+                 threads=None, memory_limit=None, temp_directory=None, _connection=None, _sql=None,
+                 _params=None, _runner=None):
+        _require_duckdb()
+        self.store_path = store_path
+        if _connection is None:
+            config = {}
+            if threads:
+                config['threads'] = threads
+            if memory_limit:
+                config['memory_limit'] = memory_limit
+            if temp_directory:
+                config['temp_directory'] = temp_directory
+            _connection = duckdb.connect(config=config)
+        self._connection = _connection
+        if _sql is None:
+            where, _params = filter_sql(start_date, end_date, states, districts)
+            _sql = store_scan_sql(store_path) + where
+        self._sql = _sql
+        self._params = _params or {}
+        self._runner = _runner
+
+    def _run(self, sql):
+        # One entry point for every statement, so a SqlLayer can run it on its shared connection
+        if self._runner is not None:
+            return self._runner(sql, self._params)
+        return self._connection.execute(sql, self._params or None).df()
+
+    def query(self, template):
+        """New StoreFrame over `template`, where {source} stands for this frame's rows."""
+        return StoreFrame(self.store_path, _connection=self._connection, _sql=template.format(source=f"({self._sql})"),
+                          _params=self._params, _runner=self._runner)
+
+    def _schema(self):
+        return self._run(f"SELECT * FROM ({self._sql}) LIMIT 0").dtypes
+
+    @property
+    def columns(self):
+        return self._schema().index
+
+    @property
+    def empty(self):
+        return self._run(f"SELECT 1 FROM ({self._sql}) LIMIT 1").empty
+
+    def __len__(self):
+        return int(self._run(f"SELECT COUNT(*) AS n FROM ({self._sql})")['n'].iloc[0])
+
+    def to_pandas(self):
+        """Materializes the rows (only for results that fit in memory), typed like read_master_store."""
+        return _restore_types(self._run(self._sql))
+
+    def write_parquet(self, path):
+        """Streams the rows to one Parquet file without materializing them in Python."""
+        tmp_path = path + '.tmp'
+        self._run(f"COPY ({self._sql}) TO {_literal(tmp_path)} (FORMAT PARQUET)")
+        os.replace(tmp_path, path)
+        return path
+
+    def aggregate(self, keys, **named):
+        """
+        Lazy GROUP BY keys with pandas-style named aggregations, name=(column, func):
+        the SQL counterpart of df.groupby(keys, observed=True).agg(**named).reset_index().
+        column may also be a DERIVED_SQL measure. Rows are ordered by the keys.
+        """
+        dtypes = self._schema()
+        selects = [_quote(k) for k in keys]
+        for name, (column, func) in named.items():
+            expr = f"({DERIVED_SQL[column]})" if column in DERIVED_SQL and column not in dtypes else _quote(column)
+            sql = AGGREGATES[func].format(expr=expr)
+            # Integer sums stay integers (as in pandas); everything else is float
+            if func in ('count', 'size') or (func == 'sum' and column in dtypes and pd.api.types.is_integer_dtype(dtypes[column])):
+                sql = f"CAST({sql} AS BIGINT)"
+            elif func in ('sum', 'mean'):
+                sql = f"CAST({sql} AS DOUBLE)"
+            selects.append(f"{sql} AS {_quote(name)}")
+        key_list = ', '.join(_quote(k) for k in keys)
+        # Rows with a missing key are dropped, like pandas' groupby(dropna=True)
+        not_null = ' AND '.join(f"{_quote(k)} IS NOT NULL" for k in keys)
+        return self.query(f"SELECT {', '.join(selects)} FROM {{source}} WHERE {not_null} "
+                          f"GROUP BY {key_list} ORDER BY {key_list}")
+
+    def group_aggregate(self, keys, **named):
+        """aggregate(), materialized as a DataFrame (keys as categoricals)."""
+        return self.aggregate(keys, **named).to_pandas()
+
+
+def _restore_types(df):
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def group_aggregate(df, keys, **named):
+    """
+    df.groupby(keys, observed=True).agg(**named).reset_index() for a DataFrame,
+    or the same aggregation executed by DuckDB for a StoreFrame.
+    """
+    if isinstance(df, StoreFrame):
+        return df.group_aggregate(keys, **named)
+    return df.groupby(keys, observed=True).agg(**named).reset_index()
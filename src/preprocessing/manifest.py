@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+# Stored next to the processed store in data/processed
+MANIFEST_NAME = 'ingest_manifest.json'
+
+_HASH_CHUNK = 1 << 20
+
+
+def file_content_hash(path):
+    """SHA-256 of a file's bytes, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path, with_hash=True):
+    """Returns the manifest entry (size, mtime, content hash) for a raw file."""
+    stat = os.stat(path)
+    entry = {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+    }
+    if with_hash:
+        entry['sha256'] = file_content_hash(path)
+    return entry
+
+
+def load_manifest(manifest_path):
+    """
+    Loads the ingest manifest: {'files': {abs_path: {size, mtime, sha256, ingested_at}}}.
+    Returns an empty manifest if the file does not exist.
+    """
+    if not os.path.exists(manifest_path):
+        return {'files': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as fh:
+        manifest = json.load(fh)
+    manifest.setdefault('files', {})
+    return manifest
+
+
+def save_manifest(manifest, manifest_path):
+    """Writes the manifest atomically (temp file + rename)."""
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def find_new_files(manifest, paths):
+    """
+    Returns the subset of paths that were not ingested yet, or whose content changed.
+    Size and mtime are checked first; the content hash is only computed when they differ,
+    so a file that was merely touched is not re-ingested (its stored mtime is refreshed).
+    """
+    known = manifest.get('files', {})
+    new_files = []
+    for path in paths:
+        key = os.path.abspath(path)
+        entry = known.get(key)
+        if entry is None:
+            new_files.append(path)
+            continue
+
+        current = file_fingerprint(path, with_hash=False)
+        if current['size'] == entry.get('size') and current['mtime'] == entry.get('mtime'):
+            continue
+        if file_content_hash(path) != entry.get('sha256'):
+            new_files.append(path)
+        else:
+            entry.update(current)
+    return new_files
+
+
+def record_files(manifest, paths):
+    """Adds (or refreshes) manifest entries for files that were just ingested."""
+    files = manifest.setdefault('files', {})
+    ingested_at = datetime.now().isoformat(timespec='seconds')
+    for path in paths:
+        entry = file_fingerprint(path)
+        entry['ingested_at'] = ingested_at
+        files[os.path.abspath(path)] = entry
+    return manifest
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+# Declared column types for the raw UIDAI extracts.
+# Keys are read as categoricals: a national file repeats ~36 states, ~750 districts and
+# ~19k pincodes across millions of rows, so dictionary codes are far smaller than objects.
+# 'date' is read as a categorical too and parsed once per unique value (see parse_dates_cached).
+KEY_DTYPES = {
+    'date': 'category',
+    'state': 'category',
+    'district': 'category',
+    # Pincodes are identifiers, never arithmetic: always text, whatever the file looks like
+    'pincode': 'category',
+}
+
+# Count columns per source. Read as float64 so neither a blank cell nor a fractional value
+# aborts the parse; enforce_schema() then narrows them to int32 when every value is whole
+# (float64 otherwise, which is what the outer merge produces for missing values anyway).
+SOURCE_COUNT_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+}
+
+COUNT_READ_DTYPE = 'float64'
+COUNT_DTYPE = 'int32'
+
+DATE_FORMAT = '%d-%m-%Y'
+
+
+def empty_frame(source):
+    """Returns an empty frame with the source's columns and dtypes (stand-in for a source with no new files)."""
+    columns = {'date': pd.Series(dtype='datetime64[ns]')}
+    for col in ('state', 'district', 'pincode'):
+        columns[col] = pd.Series(dtype='category')
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        columns[col] = pd.Series(dtype=COUNT_DTYPE)
+    return pd.DataFrame(columns)
+
+
+def read_dtypes(source=None):
+    """
+    Returns the dtype mapping passed to pd.read_csv for a source
+    ('enrolment', 'biometric', 'demographic'). None only types the key columns.
+    """
+    if source is not None and source not in SOURCE_COUNT_COLUMNS:
+        raise ValueError(f"Unknown source '{source}'. Expected one of {list(SOURCE_COUNT_COLUMNS)}.")
+
+    dtypes = dict(KEY_DTYPES)
+    for col in SOURCE_COUNT_COLUMNS.get(source, []):
+        dtypes[col] = COUNT_READ_DTYPE
+    return dtypes
+
+
+def parse_dates_cached(series, date_format=DATE_FORMAT):
+    """
+    Parses a column of date strings by converting each distinct value only once.
+    A daily extract has a handful of distinct dates across millions of rows, so this
+    replaces a per-row strptime with a per-unique one plus an integer take.
+    Unparseable values become NaT (same as errors='coerce').
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+
+    parsed = pd.to_datetime(pd.Index(uniques).astype(str), format=date_format, errors='coerce')
+    # Code -1 marks a missing value; append NaT so take() maps it there
+    lookup = parsed.append(pd.DatetimeIndex([pd.NaT], dtype=parsed.dtype))
+    return pd.Series(lookup.take(codes).to_numpy(), index=series.index, name=series.name)
+
+
+def non_whole_counts(df, source):
+    """Rows of df whose count columns hold a fractional value: {column: row labels}."""
+    found = {}
+    for col in SOURCE_COUNT_COLUMNS.get(source, []):
+        if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+            values = df[col].to_numpy()
+            bad = ~np.isnan(values) & (values != np.round(values))
+            if bad.any():
+                found[col] = df.index[bad]
+    return found
+
+
+def enforce_schema(df, source=None):
+    """
+    Casts a loaded frame to the declared schema.
+    Also re-applies categoricals after pd.concat, which falls back to object when
+    per-file categories differ.
+    """
+    if df is None:
+        return df
+
+    for col, dtype in KEY_DTYPES.items():
+        if col == 'date' or col not in df.columns:
+            continue
+        values = df[col]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = values.where(values.isna(), values.astype(str)).astype(dtype)
+        elif not pd.api.types.is_string_dtype(values.cat.categories):
+            # The pyarrow engine infers numeric categories for pincodes
+            df[col] = values.cat.rename_categories(values.cat.categories.astype(str))
+
+    for col in SOURCE_COUNT_COLUMNS.get(source, []):
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if values.dtype == COUNT_DTYPE:
+            continue
+        as_float = values.astype('float64')
+        # Missing or fractional counts stay float64, whole ones become int32
+        if as_float.isna().any() or (as_float != as_float.round()).any():
+            df[col] = as_float
+        else:
+            df[col] = values.astype(COUNT_DTYPE)
+    return df
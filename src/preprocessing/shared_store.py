@@ -0,0 +1,135 @@
+import glob
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    # pyarrow is optional at import time; without it the dashboard loads per process
+    pa = None
+    ipc = None
+
+# Published frames for the dashboard (data/processed/dashboard_snapshot)
+SNAPSHOT_NAME = 'dashboard_snapshot'
+SNAPSHOT_MANIFEST = 'snapshot.json'
+
+# Versions are publish timestamps (local time)
+SNAPSHOT_VERSION_FORMAT = '%Y%m%dT%H%M%S%f'
+
+# Columns of the master table the dashboard actually uses (projected on read)
+SNAPSHOT_COLUMNS = [
+    'date', 'state', 'district', 'pincode',
+    'age_0_5', 'total_enrolment', 'total_bio_updates', 'total_demo_updates', 'total_updates'
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the shared dashboard snapshot. Install it with 'pip install pyarrow'.")
+
+
+def _as_table(frame):
+    """Arrow table of a frame, with 32-bit dictionary indices so chunks can be unified."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    fields = [
+        field.with_type(pa.dictionary(pa.int32(), field.type.value_type)) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _to_table(frame):
+    """
+    One single-chunk Arrow table from a DataFrame or an iterable of DataFrames with
+    the same columns (e.g. the master store read one year at a time). Chunks are
+    converted as they come, so no concatenated pandas frame is ever built; the
+    result is one record batch, which readers map without copying.
+    """
+    if isinstance(frame, pd.DataFrame):
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    tables = [_as_table(chunk) for chunk in frame]
+    return pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+
+
+def publish_frames(frames, snapshot_dir):
+    """
+    Publishes {name: DataFrame} as uncompressed Arrow IPC files that readers memory-map.
+    A value may also be an iterable of DataFrame chunks, published as their concatenation.
+
+    Each publish writes new versioned files (temp file + rename) and then swaps the
+    manifest, so readers see either the old or the new set of frames, never a mix.
+    Files of older versions are removed; processes that still map them keep their
+    pages until they reopen the snapshot.
+    Returns the new version string.
+    """
+    _require_pyarrow()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    version = pd.Timestamp.now().strftime(SNAPSHOT_VERSION_FORMAT)
+
+    files = {}
+    for name, frame in frames.items():
+        table = _to_table(frame)
+        file_name = f"{name}-{version}.arrow"
+        tmp_path = os.path.join(snapshot_dir, file_name + '.tmp')
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, os.path.join(snapshot_dir, file_name))
+        files[name] = file_name
+
+    manifest_path = os.path.join(snapshot_dir, SNAPSHOT_MANIFEST)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump({'version': version, 'files': files}, fh)
+    os.replace(tmp_path, manifest_path)
+
+    # Drop superseded versions (best effort: a mapped file may not be removable on Windows)
+    current = set(files.values())
+    for path in glob.glob(os.path.join(snapshot_dir, '*.arrow')):
+        if os.path.basename(path) not in current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return version
+
+
+def _read_manifest(snapshot_dir):
+    path = os.path.join(snapshot_dir, SNAPSHOT_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def snapshot_version(snapshot_dir):
+    """Version of the published snapshot, or None if nothing has been published."""
+    manifest = _read_manifest(snapshot_dir)
+    return manifest['version'] if manifest else None
+
+
+def open_frame(path):
+    """
+    Memory-maps one published Arrow file as a DataFrame. Numeric, date and
+    categorical-code columns are zero-copy, read-only views of the mapped file (the
+    OS page cache is shared by every process mapping it); only booleans and
+    category labels are materialized.
+    """
+    _require_pyarrow()
+    table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def open_snapshot(snapshot_dir):
+    """All published frames as {name: DataFrame} views, or None if there is no snapshot."""
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None or pa is None:
+        return None
+    try:
+        return {name: open_frame(os.path.join(snapshot_dir, file_name)) for name, file_name in manifest['files'].items()}
+    except FileNotFoundError:
+        # Superseded between reading the manifest and mapping the files: use the new one
+        return open_snapshot(snapshot_dir) if snapshot_version(snapshot_dir) != manifest['version'] else None
@@ -0,0 +1,108 @@
+import os
+import threading
+
+from src.metrics.stress_index import calculate_ausi
+
+from .feature_engineering import aggregate_by_district
+from .integrity import INTEGRITY_NAME, SOURCE_DUPLICATES_NAME
+from .lazy_store import StoreFrame, _literal, _require_duckdb, duckdb, filter_sql, store_scan_sql
+from .storage import MASTER_STORE_NAME, store_exists
+
+# Views registered over data/processed (see SqlLayer)
+MASTER_VIEW = 'master'
+DISTRICT_DAILY_VIEW = 'district_daily'
+DISTRICT_AUSI_VIEW = 'district_ausi'
+SOURCE_DUPLICATES_VIEW = 'source_duplicates'
+
+
+class SqlLayer:
+    """
+    In-process SQL over the processed data (DuckDB, no server), for ad-hoc questions
+    and for callers that want filters and aggregations pushed down to the store.
+
+    Views:
+      master          the Parquet master store (all raw and total_* columns)
+      district_daily  master summed by date, state and district (aggregate_by_district)
+      district_ausi   district_daily with the AUSI columns (calculate_ausi)
+      source_duplicates  the ingest duplicate report, when the pipeline has written one
+
+    query(sql, params) binds named ($name) or positional ($1) parameters through
+    DuckDB's own parameter binding, so values (NULL, NaN and NaT included) never
+    become SQL text. There is no prepared-statement cache: the Python client has no
+    handle for a prepared statement, so execute(sql, params) parses, binds and plans
+    on every call, and EXECUTE of a PREPAREd statement rejects bound parameters
+    (reusing one would mean rendering the values as SQL text again). Planning these
+    views costs little next to the Parquet scans they run. The layer is shared across
+    threads (one statement at a time). Call refresh() after the pipeline rewrites
+    the store so the views see the new files.
+    """
+
+    def __init__(self, processed_dir, threads=None, memory_limit=None, temp_directory=None):
+        _require_duckdb()
+        self.processed_dir = processed_dir
+        self.store_path = os.path.join(processed_dir, MASTER_STORE_NAME)
+        if not store_exists(self.store_path):
+            raise FileNotFoundError(f"Master store not found: {self.store_path}. Run run_pipeline.py first.")
+        config = {}
+        if threads:
+            config['threads'] = threads
+        if memory_limit:
+            config['memory_limit'] = memory_limit
+        if temp_directory:
+            config['temp_directory'] = temp_directory
+        self._connection = duckdb.connect(config=config)
+        self._lock = threading.RLock()
+        self.views = []
+        self.refresh()
+
+    def refresh(self):
+        """(Re)registers the views."""
+        with self._lock:
+            self.views = []
+
+            # 1. Master table straight from the Parquet files
+            self._create_view(MASTER_VIEW, store_scan_sql(self.store_path))
+
+            # 2. District aggregates, from the same SQL the analytics run on a StoreFrame
+            self._create_view(DISTRICT_DAILY_VIEW, aggregate_by_district(self.frame(MASTER_VIEW))._sql)
+            self._create_view(DISTRICT_AUSI_VIEW, calculate_ausi(self.frame(DISTRICT_DAILY_VIEW))._sql)
+
+            # 3. Ingest duplicate report (written by integrity.SourceKeyLedger)
+            report_path = os.path.join(self.processed_dir, INTEGRITY_NAME, SOURCE_DUPLICATES_NAME)
+            if os.path.exists(report_path):
+                self._create_view(SOURCE_DUPLICATES_VIEW, f"SELECT * FROM read_parquet({_literal(report_path)})")
+            else:
+                self._connection.execute(f"DROP VIEW IF EXISTS {SOURCE_DUPLICATES_VIEW}")
+
+    def _create_view(self, name, sql):
+        self._connection.execute(f"CREATE OR REPLACE VIEW {name} AS {sql}")
+        self.views.append(name)
+
+    def query(self, sql, params=None):
+        """
+        Runs sql with params (dict for $name placeholders, list/tuple for $1, $2...)
+        bound by DuckDB and returns a DataFrame. Each call is prepared afresh (see
+        the class docstring).
+        """
+        with self._lock:
+            return self._connection.execute(sql, params or None).df()
+
+    def frame(self, view=MASTER_VIEW, start_date=None, end_date=None, states=None, districts=None):
+        """
+        Lazy StoreFrame over a view with the store filters as bound parameters, for the
+        analytics functions that accept one (its statements run through query()).
+        """
+        where, params = filter_sql(start_date, end_date, states, districts)
+        return StoreFrame(self.store_path, _connection=self._connection, _sql=f"SELECT * FROM {view}{where}",
+                          _params=params, _runner=self.query)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def open_sql_layer(processed_dir, **kwargs):
+    """SqlLayer over processed_dir, or None if duckdb or the master store is missing."""
+    if duckdb is None or not store_exists(os.path.join(processed_dir, MASTER_STORE_NAME)):
+        return None
+    return SqlLayer(processed_dir, **kwargs)
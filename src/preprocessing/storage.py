@@ -0,0 +1,339 @@
+import os
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    # pyarrow is optional at import time so the CSV fallback keeps working
+    pa = None
+    ds = None
+
+# Default location of the processed store (relative to data/processed)
+MASTER_STORE_NAME = 'master_store'
+
+# Low-cardinality identifier columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = ['state', 'district', 'pincode']
+
+# Hive-style directory layout: state=<name>/month=<YYYY-MM>/part-*.parquet
+PARTITION_COLUMNS = ['state', 'month']
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the Parquet master store. Install it with 'pip install pyarrow'.")
+
+
+def _to_categorical(series):
+    """
+    Converts an identifier column to a categorical of strings.
+    Pincodes arrive as int or str depending on the file, so they are normalized to text first.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    as_text = series.where(series.isna(), series.astype(str))
+    return as_text.astype('category')
+
+
+def prepare_for_store(df):
+    """
+    Casts the master table to the store's typed layout:
+    - 'date' as datetime64
+    - state / district / pincode as categoricals
+    """
+    df = df.copy()
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = _to_categorical(df[col])
+    return df
+
+
+def concat_frames(frames):
+    """
+    pd.concat(frames, ignore_index=True) over frames with the same columns, keeping
+    categorical columns categorical (their categories are unioned rather than the
+    column falling back to object, as pd.concat does when the categories differ).
+    """
+    frames = list(frames)
+    columns = {}
+    for col in frames[0].columns:
+        parts = [frame[col] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            parts = [part.astype('category') for part in parts]
+            # Empty parts add nothing but may carry another category dtype (e.g. object)
+            parts = [part for part in parts if len(part)] or parts[:1]
+            if len({part.cat.categories.dtype for part in parts}) > 1:
+                parts = [part.cat.rename_categories(part.cat.categories.astype(str)) for part in parts]
+            columns[col] = pd.api.types.union_categoricals(parts, ignore_order=True)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([('state', pa.string()), ('month', pa.string())]),
+        flavor='hive'
+    )
+
+
+def write_master_store(df, store_path, compression='zstd', overwrite=True, basename_template=None,
+                       replace_partitions=True):
+    """
+    Writes the master table as a compressed Parquet dataset partitioned by state and month.
+
+    overwrite=True replaces the whole store. overwrite=False only replaces the
+    (state, month) partitions present in df and leaves the others untouched;
+    with replace_partitions=False as well, files are added next to the existing
+    ones (pass a unique basename_template).
+    """
+    _require_pyarrow()
+
+    if overwrite and os.path.exists(store_path):
+        shutil.rmtree(store_path)
+    os.makedirs(store_path, exist_ok=True)
+
+    if df is None or df.empty:
+        return store_path
+
+    df = prepare_for_store(df)
+    df['month'] = df['date'].dt.strftime('%Y-%m')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Partition keys must be plain strings; district/pincode stay dictionary-encoded in the files
+    table = table.set_column(
+        table.schema.get_field_index('state'), 'state', table.column('state').cast(pa.string())
+    )
+
+    write_kwargs = {}
+    if basename_template:
+        write_kwargs['basename_template'] = basename_template
+
+    ds.write_dataset(
+        table,
+        store_path,
+        format='parquet',
+        partitioning=_partitioning(),
+        existing_data_behavior='delete_matching' if replace_partitions else 'overwrite_or_ignore',
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+        **write_kwargs
+    )
+    return store_path
+
+
+def store_exists(store_path):
+    """Returns True if store_path holds at least one Parquet file."""
+    if not os.path.isdir(store_path):
+        return False
+    for _, _, files in os.walk(store_path):
+        if any(f.endswith('.parquet') for f in files):
+            return True
+    return False
+
+
+def _open_dataset(store_path):
+    _require_pyarrow()
+    return ds.dataset(
+        store_path,
+        format='parquet',
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True)
+    )
+
+
+def _build_filter(start_date=None, end_date=None, states=None, districts=None):
+    """
+    Builds a pyarrow filter expression.
+    'month' and 'state' prune whole partitions; 'date' and 'district' are pushed down to row groups.
+    """
+    expr = None
+
+    def _and(current, new):
+        return new if current is None else current & new
+
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        expr = _and(expr, ds.field('month') >= start.strftime('%Y-%m'))
+        expr = _and(expr, ds.field('date') >= pa.scalar(start.to_pydatetime(), type=pa.timestamp('us')))
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        expr = _and(expr, ds.field('month') <= end.strftime('%Y-%m'))
+        expr = _and(expr, ds.field('date') <= pa.scalar(end.to_pydatetime(), type=pa.timestamp('us')))
+    if states is not None:
+        if isinstance(states, str):
+            states = [states]
+        expr = _and(expr, ds.field('state').isin(list(states)))
+    if districts is not None:
+        if isinstance(districts, str):
+            districts = [districts]
+        expr = _and(expr, ds.field('district').isin(list(districts)))
+    return expr
+
+
+def read_master_store(store_path, columns=None, start_date=None, end_date=None, states=None, districts=None):
+    """
+    Reads the master table back from the Parquet store.
+
+    Only the requested columns are decoded (column projection) and the date/state/district
+    filters are applied inside the scan (predicate pushdown), so callers never materialize
+    rows or columns they discard afterwards.
+    """
+    return _read_store(store_path, columns, _build_filter(start_date, end_date, states, districts))
+
+
+def _read_store(store_path, columns, expr):
+    """read_master_store with a ready-made pyarrow filter expression."""
+    dataset = _open_dataset(store_path)
+
+    if columns is not None:
+        # Keep the caller's order but drop names that are not in the store
+        available = set(dataset.schema.names)
+        columns = [c for c in columns if c in available]
+    else:
+        columns = [c for c in dataset.schema.names if c != 'month']
+        # Partition columns are appended at the end of the schema; restore the key order
+        if 'state' in columns:
+            columns.remove('state')
+            columns.insert(1 if 'date' in columns else 0, 'state')
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    df = table.to_pandas()[columns]
+
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = _to_categorical(df[col])
+    return df
+
+
+def store_years(store_path):
+    """
+    Calendar years that have at least one month partition in the store (sorted),
+    and whether there is a partition of rows without a date.
+    """
+    years, undated = set(), False
+    for _, dirs, _ in os.walk(store_path):
+        for name in dirs:
+            if name.startswith('month='):
+                month = name[len('month='):]
+                if month[:4].isdigit():
+                    years.add(int(month[:4]))
+                else:
+                    undated = True
+    return sorted(years), undated
+
+
+def iter_master_store(store_path, columns=None, states=None, districts=None):
+    """
+    Yields the store one calendar year at a time (then the rows without a date, if
+    any), so callers that reduce each chunk before asking for the next hold one year
+    of rows instead of the whole table. Each chunk is pruned to its year's month
+    partitions; columns/states/districts are as in read_master_store.
+    """
+    _require_pyarrow()
+    years, undated = store_years(store_path)
+    chunks = [(ds.field('month') >= f"{year}-01") & (ds.field('month') <= f"{year}-12") for year in years]
+    if undated:
+        chunks.append(ds.field('month').is_null())
+    rest = _build_filter(states=states, districts=districts)
+    for expr in chunks:
+        yield _read_store(store_path, columns, expr if rest is None else expr & rest)
+
+
+def load_master_table(processed_dir, columns=None, **filters):
+    """
+    Loads the processed master table from data/processed.
+    Prefers the Parquet store and falls back to the legacy merged_master_table.csv.
+    Returns None if neither exists.
+    """
+    store_path = os.path.join(processed_dir, MASTER_STORE_NAME)
+    if pa is not None and store_exists(store_path):
+        return read_master_store(store_path, columns=columns, **filters)
+
+    csv_path = os.path.join(processed_dir, 'merged_master_table.csv')
+    if os.path.exists(csv_path):
+        usecols = None if columns is None else (lambda c: c in columns)
+        df = pd.read_csv(csv_path, usecols=usecols)
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'])
+        return _filter_frame(df, **filters)
+    return None
+
+
+def _filter_frame(df, start_date=None, end_date=None, states=None, districts=None):
+    """In-memory equivalent of _build_filter for the CSV fallback."""
+    mask = pd.Series(True, index=df.index)
+    if start_date is not None:
+        mask &= df['date'] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= df['date'] <= pd.Timestamp(end_date)
+    if states is not None:
+        mask &= df['state'].isin([states] if isinstance(states, str) else list(states))
+    if districts is not None:
+        mask &= df['district'].isin([districts] if isinstance(districts, str) else list(districts))
+    return df[mask] if not mask.all() else df
+
+
+def upsert_master_store(delta, store_path, keys=None):
+    """
+    Upserts newly merged rows into the store, rewriting only the (state, month)
+    partitions they touch.
+
+    Rows of the store whose (date, state, district, pincode) key appears in delta are
+    replaced by the delta rows. Source columns the delta does not carry for a key (e.g.
+    the biometric file for that day has not arrived yet) keep their stored value, and
+    the total_* columns are recomputed. Returns the number of rows written.
+    """
+    from .feature_engineering import MERGE_KEYS, TOTAL_COLUMNS, add_total_columns
+
+    keys = keys or MERGE_KEYS
+    if delta is None or delta.empty:
+        return 0
+    if not store_exists(store_path):
+        write_master_store(delta, store_path)
+        return len(delta)
+
+    delta = prepare_for_store(delta)
+    delta_months = delta['date'].dt.strftime('%Y-%m')
+    affected = set(zip(delta['state'].astype(str), delta_months))
+
+    existing = read_master_store(
+        store_path,
+        start_date=delta['date'].min().replace(day=1),
+        end_date=delta['date'].max() + pd.offsets.MonthEnd(0),
+        states=sorted({state for state, _ in affected})
+    )
+    # The date/state filter is a superset of the affected partitions; keep exact pairs only
+    existing_pairs = pd.Series(
+        list(zip(existing['state'].astype(str), existing['date'].dt.strftime('%Y-%m'))),
+        index=existing.index
+    )
+    existing = existing[existing_pairs.isin(affected)]
+
+    # Align key dtypes (categoricals with different categories do not merge cleanly)
+    for col in keys:
+        if col != 'date':
+            existing[col] = existing[col].astype(str)
+            delta[col] = delta[col].astype(str)
+
+    delta_keys = delta[keys].drop_duplicates()
+    hit = existing.merge(delta_keys, on=keys, how='left', indicator=True)['_merge'].eq('both').to_numpy()
+
+    # Coalesce: new values win, missing ones fall back to the stored row for that key
+    value_cols = [c for c in existing.columns if c not in keys and c not in TOTAL_COLUMNS]
+    previous = existing[hit].drop_duplicates(subset=keys)[keys + value_cols]
+    for col in value_cols:
+        if col not in delta.columns:
+            delta[col] = float('nan')
+    updated = delta.merge(previous, on=keys, how='left', suffixes=('', '_prev'))
+    for col in value_cols:
+        updated[col] = updated[col].fillna(updated[col + '_prev'])
+    updated = add_total_columns(updated[keys + value_cols])
+
+    combined = pd.concat([existing[~hit], updated[existing.columns]], ignore_index=True)
+    write_master_store(combined, store_path, overwrite=False)
+    return len(updated)
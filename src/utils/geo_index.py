@@ -0,0 +1,95 @@
+from functools import lru_cache
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+from .geo_utils import COORDS_TABLE, EARTH_RADIUS_KM, STATE_NAMES
+
+
+def to_unit_vectors(lat, lon):
+    """Converts lat/lon in degrees to (n, 3) points on the unit sphere."""
+    lat = np.radians(np.asarray(lat, dtype='float64'))
+    lon = np.radians(np.asarray(lon, dtype='float64'))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    """Great-circle distance (km) for a straight-line distance between unit vectors."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km):
+    """Inverse of chord_to_km (radii beyond half the globe cover everything)."""
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype='float64') / (2 * EARTH_RADIUS_KM), np.pi / 2))
+
+
+class GeoIndex:
+    """
+    KD-tree over lat/lon points embedded on the unit sphere.
+
+    Euclidean (chord) order on the sphere is great-circle order, so nearest and
+    radius queries are exact; distances are returned in km. Indices refer to the
+    positions of the points passed in (points with NaN coordinates are skipped).
+    """
+
+    def __init__(self, lat, lon, labels=None, leaf_size=40):
+        lat = np.asarray(lat, dtype='float64')
+        lon = np.asarray(lon, dtype='float64')
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        self.positions = np.flatnonzero(valid)
+        self.labels = np.asarray(labels) if labels is not None else np.arange(len(lat))
+        self.lat = lat
+        self.lon = lon
+        self.tree = KDTree(to_unit_vectors(lat[valid], lon[valid]), leaf_size=leaf_size)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _points(self, lat, lon):
+        lat = np.atleast_1d(np.asarray(lat, dtype='float64'))
+        lon = np.atleast_1d(np.asarray(lon, dtype='float64'))
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        return to_unit_vectors(np.where(valid, lat, 0), np.where(valid, lon, 0)), valid
+
+    def nearest(self, lat, lon, k=1):
+        """
+        k nearest indexed points for each query point.
+        Returns (distances_km, indices), both shaped (n_queries, k), closest first.
+        Query points with NaN coordinates get inf / -1.
+        """
+        points, valid = self._points(lat, lon)
+        k = min(k, len(self))
+        if k == 0:
+            return np.full((len(points), 0), np.inf), np.full((len(points), 0), -1)
+
+        chord, idx = self.tree.query(points, k=k)
+        dist = chord_to_km(chord)
+        idx = self.positions[idx]
+        dist[~valid] = np.inf
+        idx[~valid] = -1
+        return dist, idx
+
+    def within_radius(self, lat, lon, radius_km):
+        """
+        Indexed points within radius_km of each query point.
+        Returns (indices, distances_km): one array per query point, closest first.
+        """
+        points, valid = self._points(lat, lon)
+        ind, chord = self.tree.query_radius(points, r=km_to_chord(radius_km), return_distance=True, sort_results=True)
+        indices = [self.positions[i] if ok else np.empty(0, dtype=np.int64) for i, ok in zip(ind, valid)]
+        distances = [chord_to_km(c) if ok else np.empty(0) for c, ok in zip(chord, valid)]
+        return indices, distances
+
+    def count_within(self, lat, lon, radius_km):
+        """Number of indexed points within radius_km of each query point."""
+        points, valid = self._points(lat, lon)
+        counts = self.tree.query_radius(points, r=km_to_chord(radius_km), count_only=True)
+        return np.where(valid, counts, 0)
+
+
+@lru_cache(maxsize=1)
+def district_index():
+    """GeoIndex over the districts of DISTRICT_COORDS (state centers excluded), built once."""
+    table = COORDS_TABLE.drop(index=STATE_NAMES, errors='ignore')
+    return GeoIndex(table['lat'].to_numpy(), table['lon'].to_numpy(), labels=table.index.to_numpy())
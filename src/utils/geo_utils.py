@@ -1,3 +1,11 @@
+import random
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .name_resolver import resolve_district
+
 # Comprehensive dictionary for Indian Districts and States (Hackathon Demo Support)
 # Includes State Centers for Fallback and Major Districts
 
@@ -254,31 +262,68 @@ DISTRICT_COORDS = {
     'Paschim Medinipur': {'lat': 22.4284, 'lon': 87.3197}
 }
 
+# State / UT center entries of DISTRICT_COORDS (used as fallbacks, not as districts)
+STATE_NAMES = [
+    'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh', 'Goa',
+    'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jharkhand', 'Karnataka', 'Kerala',
+    'Madhya Pradesh', 'Maharashtra', 'Meghalaya', 'Odisha', 'Punjab', 'Rajasthan',
+    'Sikkim', 'Tamil Nadu', 'Telangana', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal'
+]
+
+# Mean Earth radius (km)
+EARTH_RADIUS_KM = 6371.0088
+
+# Coordinate table for bulk lookups (name -> lat / lon), built once at import
+COORDS_TABLE = pd.DataFrame.from_dict(DISTRICT_COORDS, orient='index')[['lat', 'lon']]
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Element-wise great-circle distance (km) between coordinate arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype='float64')) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+# Jitter range: +/- 0.5 degrees (approx 50km) around the state center
+JITTER_DEGREES = 0.5
+
+@lru_cache(maxsize=None)
+def _district_jitter(district_name):
+    """
+    Deterministic (lat, lon) offset for a district, computed once per name.
+    Uses a private Random seeded with the name, so the global random state is
+    never touched (same values as the old random.seed(district_name) calls).
+    A missing name (None / NaN) has no seed to derive it from and sits at the center.
+    """
+    if not isinstance(district_name, str):
+        return 0.0, 0.0
+    rng = random.Random(district_name)
+    lat_jitter = rng.uniform(-JITTER_DEGREES, JITTER_DEGREES)
+    lon_jitter = rng.uniform(-JITTER_DEGREES, JITTER_DEGREES)
+    return lat_jitter, lon_jitter
+
 def get_lat_lon(district_name, state_name=None):
     """
     Returns (lat, lon) for a district. 
     Fallbacks:
     1. Exact District Match
-    2. Approximate State Center + Jitter (to prevent overlap)
+    2. Fuzzy Match on the normalized name (spelling variants, aliases)
+    3. Approximate State Center + Jitter (to prevent overlap)
     """
     # 1. Direct Match
     if district_name in DISTRICT_COORDS:
         return DISTRICT_COORDS[district_name]
     
-    # 2. State Fallback
+    # 2. Fuzzy Match (memoized per state/district)
+    resolved = resolve_district(district_name, state_name)
+    if resolved:
+        return DISTRICT_COORDS[resolved]
+    
+    # 3. State Fallback
     if state_name and state_name in DISTRICT_COORDS:
-        import random
         # Base coordinates of State
         base = DISTRICT_COORDS[state_name]
         
-        # Add seeded random jitter so points in same state don't stack perfectly
-        # Use district name hash for consistent jitter for same district
-        random.seed(district_name) 
-        
-        # Jitter range: +/- 0.5 degrees (approx 50km)
-        # Allows points to scatter around the state center
-        lat_jitter = random.uniform(-0.5, 0.5)
-        lon_jitter = random.uniform(-0.5, 0.5)
+        # Seeded jitter so points in same state don't stack perfectly
+        lat_jitter, lon_jitter = _district_jitter(district_name)
         
         return {
             'lat': base['lat'] + lat_jitter,
@@ -287,3 +332,46 @@ def get_lat_lon(district_name, state_name=None):
         
     # Return nothing if both fail (filtered out in UI)
     return None
+
+def lookup_lat_lon(districts, states=None):
+    """
+    Bulk version of get_lat_lon for district / state columns.
+    Returns (lat, lon) float arrays aligned with the input; rows that match
+    neither a district nor a state are NaN.
+
+    Each distinct (district, state) pair is resolved once: exact districts by a
+    join against COORDS_TABLE, spelling variants through resolve_district, the
+    rest at their state center plus the cached jitter.
+    """
+    districts = pd.Series(districts).reset_index(drop=True).astype(object)
+    states = pd.Series(states if states is not None else [None] * len(districts)).reset_index(drop=True).astype(object)
+    
+    # 1. Work on the distinct pairs only
+    pairs = pd.DataFrame({'district': districts, 'state': states})
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(pairs))
+    uniq = uniques.to_frame(index=False, name=['district', 'state'])
+    
+    # 2. Exact district match (vectorized join), then fuzzy resolution of the misses
+    district_pos = COORDS_TABLE.index.get_indexer(uniq['district'])
+    for i in np.flatnonzero(district_pos < 0):
+        resolved = resolve_district(uniq['district'].iat[i], uniq['state'].iat[i])
+        if resolved:
+            district_pos[i] = COORDS_TABLE.index.get_loc(resolved)
+    lat = np.where(district_pos >= 0, COORDS_TABLE['lat'].to_numpy()[district_pos], np.nan)
+    lon = np.where(district_pos >= 0, COORDS_TABLE['lon'].to_numpy()[district_pos], np.nan)
+    
+    # 3. State center + per-district jitter for the rest
+    state_pos = COORDS_TABLE.index.get_indexer(uniq['state'])
+    fallback = (district_pos < 0) & (state_pos >= 0)
+    if fallback.any():
+        jitter = np.array([_district_jitter(d) for d in uniq['district'][fallback]], dtype='float64')
+        lat[fallback] = COORDS_TABLE['lat'].to_numpy()[state_pos[fallback]] + jitter[:, 0]
+        lon[fallback] = COORDS_TABLE['lon'].to_numpy()[state_pos[fallback]] + jitter[:, 1]
+    
+    # Unmatched pairs (e.g. missing keys, code -1) stay NaN
+    valid = codes >= 0
+    out_lat = np.full(len(codes), np.nan)
+    out_lon = np.full(len(codes), np.nan)
+    out_lat[valid] = lat[codes[valid]]
+    out_lon[valid] = lon[codes[valid]]
+    return out_lat, out_lon
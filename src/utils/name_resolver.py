@@ -0,0 +1,166 @@
+import json
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+# Default location of the persistent cache (relative to data/processed)
+RESOLVER_CACHE_NAME = 'district_name_cache.json'
+
+# Minimum trigram similarity (Dice) for a fuzzy match
+MIN_SIMILARITY = 0.6
+
+# A match must lie within this distance of the row's state center (when known)
+MAX_STATE_DISTANCE_KM = 800
+
+# Hindi / Bengali direction words and other spelling variants seen in the raw feeds
+TOKEN_ALIASES = {
+    'purbi': 'east', 'purba': 'east', 'purb': 'east',
+    'paschim': 'west', 'pashchim': 'west', 'paschimi': 'west',
+    'uttar': 'north', 'uttari': 'north',
+    'dakshin': 'south', 'dakshini': 'south', 'dakshina': 'south',
+    'and': '&',
+    # Renamed cities
+    'bangalore': 'bengaluru', 'mysore': 'mysuru', 'mangalore': 'mangaluru', 'belgaum': 'belagavi',
+    'gulbarga': 'kalaburagi', 'shimoga': 'shivamogga', 'tumkur': 'tumakuru',
+    'gurgaon': 'gurugram', 'bombay': 'mumbai', 'poona': 'pune', 'baroda': 'vadodara',
+    'calcutta': 'kolkata', 'madras': 'chennai', 'trichy': 'tiruchirappalli',
+    'trivandrum': 'thiruvananthapuram', 'cochin': 'kochi', 'calicut': 'kozhikode',
+}
+
+# Words that do not help tell districts apart
+STOP_TOKENS = {'district', 'dist', 'urban', 'rural', 'city'}
+
+# (state, district) -> resolved DISTRICT_COORDS name or None, shared by all lookups
+_CACHE = {}
+
+
+def normalize_name(name):
+    """Lower-cases, strips punctuation and maps alias tokens ('Purbi Champaran' -> 'east champaran')."""
+    if not isinstance(name, str):
+        return ''
+    tokens = re.sub(r'[^a-z0-9&]+', ' ', name.lower()).split()
+    tokens = [TOKEN_ALIASES.get(t, t) for t in tokens]
+    kept = [t for t in tokens if t not in STOP_TOKENS]
+    return ' '.join(kept or tokens)
+
+
+def _trigrams(normalized):
+    # Spaces removed so 'cooch behar' and 'coochbehar' share every trigram
+    compact = f"  {normalized.replace(' ', '')} "
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+@lru_cache(maxsize=1)
+def _name_index():
+    """
+    Trigram index over the known district names:
+    (names, normalized -> name, trigram -> name ids, trigram set sizes, normalized
+    names that are a strict token prefix of another known district).
+    """
+    from .geo_utils import DISTRICT_COORDS, STATE_NAMES
+
+    state_names = set(STATE_NAMES)
+    names = [n for n in DISTRICT_COORDS if n not in state_names]
+    exact = {}
+    prefixes = set()
+    postings = defaultdict(list)
+    sizes = np.zeros(len(names), dtype=np.int64)
+    for i, name in enumerate(names):
+        normalized = normalize_name(name)
+        exact.setdefault(normalized, name)
+        exact.setdefault(normalized.replace(' ', ''), name)
+        tokens = normalized.split()
+        prefixes.update(' '.join(tokens[:k]) for k in range(1, len(tokens)))
+        grams = _trigrams(normalized)
+        sizes[i] = len(grams)
+        for gram in grams:
+            postings[gram].append(i)
+    return names, exact, {g: np.array(ids) for g, ids in postings.items()}, sizes, prefixes
+
+
+def _near_state(name, state):
+    from .geo_utils import DISTRICT_COORDS, haversine_km
+
+    if not isinstance(state, str) or state not in DISTRICT_COORDS:
+        return True
+    a, b = DISTRICT_COORDS[name], DISTRICT_COORDS[state]
+    return haversine_km(a['lat'], a['lon'], b['lat'], b['lon']) <= MAX_STATE_DISTANCE_KM
+
+
+def _match(district, state):
+    names, exact, postings, sizes, prefixes = _name_index()
+    normalized = normalize_name(district)
+    if not normalized:
+        return None
+
+    # 1. Normalized exact match (aliases, case, punctuation, spacing)
+    for key in (normalized, normalized.replace(' ', '')):
+        if key in exact and _near_state(exact[key], state):
+            return exact[key]
+
+    # 2. Trigram candidates scored by Dice similarity
+    grams = _trigrams(normalized)
+    hits = [postings[g] for g in grams if g in postings]
+    if not hits:
+        return None
+    shared = np.bincount(np.concatenate(hits), minlength=len(names))
+    score = 2 * shared / (sizes + len(grams))
+    for i in np.argsort(-score, kind='stable'):
+        if score[i] < MIN_SIMILARITY:
+            break
+        if _is_sibling(normalize_name(names[i]), normalized, prefixes):
+            continue
+        if _near_state(names[i], state):
+            return names[i]
+    return None
+
+
+def _is_sibling(candidate, normalized, prefixes):
+    """
+    True when the candidate's tokens are a strict prefix of the input's and the
+    candidate also starts a longer known district: 'Kanpur Dehat' is then a distinct
+    sibling of 'Kanpur' / 'Kanpur Nagar', not a spelling of 'Kanpur'.
+    """
+    tokens, candidate_tokens = normalized.split(), candidate.split()
+    return (
+        candidate in prefixes
+        and len(tokens) > len(candidate_tokens)
+        and tokens[:len(candidate_tokens)] == candidate_tokens
+    )
+
+
+def resolve_district(district, state=None):
+    """
+    Best DISTRICT_COORDS name for a raw district name (None if nothing is close).
+    Results are memoized per (state, district) and can be persisted with save_resolver_cache.
+    """
+    key = f"{state}|{district}"
+    if key not in _CACHE:
+        _CACHE[key] = _match(district, state)
+    return _CACHE[key]
+
+
+def load_resolver_cache(path):
+    """
+    Merges a cache written by save_resolver_cache into the in-memory cache
+    (unresolved entries of older cache files are skipped and looked up again).
+    """
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as fh:
+            _CACHE.update({k: v for k, v in json.load(fh).items() if v is not None})
+    return _CACHE
+
+
+def save_resolver_cache(path):
+    """
+    Writes the resolved names of the in-memory cache as JSON (temp file + rename).
+    Misses are not persisted, so they are retried once coordinates are added.
+    """
+    resolved = {k: v for k, v in _CACHE.items() if v is not None}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(resolved, fh, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
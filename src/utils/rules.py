@@ -0,0 +1,61 @@
+import operator
+
+import numpy as np
+
+# Comparison operators a rule term may use
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _term_mask(df, term):
+    column, op, value = term
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown rule operator '{op}' (expected one of {sorted(OPERATORS)})")
+    # NaN never satisfies a comparison (as in a row-wise `row[column] > value`)
+    return np.asarray(OPERATORS[op](df[column].to_numpy(), value), dtype=bool)
+
+
+def compile_rules(rules, default):
+    """
+    Compiles ordered threshold rules into a function frame -> label array.
+
+    Each rule is (label, terms) or (label, terms, how): terms is a list of
+    (column, operator, value) comparisons combined with how='all' (AND, default)
+    or how='any' (OR). Rules are tried in order and the first match wins, so
+
+        [('High', [('score', '>', 60), ('volume', '>', 10000)], 'any'),
+         ('Medium', [('score', '>', 30)])]
+
+    with default 'Low' is the vectorized form of an if / elif / else row function.
+    The whole frame is evaluated with numpy comparisons and one np.select.
+    """
+    labels = np.empty(len(rules) + 1, dtype=object)
+    labels[:] = [rule[0] for rule in rules] + [default]
+    reducers = []
+    for rule in rules:
+        how = rule[2] if len(rule) > 2 else 'all'
+        if how not in ('all', 'any'):
+            raise ValueError(f"Rule '{rule[0]}': how must be 'all' or 'any', got '{how}'")
+        reducers.append(np.logical_and if how == 'all' else np.logical_or)
+
+    def evaluate(df):
+        conditions = []
+        for (_, terms, *_), reducer in zip(rules, reducers):
+            masks = [_term_mask(df, term) for term in terms]
+            conditions.append(reducer.reduce(masks) if masks else np.ones(len(df), dtype=bool))
+        # Index of the first matching rule (len(rules) = default), then one gather
+        codes = np.select(conditions, np.arange(len(rules)), default=len(rules))
+        return labels[codes]
+
+    return evaluate
+
+
+def apply_rules(df, rules, default):
+    """Labels every row of df with the first matching rule (see compile_rules)."""
+    return compile_rules(rules, default)(df)
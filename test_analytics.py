@@ -9,23 +9,19 @@ from src.analytics import enrolment_analysis
 from src.analytics import biometric_update_analysis
 from src.analytics import demographic_update_analysis
 from src.analytics import migration_analysis
+from src.preprocessing.storage import load_master_table
 
 def main():
     print("Running Analytics Tests...")
     
     # 1. Load Data
-    data_path = os.path.join('data', 'processed', 'merged_master_table.csv')
-    if not os.path.exists(data_path):
-        print(f"Error: Processed data not found at {data_path}. Please run run_pipeline.py first.")
+    processed_dir = os.path.join('data', 'processed')
+    print(f"Loading data from {processed_dir}...")
+    df = load_master_table(processed_dir)
+    if df is None:
+        print(f"Error: Processed data not found in {processed_dir}. Please run run_pipeline.py first.")
         return
 
-    print(f"Loading data from {data_path}...")
-    df = pd.read_csv(data_path)
-    
-    # Ensure date is datetime
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-
     print(f"Data Loaded. Shape: {df.shape}")
     print("-" * 30)
 
@@ -43,6 +39,9 @@ def main():
     correlation = biometric_update_analysis.analyze_mandatory_update_lag(df)
     print(f"Enrolment-Update Correlation: {correlation}")
     
+    lagged = biometric_update_analysis.analyze_mandatory_update_lag(df, lag_years=5)
+    print(f"Enrolment-Update Correlation (5-year cohort lag): {lagged}")
+    
     forecast = biometric_update_analysis.forecast_bio_demand_simple(df)
     print(f"Biometric Demand Forecast (Top 5):\n{forecast.head()}")
     print("-" * 30)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from src.models import anomaly_detection
+from src.models.anomaly_detection import (
+    detect_anomalies, ensure_anomaly_model, fit_anomaly_model, load_anomaly_model, needs_refit, save_anomaly_model,
+    specific_fraud_rules
+)
+
+
+def _patna_days(district_days, n=400, seed=0, scale=1.0):
+    frame = district_days(days=n, districts=[('Bihar', 'Patna')], seed=seed, total_enrolment=50 * scale,
+                          total_bio_updates=80 * scale, total_demo_updates=30 * scale)
+    frame['total_updates'] = frame['total_bio_updates'] + frame['total_demo_updates']
+    return frame
+
+
+def test_flag_helpers_leave_the_callers_frame_alone(district_days):
+    df = _patna_days(district_days)
+    before = df.copy()
+
+    scored = specific_fraud_rules(detect_anomalies(df))
+    pd.testing.assert_frame_equal(df, before)
+    assert {'anomaly_score', 'is_anomaly', 'suspicious_bio_ratio', 'high_volume_spike'} <= set(scored.columns)
+    pd.testing.assert_frame_equal(scored[before.columns], before)
+
+
+def test_model_from_another_sklearn_version_is_refitted(tmp_path, monkeypatch, district_days):
+    df = _patna_days(district_days)
+    bundle = fit_anomaly_model(df)
+    save_anomaly_model(bundle, str(tmp_path))
+    assert not needs_refit(load_anomaly_model(str(tmp_path)), df)
+
+    monkeypatch.setattr(anomaly_detection.sklearn, '__version__', '0.0.0')
+    assert load_anomaly_model(str(tmp_path)) is None
+    assert needs_refit(bundle, df)
+    assert ensure_anomaly_model(df, str(tmp_path))['version'] == 2
+
+
+def test_saved_versions_load_and_score_alike(tmp_path, district_days):
+    df = _patna_days(district_days)
+    first = fit_anomaly_model(df)
+    save_anomaly_model(first, str(tmp_path))
+    second = fit_anomaly_model(_patna_days(district_days, seed=1))
+    save_anomaly_model(second, str(tmp_path))
+
+    assert load_anomaly_model(str(tmp_path))['version'] == 2
+    loaded = load_anomaly_model(str(tmp_path), version=1)
+    assert loaded['version'] == 1 and load_anomaly_model(str(tmp_path), version=3) is None
+    np.testing.assert_array_equal(loaded['model'].predict(df[loaded['features']].to_numpy()),
+                                  first['model'].predict(df[first['features']].to_numpy()))
+
+
+def test_refit_after_max_age(district_days):
+    df = _patna_days(district_days)
+    bundle = fit_anomaly_model(df)
+    age = pd.Timedelta(days=anomaly_detection.MAX_MODEL_AGE_DAYS)
+
+    bundle['trained_at'] = (pd.Timestamp.now() - age + pd.Timedelta(hours=1)).isoformat()
+    assert not needs_refit(bundle, df)
+    bundle['trained_at'] = (pd.Timestamp.now() - age - pd.Timedelta(hours=1)).isoformat()
+    assert needs_refit(bundle, df)
+    assert not needs_refit(bundle, df, max_age_days=30)
+
+
+def test_refit_on_feature_drift(tmp_path, district_days):
+    df = _patna_days(district_days)
+    bundle = ensure_anomaly_model(df, str(tmp_path))
+
+    # Same distribution: the stored model is reused
+    same = _patna_days(district_days, seed=1)
+    assert max(anomaly_detection.feature_drift(bundle, same).values()) <= anomaly_detection.PSI_THRESHOLD
+    assert ensure_anomaly_model(same, str(tmp_path))['version'] == bundle['version']
+
+    # Volumes tripled: every feature leaves its training deciles
+    drifted = _patna_days(district_days, seed=2, scale=3.0)
+    assert min(anomaly_detection.feature_drift(bundle, drifted).values()) > anomaly_detection.PSI_THRESHOLD
+    assert not needs_refit(bundle, drifted, psi_threshold=np.inf)
+    refitted = ensure_anomaly_model(drifted, str(tmp_path))
+    assert refitted['version'] == bundle['version'] + 1
+    assert refitted['n_rows'] == len(drifted)
+
+
+def test_chunked_scoring_matches_single_predict(district_days):
+    df = _patna_days(district_days, n=1000)
+    bundle = fit_anomaly_model(df)
+    expected = bundle['model'].predict(df[bundle['features']].to_numpy(dtype='float64'))
+
+    np.testing.assert_array_equal(anomaly_detection.score_anomalies(bundle, df, n_jobs=4, chunk_size=97), expected)
+    np.testing.assert_array_equal(anomaly_detection.score_anomalies(bundle, df), expected)
+    flags = anomaly_detection.anomaly_flags(df, model=bundle)
+    np.testing.assert_array_equal(flags['is_anomaly'].to_numpy(), expected == -1)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from src.metrics.ausi_state import (
+    SCORE_QUANTILE, build_ausi_state, load_ausi_state, new_quantile_sketch, save_ausi_state, sketch_add,
+    sketch_quantile, update_ausi
+)
+from src.metrics.stress_index import calculate_ausi
+
+
+def _in_date_order(df):
+    return df.sort_values(['date', 'state', 'district']).reset_index(drop=True)
+
+
+def test_sketch_quantile_within_relative_accuracy():
+    values = np.random.default_rng(0).lognormal(0, 2, 5000)
+    values[:100] = 0
+    sketch = sketch_add(new_quantile_sketch(0.01), values)
+    for q in (0.01, 0.5, 0.95, 0.99):
+        exact = np.quantile(values, q, method='lower')
+        assert abs(sketch_quantile(sketch, q) - exact) <= 0.01 * exact + 1e-12
+
+
+def test_update_matches_full_recompute(tmp_path, district_days):
+    districts = [('Bihar', 'Patna'), ('Bihar', 'Gaya'), ('Kerala', 'Kollam'), ('Kerala', 'Idukki')]
+    history = district_days(districts=districts, total_enrolment=15, total_updates=40)
+    # Idukki only reports from day 40 on, Gaya stops after day 30: both cross the split points
+    history = history[~((history['district'] == 'Idukki') & (history['date'] < '2025-02-10'))]
+    history = history[~((history['district'] == 'Gaya') & (history['date'] > '2025-01-31'))]
+    path = str(tmp_path / 'ausi_state.json')
+    splits = [pd.Timestamp('2025-01-20'), pd.Timestamp('2025-02-15'), history['date'].max() + pd.Timedelta(days=1)]
+
+    state, _ = build_ausi_state(history[history['date'] < splits[0]])
+    save_ausi_state(state, path)
+    appended = []
+    for lo, hi in zip(splits, splits[1:]):
+        # Every run starts from the state the previous one saved
+        state = load_ausi_state(path)
+        appended.append(update_ausi(state, history[(history['date'] >= lo) & (history['date'] < hi)].copy()))
+        save_ausi_state(state, path)
+    incremental = _in_date_order(pd.concat(appended))
+
+    full = calculate_ausi(history)
+    expected = _in_date_order(full[full['date'] >= splits[0]])
+    for col in ('cumulative_base', 'ausi_daily', 'ausi_smooth'):
+        np.testing.assert_allclose(incremental[col], expected[col], rtol=1e-12)
+
+    # Last batch is normalized against the sketch of the whole history
+    last = incremental['date'] >= splits[1]
+    np.testing.assert_allclose(incremental.loc[last, 'ausi_score'], expected.loc[last, 'ausi_score'], rtol=0.02)
+
+    # The advanced state is the one a full rebuild would store
+    rebuilt, _ = build_ausi_state(history)
+    state = load_ausi_state(path)
+    assert state['last_date'] == rebuilt['last_date']
+    assert state['districts'].keys() == rebuilt['districts'].keys()
+    for key, stats in rebuilt['districts'].items():
+        assert state['districts'][key]['enrolment_total'] == stats['enrolment_total']
+        np.testing.assert_allclose(state['districts'][key]['tail'], stats['tail'], rtol=1e-12)
+    assert state['sketch']['count'] == rebuilt['sketch']['count']
+    np.testing.assert_allclose(sketch_quantile(state['sketch'], SCORE_QUANTILE),
+                               sketch_quantile(rebuilt['sketch'], SCORE_QUANTILE), rtol=0.02)
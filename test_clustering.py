@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from src.models import clustering
+from src.models.clustering import (
+    cluster_pincodes, fit_clusters, load_centroids, pincode_totals, save_centroids
+)
+from src.utils.geo_utils import haversine_km, lookup_lat_lon
+
+
+def _pincode_rows(n_pincodes, days=3, seed=0):
+    rng = np.random.default_rng(seed)
+    pincodes = np.arange(n_pincodes)
+    frame = pd.DataFrame({
+        'date': np.repeat(pd.date_range('2024-12-30', periods=days), n_pincodes),
+        'state': np.tile([f"S{p % 7}" for p in pincodes], days),
+        'district': np.tile([f"D{p % 50}" for p in pincodes], days),
+        'pincode': np.tile([str(100000 + p) for p in pincodes], days),
+        'total_updates': rng.poisson(30, n_pincodes * days).astype('float64'),
+        'total_enrolment': rng.poisson(10, n_pincodes * days).astype('float64'),
+    })
+    for col in ('state', 'district', 'pincode'):
+        frame[col] = frame[col].astype('category')
+    return frame
+
+
+def test_pincode_totals_chunked_matches_single_pass():
+    rows = _pincode_rows(40)
+    chunks = [rows[rows['date'] < '2025-01-01'], rows[rows['date'] >= '2025-01-01']]
+    # Each chunk keeps only its own categories, as a year read from the store would
+    chunks = [chunk.assign(pincode=chunk['pincode'].cat.remove_unused_categories()) for chunk in chunks]
+
+    incremental = pincode_totals(chunks[1], totals=pincode_totals(chunks[0]))
+    pd.testing.assert_frame_equal(incremental, pincode_totals(rows))
+    pd.testing.assert_frame_equal(pincode_totals(iter(chunks)), pincode_totals(rows))
+
+
+def test_pincode_plan_uses_minibatch_above_threshold(monkeypatch):
+    calls = []
+    real = clustering.MiniBatchKMeans
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(clustering, 'MiniBatchKMeans', spy)
+    plan, centroids = cluster_pincodes(pincode_totals(_pincode_rows(clustering.MINIBATCH_THRESHOLD + 1)),
+                                       return_centroids=True)
+    assert calls
+    assert len(plan) == clustering.MINIBATCH_THRESHOLD + 1
+    assert set(plan['cluster']) == {0, 1, 2}
+    # Ranked by intensity: label 2 is the heaviest cluster
+    assert np.all(np.diff(centroids.sum(axis=1)) >= 0)
+
+
+def test_warm_start_reproduces_the_fit(tmp_path):
+    X = np.random.default_rng(1).normal(size=(300, 2)) * [10, 1000]
+    labels, centroids = fit_clusters(X)
+    path = str(tmp_path / 'centroids.json')
+    save_centroids(centroids, path)
+
+    warm_labels, warm_centroids = fit_clusters(X, centroids=load_centroids(path))
+    np.testing.assert_array_equal(warm_labels, labels)
+    np.testing.assert_allclose(warm_centroids, centroids)
+
+
+def test_centroids_of_another_level_are_not_reused(tmp_path):
+    path = str(tmp_path / 'centroids.json')
+    save_centroids(np.zeros((3, 2)), path, level='pincode')
+    assert load_centroids(path) is None
+    assert load_centroids(path, level='pincode').shape == (3, 2)
+
+
+def test_coverage_counts_match_pairwise_distances():
+    summary = pd.DataFrame({
+        'state': ['Bihar', 'Bihar', 'Kerala', 'West Bengal', 'West Bengal'],
+        'district': ['Patna', 'Gaya', 'Kollam', 'Kolkata', 'Howrah'],
+        'recommendation': ['New Center Required', 'Monitor', 'New Center Required', 'New Center Required', 'Monitor'],
+    })
+    located = clustering.add_nearest_center(summary.copy())
+
+    lat, lon = lookup_lat_lon(summary['district'], summary['state'])
+    centers = np.flatnonzero(summary['recommendation'] == 'New Center Required')
+    dist = haversine_km(lat[:, None], lon[:, None], lat[centers][None, :], lon[centers][None, :])
+    np.testing.assert_allclose(located['nearest_center_km'], dist.min(axis=1), atol=1e-6)
+    np.testing.assert_array_equal(located['centers_in_reach'], (dist <= clustering.COVERAGE_RADIUS_KM).sum(axis=1))
+    assert located.loc[4, 'centers_in_reach'] == 1
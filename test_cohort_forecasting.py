@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.cohort_forecasting import (MIN_FIT_MONTHS, cohort_forecast, load_cohort_totals, monthly_cohort_totals,
+                                           save_cohort_totals)
+
+KEYS = ['state', 'district']
+
+
+def _categorical(df):
+    # Keys typed as the store returns them, categories limited to the rows of the chunk
+    df = df.copy()
+    for key in KEYS:
+        df[key] = df[key].astype(str).astype('category')
+    return df
+
+
+def _sorted(df):
+    df = df.copy()
+    for key in KEYS:
+        df[key] = df[key].astype(str)
+    return df.sort_values(KEYS + ['month']).reset_index(drop=True)
+
+
+def test_trend_fallback_on_short_history(district_days):
+    # Two years: not enough for the 5-year lag to cover MIN_FIT_MONTHS of history
+    df = district_days(days=730, age_0_5=5, age_5_17=5, total_bio_updates=50)
+    df['total_bio_updates'] += np.repeat(np.arange(730) * 0.1, 3)
+    forecasts = cohort_forecast(df, months_ahead=6)
+    assert len(forecasts) == 3 * 6
+    assert set(forecasts['method']) == {'trend'}
+
+    monthly = monthly_cohort_totals(df)
+    for (state, district), group in monthly.groupby(KEYS, observed=True):
+        slope, intercept = np.polyfit(np.arange(len(group)), group['total_bio_updates'].to_numpy(), 1)
+        expected = intercept + slope * np.arange(len(group), len(group) + 6)
+        rows = forecasts[(forecasts['district'] == district) & (forecasts['state'] == state)]
+        np.testing.assert_allclose(rows['predicted_demand'], np.maximum(expected, 0), rtol=1e-6)
+        assert rows['month'].iloc[0] == pd.Timestamp('2027-01-01')
+
+
+def test_lag_model_on_long_history(district_days):
+    # Seven years: the 5-year lag of age_0_5 covers two years of history
+    days = 7 * 365
+    df = district_days(days=days, age_0_5=5, age_5_17=5)
+    monthly_enrolment = monthly_cohort_totals(df)
+    # Monthly updates are twice the age_0_5 enrolments of five years earlier
+    monthly_enrolment['total_bio_updates'] = (
+        monthly_enrolment.groupby(KEYS, observed=True)['age_0_5'].shift(60).fillna(0) * 2
+    )
+    forecasts = cohort_forecast(totals=monthly_enrolment, months_ahead=12)
+    assert set(forecasts['method']) == {'cohort'}
+
+    n_months = monthly_enrolment.groupby(KEYS, observed=True).size().iloc[0]
+    assert n_months - 60 >= MIN_FIT_MONTHS
+    for (state, district), group in monthly_enrolment.groupby(KEYS, observed=True):
+        expected = 2 * group['age_0_5'].to_numpy()[n_months - 60:n_months - 48]
+        rows = forecasts[(forecasts['district'] == district) & (forecasts['state'] == state)]
+        np.testing.assert_allclose(rows['predicted_demand'], expected, rtol=1e-3)
+
+
+def test_stored_totals_plus_new_chunks_match_one_pass(district_days, tmp_path):
+    df = district_days(days=400, age_0_5=5, age_5_17=5, total_bio_updates=50)
+    # The second chunk only has Patna, so its categories differ from the first's
+    cut = df['date'] >= '2025-09-15'
+    first, second = df[~cut], df[cut & (df['district'] == 'Patna')]
+
+    path = str(tmp_path / 'cohort_monthly.parquet')
+    save_cohort_totals(monthly_cohort_totals([_categorical(first)]), path)
+    incremental = monthly_cohort_totals([_categorical(second)], totals=load_cohort_totals(path))
+    one_pass = monthly_cohort_totals([_categorical(first), _categorical(second)])
+    expected = monthly_cohort_totals(pd.concat([first, second]))
+
+    pd.testing.assert_frame_equal(_sorted(incremental), _sorted(expected))
+    pd.testing.assert_frame_equal(_sorted(one_pass), _sorted(expected))
+    # No district appears twice for a month, and the keys are plain text whatever the chunks' categories
+    assert not incremental.duplicated(KEYS + ['month']).any()
+    assert not any(isinstance(incremental[key].dtype, pd.CategoricalDtype) for key in KEYS)
+
+
+def test_forecast_from_totals_matches_forecast_from_rows(district_days):
+    df = district_days(days=400, age_0_5=5, age_5_17=5, total_bio_updates=50)
+    pd.testing.assert_frame_equal(cohort_forecast(df), cohort_forecast(totals=monthly_cohort_totals(df)))
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.cube import build_cube, period_start, query_cube, update_cube
+
+
+def _direct(frame, start, end, by, grain):
+    rows = frame[(frame['date'] >= start) & (frame['date'] <= end)]
+    rows = rows.assign(date=period_start(rows['date'], grain), rows=1)
+    return rows.groupby(by, sort=True)[['total_enrolment', 'total_updates', 'rows']].sum().reset_index()
+
+
+@pytest.mark.parametrize('grain', ['day', 'week', 'month'])
+@pytest.mark.parametrize('start, end', [
+    ('2025-01-01', '2025-04-30'),
+    ('2025-01-15', '2025-03-10'),
+    ('2025-02-04', '2025-02-11'),
+    ('2025-03-03', '2025-03-09'),
+])
+@pytest.mark.parametrize('by', [['date'], ['date', 'state'], ['date', 'state', 'district']])
+def test_query_by_date_matches_direct_groupby(district_days, grain, start, end, by):
+    # A missing district-day, so row counts differ per period
+    frame = district_days(days=120, total_enrolment=20, total_updates=60).drop(index=7)
+    result = query_cube(build_cube(frame), start, end, by=by, grain=grain)
+
+    expected = _direct(frame, pd.Timestamp(start), pd.Timestamp(end), by, grain)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+    # Grouping by date never changes the range total
+    total = query_cube(build_cube(frame), start, end, by=())
+    np.testing.assert_allclose(result['total_updates'].sum(), total['total_updates'].iloc[0])
+
+
+def test_query_after_update_matches_rebuilt_cube(district_days):
+    frame = district_days(days=120, total_enrolment=20, total_updates=60)
+    split = pd.Timestamp('2025-02-12')
+    cube = update_cube(build_cube(frame[frame['date'] < split]), frame[frame['date'] >= split])
+
+    for grain in ('week', 'month'):
+        pd.testing.assert_frame_equal(
+            query_cube(cube, '2025-01-20', '2025-03-20', by=['date', 'state'], grain=grain),
+            query_cube(build_cube(frame), '2025-01-20', '2025-03-20', by=['date', 'state'], grain=grain)
+        )
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from src.preprocessing import data_loader
+from src.preprocessing.data_loader import load_datasets_from_files, load_from_folder
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS
+
+
+def _write_split_files(folder, source, n_files=5, rows=20):
+    folder.mkdir()
+    paths = []
+    # Written in reverse name order, so directory order is unlikely to be sorted
+    for i in reversed(range(n_files)):
+        frame = pd.DataFrame({
+            'date': [f"{1 + r % 28:02d}-0{1 + i}-2025" for r in range(rows)],
+            'state': 'Bihar',
+            'district': 'Patna',
+            'pincode': [str(800000 + r) for r in range(rows)],
+        })
+        for j, col in enumerate(SOURCE_COUNT_COLUMNS[source]):
+            frame[col] = range(i * 100 + j, i * 100 + j + rows)
+        path = folder / f"part_{i:02d}.csv"
+        frame.to_csv(path, index=False)
+        paths.append(str(path))
+    return sorted(paths)
+
+
+def test_folder_is_read_in_file_name_order(tmp_path):
+    paths = _write_split_files(tmp_path / 'enrolment', 'enrolment')
+    seen = []
+    df = load_from_folder(str(tmp_path / 'enrolment'), source='enrolment', on_file=lambda s, p, d: seen.append(p))
+
+    assert seen == paths
+    assert df['age_0_5'].iloc[::20].tolist() == [0, 100, 200, 300, 400]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_sources_share_one_pool_and_match_sequential(tmp_path, monkeypatch, executor):
+    files = {source: _write_split_files(tmp_path / source, source) for source in SOURCE_COUNT_COLUMNS}
+    files['demographic'] = []
+
+    pools = []
+    real = data_loader._make_executor
+
+    def spy(workers, kind='thread'):
+        pools.append(workers)
+        return real(workers, kind)
+
+    monkeypatch.setattr(data_loader, '_make_executor', spy)
+    seen = []
+    parallel = load_datasets_from_files(files, workers=4, executor=executor,
+                                        on_file=lambda s, p, d: seen.append((s, p)))
+    sequential = load_datasets_from_files(files)
+
+    assert pools == [4]
+    assert seen == [(source, path) for source, paths in files.items() for path in paths]
+    assert parallel['demographic'] is None and sequential['demographic'] is None
+    for source in ('enrolment', 'biometric'):
+        pd.testing.assert_frame_equal(parallel[source], sequential[source])
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.feature_frame import FEATURES, FeatureFrame
+from src.analytics.migration_analysis import classify_growth_patterns, identify_migration_corridors, migration_flux
+from src.metrics.stress_index import calculate_ausi
+from src.models.anomaly_detection import specific_fraud_rules
+from src.models.clustering import cluster_districts
+from src.preprocessing.feature_engineering import add_total_columns
+
+
+@pytest.fixture
+def base(district_days):
+    df = district_days(days=40, age_0_5=20, age_5_17=20, age_18_greater=20,
+                       demo_age_5_17=20, demo_age_17_=20, bio_age_5_17=20, bio_age_17_=20)
+    return add_total_columns(df)
+
+
+def _counting(features):
+    # Same features, each call counted per function
+    calls = {}
+
+    def wrap(func):
+        def counted(frame):
+            calls[func.__name__] = calls.get(func.__name__, 0) + 1
+            return func(frame)
+        return counted
+
+    wrapped = {func: wrap(func) for func in set(features.values())}
+    return {name: wrapped[func] for name, func in features.items()}, calls
+
+
+def test_derived_columns_are_computed_once(base):
+    features, calls = _counting(FEATURES)
+    frame = FeatureFrame(base, features=features)
+    for _ in range(3):
+        for name in FEATURES:
+            frame[name]
+        frame[['state', 'district', 'migration_flux', 'ausi_score']]
+    # The four AUSI columns and the two fraud flags each come from one call
+    assert calls == {'migration_flux': 1, 'organic_growth_rate': 1, 'ausi_columns': 1, 'fraud_flags': 1}
+
+
+def test_derived_columns_match_the_frame_functions(base):
+    frame = FeatureFrame(base)
+    ausi = calculate_ausi(base).sort_index()
+    for col in ['cumulative_base', 'ausi_daily', 'ausi_smooth', 'ausi_score']:
+        pd.testing.assert_series_equal(frame[col], ausi[col], check_names=False)
+    fraud = specific_fraud_rules(base)
+    for col in ['suspicious_bio_ratio', 'high_volume_spike']:
+        pd.testing.assert_series_equal(frame[col], fraud[col], check_names=False)
+    pd.testing.assert_series_equal(frame['migration_flux'], migration_flux(base))
+    assert list(frame.columns) == list(base.columns) + list(FEATURES)
+
+
+def test_base_frame_is_not_mutated(base):
+    original = base.copy(deep=True)
+    frame = FeatureFrame(base)
+
+    growth = classify_growth_patterns(frame)
+    hubs = identify_migration_corridors(frame, threshold_percentile=0.5)
+    plan = cluster_districts(frame[['state', 'district', 'ausi_score', 'total_updates', 'total_enrolment']])
+    everything = frame.frame(list(frame.columns))
+
+    pd.testing.assert_frame_equal(base, original)
+    # Same results as on the plain frame
+    pd.testing.assert_frame_equal(growth, classify_growth_patterns(original))
+    pd.testing.assert_frame_equal(hubs, identify_migration_corridors(original, threshold_percentile=0.5))
+    assert len(plan) == 3
+    # Base columns are shared, not copied
+    assert np.shares_memory(everything['total_updates'].to_numpy(), base['total_updates'].to_numpy())
+
+
+def test_subset_keeps_full_frame_values(base):
+    frame = FeatureFrame(base)
+    scores = frame['ausi_score']
+    mask = (base['district'] == 'Patna').to_numpy()
+    child = frame.subset(mask)
+    # Already computed: sliced from the whole frame; not yet computed: computed on the subset
+    pd.testing.assert_series_equal(child['ausi_score'], scores[mask])
+    pd.testing.assert_series_equal(child['migration_flux'], migration_flux(base[mask]))
+    assert len(child) == mask.sum()
+
+
+def test_unknown_column(base):
+    with pytest.raises(KeyError):
+        FeatureFrame(base)['no_such_column']
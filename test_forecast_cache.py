@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+
+from src.models.forecast_cache import (
+    ForecastCache, add_data_hashes, district_data_hashes, invalidate_changed_districts, load_data_hashes
+)
+
+
+def _forecast(value, rows=30):
+    return pd.DataFrame({'date': pd.date_range('2025-02-01', periods=rows), 'predicted': float(value)})
+
+
+def test_appended_hashes_match_full_recompute(district_days):
+    history = district_days(days=30, total_bio_updates=80)
+    old, new = history[history['date'] < '2025-01-20'], history[history['date'] >= '2025-01-20']
+    # Kollam's new rows are left out: only the districts with new rows change
+    new = new[new['district'] != 'Kollam']
+
+    full = district_data_hashes(pd.concat([old, new]))
+    assert add_data_hashes(district_data_hashes(old), new) == full
+    assert district_data_hashes(pd.concat([new, old]).iloc[::-1]) == full
+    changed = {k for k, h in district_data_hashes(old).items() if full[k] != h}
+    assert changed == {'Bihar|Patna', 'Bihar|Gaya'}
+
+
+def test_ingest_invalidates_only_changed_districts(tmp_path, district_days):
+    cache_dir = str(tmp_path / 'forecast_cache')
+    history = district_days(days=30, total_bio_updates=80)
+    old = history[history['date'] < '2025-01-20']
+    old_hashes = district_data_hashes(old)
+    assert invalidate_changed_districts(cache_dir, old_hashes) == []
+
+    cache = ForecastCache(cache_dir)
+    for key, data_hash in old_hashes.items():
+        state, district = key.split('|')
+        cache.put(state, district, 30, data_hash, _forecast(1))
+
+    new = history[(history['date'] >= '2025-01-20') & (history['district'] == 'Patna')]
+    new_hashes = add_data_hashes(load_data_hashes(cache_dir), new)
+    assert invalidate_changed_districts(cache_dir, new_hashes) == ['Bihar|Patna']
+    assert load_data_hashes(cache_dir) == new_hashes
+    assert len(os.listdir(cache_dir)) == 3  # two forecasts and the hashes
+
+    # Another worker only sees the unchanged districts on disk
+    other = ForecastCache(cache_dir)
+    assert other.get('Bihar', 'Patna', 30, old_hashes['Bihar|Patna']) is None
+    pd.testing.assert_frame_equal(other.get('Bihar', 'Gaya', 30, new_hashes['Bihar|Gaya']), _forecast(1))
+
+    calls = []
+    recomputed = other.get_or_compute('Bihar', 'Patna', 30, new_hashes['Bihar|Patna'],
+                                      lambda: calls.append(1) or _forecast(2))
+    pd.testing.assert_frame_equal(recomputed, _forecast(2))
+    assert other.get_or_compute('Bihar', 'Patna', 30, new_hashes['Bihar|Patna'], lambda: calls.append(1)) is recomputed
+    assert calls == [1]
+
+
+def test_memory_budget_evicts_least_recently_used():
+    entry = _forecast(0)
+    size = int(entry.memory_usage(deep=True).sum())
+    cache = ForecastCache(memory_budget=2 * size)
+
+    cache.put('Bihar', 'Patna', 30, 'a', entry)
+    cache.put('Bihar', 'Gaya', 30, 'a', entry)
+    assert cache.get('Bihar', 'Patna', 30, 'a') is entry
+    cache.put('Kerala', 'Kollam', 30, 'a', entry)
+
+    assert len(cache) == 2 and cache.nbytes == 2 * size
+    assert cache.get('Bihar', 'Gaya', 30, 'a') is None
+    assert cache.get('Bihar', 'Patna', 30, 'a') is entry
+    # Another horizon is another entry
+    assert cache.get('Bihar', 'Patna', 60, 'a') is None
+
+
+def test_disk_entries_are_keyed_on_model_version(tmp_path):
+    ForecastCache(str(tmp_path)).put('Bihar', 'Patna', 30, 'a', _forecast(1))
+    assert ForecastCache(str(tmp_path)).get('Bihar', 'Patna', 30, 'a') is not None
+    assert ForecastCache(str(tmp_path), model_version='other').get('Bihar', 'Patna', 30, 'a') is None
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from sklearn.linear_model import LinearRegression
+
+from src.models.forecasting import _fit_trends, forecast_demand, predict_biometric_demand
+
+
+def _trending(district_days, seed=0):
+    # A different trend per district, and a few missing days so the groups differ in size
+    df = district_days(days=90, seed=seed, total_bio_updates=40)
+    df['total_bio_updates'] += np.select([df['district'] == 'Patna', df['district'] == 'Gaya'],
+                                         [0.8, -0.2], 0.05) * np.repeat(np.arange(90), 3)
+    return df.drop(index=df.index[::7]).reset_index(drop=True)
+
+
+def _ols(group):
+    x = np.array([d.toordinal() for d in group['date']], dtype='float64').reshape(-1, 1)
+    y = group['total_bio_updates'].to_numpy(dtype='float64')
+    return LinearRegression().fit(x, y), x, y
+
+
+def test_grouped_fit_matches_linear_regression(district_days):
+    df = _trending(district_days)
+    fits = _fit_trends(df, ['state', 'district'], 'total_bio_updates').set_index('district')
+    for district, group in df.groupby('district'):
+        model, x, y = _ols(group)
+        fit = fits.loc[district]
+        assert fit['n'] == len(group)
+        assert fit['slope'] == pytest.approx(model.coef_[0], rel=1e-9)
+        assert fit['y_mean'] + fit['slope'] * (x[0, 0] - fit['x_mean']) == pytest.approx(model.predict(x[:1])[0], rel=1e-9)
+        assert fit['sse'] == pytest.approx(((y - model.predict(x)) ** 2).sum(), rel=1e-9)
+
+
+@pytest.mark.parametrize('interval', [0.8, 0.95])
+def test_forecast_and_interval_match_textbook_ols(district_days, interval):
+    df = _trending(district_days)
+    forecasts = forecast_demand(df, days_ahead=30, interval=interval)
+    assert len(forecasts) == 3 * 30
+    for district, group in df.groupby('district'):
+        model, x, y = _ols(group)
+        rows = forecasts[forecasts['district'] == district]
+        x0 = np.array([d.toordinal() for d in rows['date']], dtype='float64')
+        predicted = model.predict(x0.reshape(-1, 1))
+        n = len(y)
+        s = np.sqrt(((y - model.predict(x)) ** 2).sum() / (n - 2))
+        sxx = ((x[:, 0] - x[:, 0].mean()) ** 2).sum()
+        half_width = stats.t.ppf(0.5 + interval / 2, n - 2) * s * np.sqrt(1 + 1 / n + (x0 - x[:, 0].mean()) ** 2 / sxx)
+
+        np.testing.assert_allclose(rows['predicted_demand'], np.maximum(predicted, 0), rtol=1e-9)
+        np.testing.assert_allclose(rows['lower'], np.maximum(predicted - half_width, 0), rtol=1e-9)
+        np.testing.assert_allclose(rows['upper'], np.maximum(predicted + half_width, 0), rtol=1e-9)
+
+
+def test_short_and_flat_groups(district_days):
+    df = district_days(days=30, total_bio_updates=40)
+    # Gaya: fewer than MIN_POINTS rows; Kollam: every row on the same day (no trend)
+    df = df[~((df['district'] == 'Gaya') & (df['date'] > df['date'].min() + pd.Timedelta(days=4)))].copy()
+    df.loc[df['district'] == 'Kollam', 'date'] = pd.Timestamp('2025-01-15')
+
+    forecasts = forecast_demand(df, days_ahead=5)
+    assert sorted(forecasts['district'].unique()) == ['Kollam', 'Patna']
+    kollam = forecasts[forecasts['district'] == 'Kollam']
+    assert kollam['predicted_demand'].nunique() == 1
+    assert kollam['predicted_demand'].iloc[0] == pytest.approx(df.loc[df['district'] == 'Kollam', 'total_bio_updates'].mean())
+
+
+def test_single_district_view_matches_batch(district_days):
+    df = _trending(district_days)
+    _, results = predict_biometric_demand(df, 'Patna', days_ahead=10)
+    batch = forecast_demand(df[df['district'] == 'Patna'], days_ahead=10, keys=['district'])
+    pd.testing.assert_frame_equal(results, batch[['date', 'predicted_demand', 'lower', 'upper']].reset_index(drop=True))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.utils.geo_index import GeoIndex, district_index
+from src.utils.geo_utils import COORDS_TABLE, STATE_NAMES, haversine_km
+
+
+def _brute_force(lat, lon, points_lat, points_lon, radius_km):
+    dist = haversine_km(lat, lon, points_lat, points_lon)
+    inside = np.flatnonzero(dist <= radius_km)
+    order = np.argsort(dist[inside], kind='stable')
+    return inside[order], dist[inside][order]
+
+
+def test_district_index_covers_the_coordinate_table():
+    index = district_index()
+    assert index is district_index()
+    assert len(index) == len(COORDS_TABLE) - len(set(STATE_NAMES) & set(COORDS_TABLE.index))
+    assert not set(index.labels) & set(STATE_NAMES)
+    assert {'Patna', 'Gaya', 'Kollam', 'New Delhi'} <= set(index.labels)
+
+
+@pytest.mark.parametrize('center, radius_km, inside, outside', [
+    ('Patna', 100, {'Patna', 'Gaya'}, {'Bhagalpur', 'Kollam'}),
+    ('New Delhi', 30, {'Delhi', 'Central Delhi', 'Gurugram', 'Faridabad'}, {'Panipat', 'Chandigarh'}),
+])
+def test_districts_within_radius_match_haversine(center, radius_km, inside, outside):
+    index = district_index()
+    lat, lon = COORDS_TABLE.loc[center, ['lat', 'lon']]
+    indices, distances = index.within_radius(lat, lon, radius_km)
+
+    expected, expected_km = _brute_force(lat, lon, index.lat, index.lon, radius_km)
+    np.testing.assert_array_equal(indices[0], expected)
+    np.testing.assert_allclose(distances[0], expected_km, atol=1e-6)
+    found = set(index.labels[indices[0]])
+    assert inside <= found and not outside & found
+    assert index.count_within(lat, lon, radius_km)[0] == len(expected)
+
+    dist, idx = index.nearest(lat, lon, k=3)
+    np.testing.assert_array_equal(idx[0], expected[:3])
+    assert index.labels[idx[0, 0]] == center and dist[0, 0] == pytest.approx(0, abs=1e-6)
+
+
+def test_pincode_scale_queries_match_brute_force():
+    rng = np.random.default_rng(0)
+    # Pincode-like points across India, a few without coordinates
+    lat = rng.uniform(8, 35, 1500)
+    lon = rng.uniform(68, 97, 1500)
+    lat[::250] = np.nan
+    index = GeoIndex(lat, lon)
+    assert len(index) == 1500 - 6
+
+    q_lat = np.append(rng.uniform(8, 35, 40), np.nan)
+    q_lon = np.append(rng.uniform(68, 97, 40), 77.0)
+    indices, distances = index.within_radius(q_lat, q_lon, 100)
+    counts = index.count_within(q_lat, q_lon, 100)
+    dist, idx = index.nearest(q_lat, q_lon, k=5)
+
+    for i in range(40):
+        expected, expected_km = _brute_force(q_lat[i], q_lon[i], lat, lon, 100)
+        np.testing.assert_array_equal(indices[i], expected)
+        np.testing.assert_allclose(distances[i], expected_km, atol=1e-6)
+        assert counts[i] == len(expected)
+        all_km = haversine_km(q_lat[i], q_lon[i], lat, lon)
+        np.testing.assert_allclose(dist[i], np.sort(all_km[~np.isnan(all_km)])[:5], atol=1e-6)
+    # A query point without coordinates matches nothing
+    assert len(indices[40]) == 0 and counts[40] == 0 and idx[40, 0] == -1
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.utils.geo_utils import DISTRICT_COORDS, get_lat_lon, lookup_lat_lon
+
+ROWS = [
+    ('Patna', 'Bihar'),
+    ('Kollam', 'Kerala'),
+    # Spelling variant of a known district
+    ('East Champaran', 'Bihar'),
+    # Unknown districts: state center plus jitter
+    ('Nowhere Nagar', 'Bihar'),
+    ('Nowhere Nagar', 'Kerala'),
+    ('Atlantis', 'Kerala'),
+    # Neither district nor state known
+    ('Atlantis', 'Utopia'),
+    ('Atlantis', None),
+    (None, 'Bihar'),
+    ('Patna', 'Bihar'),
+]
+
+
+def _old_get_lat_lon(district_name, state_name=None):
+    # get_lat_lon before the bulk lookup: exact name, else the state center jittered by random.seed(district)
+    if district_name in DISTRICT_COORDS:
+        return DISTRICT_COORDS[district_name]
+    if state_name and state_name in DISTRICT_COORDS:
+        base = DISTRICT_COORDS[state_name]
+        state = random.getstate()
+        random.seed(district_name)
+        lat_jitter, lon_jitter = random.uniform(-0.5, 0.5), random.uniform(-0.5, 0.5)
+        random.setstate(state)
+        return {'lat': base['lat'] + lat_jitter, 'lon': base['lon'] + lon_jitter}
+    return None
+
+
+def _as_arrays(points):
+    return (np.array([p['lat'] if p else np.nan for p in points]),
+            np.array([p['lon'] if p else np.nan for p in points]))
+
+
+def test_bulk_lookup_matches_per_row_lookup():
+    districts, states = zip(*ROWS)
+    lat, lon = lookup_lat_lon(list(districts), list(states))
+    expected_lat, expected_lon = _as_arrays([get_lat_lon(d, s) for d, s in ROWS])
+    np.testing.assert_array_equal(lat, expected_lat)
+    np.testing.assert_array_equal(lon, expected_lon)
+
+
+def test_bulk_lookup_matches_the_old_jitter():
+    # Rows the old exact-or-state lookup handled give the same points; spelling variants now resolve instead
+    rows = [row for row in ROWS if row[0] not in ('East Champaran', None)]
+    districts, states = zip(*rows)
+    lat, lon = lookup_lat_lon(list(districts), list(states))
+    expected_lat, expected_lon = _as_arrays([_old_get_lat_lon(d, s) for d, s in rows])
+    np.testing.assert_allclose(lat, expected_lat, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(lon, expected_lon, rtol=0, atol=1e-12)
+
+    lat, _ = lookup_lat_lon(['East Champaran'], ['Bihar'])
+    assert lat[0] == DISTRICT_COORDS['Purbi Champaran']['lat']
+
+
+def test_missing_district_sits_at_the_state_center():
+    # random.seed(None) used to draw a fresh jitter on every call
+    center = DISTRICT_COORDS['Bihar']
+    lat, lon = lookup_lat_lon([None, np.nan], ['Bihar', 'Bihar'])
+    assert lat.tolist() == [center['lat']] * 2 and lon.tolist() == [center['lon']] * 2
+    assert get_lat_lon(None, 'Bihar') == center
+
+
+def test_lookup_without_states():
+    lat, lon = lookup_lat_lon(['Patna', 'Atlantis'])
+    assert (lat[0], lon[0]) == (DISTRICT_COORDS['Patna']['lat'], DISTRICT_COORDS['Patna']['lon'])
+    assert np.isnan(lat[1]) and np.isnan(lon[1])
+
+
+@pytest.mark.parametrize('lookup', [
+    lambda: lookup_lat_lon(['Nowhere Nagar', 'Atlantis'], ['Bihar', 'Kerala']),
+    lambda: get_lat_lon('Somewhere Else', 'Bihar'),
+])
+def test_global_random_state_is_untouched(lookup):
+    random.seed(1234)
+    before = random.getstate()
+    lookup()
+    assert random.getstate() == before
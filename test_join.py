@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.feature_engineering import MERGE_KEYS, create_master_table, iter_master_partitions
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS, empty_frame
+
+
+def _source(source, keys, categories=None, seed=0):
+    """Source frame with the given (date, state, district, pincode) keys; None is a missing value."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(keys, columns=MERGE_KEYS)
+    frame['date'] = pd.to_datetime(frame['date'])
+    for key in MERGE_KEYS[1:]:
+        cats = None if categories is None else categories.get(key)
+        frame[key] = pd.Categorical(frame[key], categories=cats)
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        frame[col] = rng.integers(0, 100, len(frame)).astype('int32')
+    return frame
+
+
+def _assert_same_master(datasets):
+    expected = create_master_table(datasets, engine='pandas')
+    actual = create_master_table(datasets, engine='sort_merge')
+    as_text = {key: object for key in MERGE_KEYS[1:]}
+    expected = expected.astype(as_text).reset_index(drop=True)
+    actual = actual.astype(as_text).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+ENROL_KEYS = [
+    ('2025-01-01', 'Bihar', 'Patna', '800001'),
+    ('2025-01-01', 'Bihar', 'Patna', '800001'),  # duplicate key
+    ('2025-01-02', 'Bihar', None, '800002'),
+    ('2025-01-02', 'Delhi', 'South Delhi', None),
+]
+BIO_KEYS = [
+    ('2025-01-01', 'Bihar', 'Patna', '800001'),
+    ('2025-01-02', 'Bihar', None, '800002'),
+    ('2025-01-03', 'Kerala', 'Kochi', '682001'),
+]
+DEMO_KEYS = [
+    ('2025-01-02', 'Delhi', 'South Delhi', None),
+    ('2025-01-03', 'Bihar', 'Gaya', '823001'),
+]
+
+
+def test_sort_merge_matches_pandas_with_null_keys_and_mismatched_categories():
+    _assert_same_master({
+        'enrolment': _source('enrolment', ENROL_KEYS),
+        'biometric': _source('biometric', BIO_KEYS, seed=1),
+        'demographic': _source('demographic', DEMO_KEYS, seed=2),
+    })
+
+
+def test_sort_merge_matches_pandas_with_shared_categories():
+    # Same categories everywhere: pandas merges on the codes and puts null keys first
+    categories = {
+        key: sorted({k[i] for k in ENROL_KEYS + BIO_KEYS + DEMO_KEYS if k[i] is not None})
+        for i, key in enumerate(MERGE_KEYS) if i > 0
+    }
+    _assert_same_master({
+        'enrolment': _source('enrolment', ENROL_KEYS, categories),
+        'biometric': _source('biometric', BIO_KEYS, categories, seed=1),
+        'demographic': _source('demographic', DEMO_KEYS, categories, seed=2),
+    })
+
+
+@pytest.mark.parametrize('empty', ['enrolment', 'biometric', 'demographic'])
+def test_sort_merge_matches_pandas_with_an_empty_source(empty):
+    datasets = {
+        'enrolment': _source('enrolment', ENROL_KEYS),
+        'biometric': _source('biometric', BIO_KEYS, seed=1),
+        'demographic': _source('demographic', DEMO_KEYS, seed=2),
+    }
+    datasets[empty] = empty_frame(empty)
+    _assert_same_master(datasets)
+
+
+def test_sort_merge_handles_null_only_keys_without_categories():
+    # An unmatched partition: every key column categorical with no categories, all rows null
+    null_keys = [('2025-01-01', None, None, None), ('2025-01-01', None, None, None)]
+    _assert_same_master({
+        'enrolment': _source('enrolment', null_keys),
+        'biometric': _source('biometric', null_keys, seed=1),
+        'demographic': empty_frame('demographic'),
+    })
+
+
+def test_sort_merge_partitions_match_pandas_partitions():
+    datasets = {
+        'enrolment': _source('enrolment', ENROL_KEYS),
+        'biometric': _source('biometric', BIO_KEYS, seed=1),
+        'demographic': _source('demographic', DEMO_KEYS, seed=2),
+    }
+    for partition_by in ('month', 'state'):
+        expected = list(iter_master_partitions(datasets, partition_by, engine='pandas'))
+        actual = list(iter_master_partitions(datasets, partition_by, engine='sort_merge'))
+        assert [label for label, _ in actual] == [label for label, _ in expected]
+        for (_, exp), (_, act) in zip(expected, actual):
+            as_text = {key: object for key in MERGE_KEYS[1:]}
+            pd.testing.assert_frame_equal(act.astype(as_text).reset_index(drop=True)[exp.columns],
+                                          exp.astype(as_text).reset_index(drop=True), check_dtype=False)
+
+
+NULL_DATE_KEYS = [
+    ('2025-01-01', 'Bihar', 'Patna', '800001'),
+    (None, 'Bihar', 'Patna', '800002'),
+    ('2025-02-01', None, 'Kochi', '682001'),
+    ('2025-01-05', 'Assam', None, '781001'),
+]
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'sort_merge'])
+def test_month_partitions_reproduce_the_full_merge_with_null_keys(engine):
+    datasets = {
+        'enrolment': _source('enrolment', NULL_DATE_KEYS),
+        'biometric': _source('biometric', BIO_KEYS + [(None, 'Delhi', 'South Delhi', '110001')], seed=1),
+        'demographic': _source('demographic', DEMO_KEYS, seed=2),
+    }
+    full = create_master_table(datasets, engine=engine)
+    partitioned = create_master_table(datasets, partition_by='month', engine=engine)
+    as_text = {key: object for key in MERGE_KEYS[1:]}
+    pd.testing.assert_frame_equal(partitioned.astype(as_text).reset_index(drop=True),
+                                  full.astype(as_text).reset_index(drop=True))
+
+
+def test_missing_state_partition_follows_the_merge_null_rule():
+    keys = [('2025-01-01', 'Bihar', 'Patna', '800001'), ('2025-01-01', None, 'Kochi', '682001')]
+    # Categories differ between sources: pd.merge puts null states last
+    datasets = {
+        'enrolment': _source('enrolment', keys),
+        'biometric': _source('biometric', [('2025-01-01', 'Delhi', 'South Delhi', '110001')], seed=1),
+        'demographic': _source('demographic', keys, seed=2),
+    }
+    labels = [label for label, _ in iter_master_partitions(datasets, 'state')]
+    assert labels == ['Bihar', 'Delhi', '']
+
+    # Same categories everywhere: null states come first
+    categories = {'state': ['Bihar', 'Delhi'], 'district': None, 'pincode': None}
+    datasets = {name: _source(name, keys, categories) for name in ('enrolment', 'biometric', 'demographic')}
+    labels = [label for label, _ in iter_master_partitions(datasets, 'state')]
+    assert labels == ['', 'Bihar']
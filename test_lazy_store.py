@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from src.analytics.demographic_update_analysis import analyze_demo_vs_enrolment, rank_districts_by_updates
+from src.analytics.enrolment_analysis import get_state_enrolment_stats
+from src.analytics.migration_analysis import identify_migration_corridors
+from src.metrics.stress_index import calculate_ausi
+from src.preprocessing.feature_engineering import aggregate_by_district, create_master_table
+from src.preprocessing.lazy_store import StoreFrame
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS
+from src.preprocessing.storage import read_master_store, write_master_store
+
+# Aurangabad exists in two states
+PLACES = [('Bihar', 'Patna', '800001'), ('Bihar', 'Aurangabad', '824101'), ('Maharashtra', 'Aurangabad', '431001'),
+          ('Maharashtra', 'Pune', '411001'), ('Kerala', 'Kollam', '691001')]
+
+
+def _source(source, days=40, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=days)
+    frame = pd.DataFrame([(d, s, di, p) for d in dates for s, di, p in PLACES],
+                         columns=['date', 'state', 'district', 'pincode'])
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        frame[col] = rng.poisson(20 if source == 'enrolment' else 60, len(frame)).astype('float64')
+    # Each source misses some keys, so the outer merge leaves NaN counts
+    return frame.sample(frac=0.85, random_state=seed).sort_values(['date', 'state', 'pincode']).reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    master = create_master_table({source: _source(source, seed=i) for i, source in enumerate(SOURCE_COUNT_COLUMNS)})
+    # A few rows without any enrolment or demographic counts at all
+    master.loc[master.index[:5], ['age_0_5', 'demo_age_5_17']] = np.nan
+    assert master[list(SOURCE_COUNT_COLUMNS['enrolment'])].isna().any().all()
+    path = str(tmp_path_factory.mktemp('store') / 'master_store')
+    write_master_store(master, path)
+    return path
+
+
+def _plain(df):
+    # Compare values, not category sets (DuckDB only knows the categories it returned)
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(str)
+    return df
+
+
+def _assert_same(lazy, eager):
+    pd.testing.assert_frame_equal(_plain(lazy), _plain(eager), check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize('analysis', [
+    lambda df: rank_districts_by_updates(df, top_n=3),
+    analyze_demo_vs_enrolment,
+    get_state_enrolment_stats,
+    lambda df: identify_migration_corridors(df, threshold_percentile=0.4),
+])
+def test_district_analytics_match_pandas(store, analysis):
+    eager = analysis(read_master_store(store))
+    lazy = analysis(StoreFrame(store))
+    assert len(eager) > 0
+    _assert_same(lazy, eager)
+
+
+def test_both_aurangabads_are_kept_apart(store):
+    ranked = rank_districts_by_updates(StoreFrame(store), top_n=10)
+    assert sorted(ranked.loc[ranked['district'] == 'Aurangabad', 'state'].astype(str)) == ['Bihar', 'Maharashtra']
+
+
+def test_filtered_frame_matches_filtered_store(store):
+    filters = {'start_date': '2025-01-10', 'end_date': '2025-01-25', 'states': ['Bihar']}
+    _assert_same(get_state_enrolment_stats(StoreFrame(store, **filters)),
+                 get_state_enrolment_stats(read_master_store(store, **filters)))
+
+
+def test_ausi_matches_pandas(store):
+    eager = calculate_ausi(aggregate_by_district(read_master_store(store)))
+    lazy = calculate_ausi(aggregate_by_district(StoreFrame(store))).to_pandas()
+    keys = ['date', 'state', 'district']
+    eager = eager.sort_values(keys).reset_index(drop=True)
+    columns = keys + ['total_enrolment', 'total_updates', 'cumulative_base', 'ausi_daily', 'ausi_smooth', 'ausi_score']
+    _assert_same(lazy[columns], eager[columns])
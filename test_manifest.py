@@ -0,0 +1,53 @@
+import os
+
+from src.preprocessing.manifest import find_new_files, load_manifest, record_files, save_manifest
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+    return str(path)
+
+
+def test_new_files_are_found_until_recorded(tmp_path):
+    a = _write(tmp_path / 'a.csv', 'date,pincode\n01-01-2025,800001\n')
+    b = _write(tmp_path / 'b.csv', 'date,pincode\n02-01-2025,800001\n')
+    manifest = load_manifest(str(tmp_path / 'manifest.json'))
+    assert find_new_files(manifest, [a, b]) == [a, b]
+
+    record_files(manifest, [a])
+    assert find_new_files(manifest, [a, b]) == [b]
+    entry = manifest['files'][os.path.abspath(a)]
+    assert set(entry) == {'size', 'mtime', 'sha256', 'ingested_at'}
+
+
+def test_touched_file_is_not_reingested(tmp_path):
+    a = _write(tmp_path / 'a.csv', 'date,pincode\n01-01-2025,800001\n')
+    manifest = record_files({'files': {}}, [a])
+    stat = os.stat(a)
+    os.utime(a, (stat.st_atime, stat.st_mtime + 60))
+
+    assert find_new_files(manifest, [a]) == []
+    # The stored mtime is refreshed, so the next run skips the hash as well
+    assert manifest['files'][os.path.abspath(a)]['mtime'] == os.stat(a).st_mtime
+
+
+def test_changed_content_is_reingested(tmp_path):
+    a = _write(tmp_path / 'a.csv', 'date,pincode\n01-01-2025,800001\n')
+    manifest = record_files({'files': {}}, [a])
+    stat = os.stat(a)
+    # Same size, same mtime: only a size/mtime change triggers the content check
+    _write(a, 'date,pincode\n01-01-2025,800002\n')
+    os.utime(a, (stat.st_atime, stat.st_mtime))
+    assert find_new_files(manifest, [a]) == []
+
+    os.utime(a, (stat.st_atime, stat.st_mtime + 60))
+    assert find_new_files(manifest, [a]) == [a]
+
+
+def test_manifest_round_trip(tmp_path):
+    a = _write(tmp_path / 'a.csv', 'date,pincode\n01-01-2025,800001\n')
+    path = str(tmp_path / 'manifest.json')
+    save_manifest(record_files({'files': {}}, [a]), path)
+    assert find_new_files(load_manifest(path), [a]) == []
+    assert not os.path.exists(path + '.tmp')
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from src.utils import name_resolver
+from src.utils.name_resolver import load_resolver_cache, normalize_name, resolve_district, save_resolver_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    # Every test starts from (and leaves behind) its own in-memory cache
+    monkeypatch.setattr(name_resolver, '_CACHE', {})
+
+
+@pytest.mark.parametrize('district, state, expected', [
+    ('Cooch Behar', 'West Bengal', 'Coochbehar'),
+    ('COOCH-BEHAR', 'West Bengal', 'Coochbehar'),
+    ('Coochbehar', None, 'Coochbehar'),
+    ('Purbi Champaran', 'Bihar', 'Purbi Champaran'),
+    ('East Champaran', 'Bihar', 'Purbi Champaran'),
+    ('Tumkur', 'Karnataka', 'Tumakuru'),
+    ('Bangalore Urban', 'Karnataka', 'Bengaluru Urban'),
+    ('Gurgaon', 'Haryana', 'Gurugram'),
+    # One letter off: trigram match
+    ('Kolam', 'Kerala', 'Kollam'),
+])
+def test_spelling_variants(district, state, expected):
+    assert resolve_district(district, state) == expected
+
+
+def test_aliases_normalize_alike():
+    assert normalize_name('Purbi Champaran') == normalize_name('East  Champaran.') == 'east champaran'
+    assert normalize_name('Patna District') == 'patna'
+    assert normalize_name(None) == ''
+
+
+def test_sibling_prefix_is_not_a_match():
+    # 'Kanpur' also starts 'Kanpur Nagar', so 'Kanpur Dehat' is a different district, not a spelling of 'Kanpur'
+    assert resolve_district('Kanpur Nagar', 'Uttar Pradesh') == 'Kanpur Nagar'
+    assert resolve_district('Kanpur', 'Uttar Pradesh') == 'Kanpur'
+    assert resolve_district('Kanpur Dehat', 'Uttar Pradesh') is None
+
+
+def test_match_in_another_state_is_rejected():
+    # Kollam is in Kerala, well over MAX_STATE_DISTANCE_KM from Punjab
+    assert resolve_district('Kollam', 'Kerala') == 'Kollam'
+    assert resolve_district('Kollam', 'Punjab') is None
+    assert resolve_district('Kolam', 'Punjab') is None
+
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.json')
+    assert resolve_district('Cooch Behar', 'West Bengal') == 'Coochbehar'
+    assert resolve_district('Kanpur Dehat', 'Uttar Pradesh') is None
+    save_resolver_cache(path)
+
+    # Only hits are persisted, so misses are looked up again once coordinates exist
+    with open(path, encoding='utf-8') as fh:
+        assert json.load(fh) == {'West Bengal|Cooch Behar': 'Coochbehar'}
+
+    monkeypatch.setattr(name_resolver, '_CACHE', {})
+    monkeypatch.setattr(name_resolver, '_match', lambda district, state: pytest.fail('cache hit expected'))
+    load_resolver_cache(path)
+    assert resolve_district('Cooch Behar', 'West Bengal') == 'Coochbehar'
+
+
+def test_unresolved_entries_of_old_caches_are_retried(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_text(json.dumps({'West Bengal|Cooch Behar': None, 'Bihar|East Champaran': 'Purbi Champaran'}))
+    assert load_resolver_cache(str(path)) == {'Bihar|East Champaran': 'Purbi Champaran'}
+    assert resolve_district('Cooch Behar', 'West Bengal') == 'Coochbehar'
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from src.models.online_anomaly import load_online_state, new_online_state, save_online_state, score_online
+
+
+def _with_spike(frame):
+    # A spike on Patna's 40th day
+    frame.loc[(frame['district'] == 'Patna') & (frame['date'] == '2025-02-09'), 'total_bio_updates'] = 2000
+    frame['total_updates'] = frame['total_bio_updates'] + frame['total_demo_updates']
+    return frame
+
+
+FLAG_COLUMNS = ['anomaly_z', 'is_anomaly', 'anomaly_score', 'high_volume_spike', 'suspicious_bio_ratio']
+
+
+def test_day_by_day_matches_one_pass(tmp_path, district_days):
+    frame = _with_spike(district_days(total_enrolment=50, total_bio_updates=80, total_demo_updates=30))
+    one_pass_state = new_online_state()
+    one_pass = score_online(one_pass_state, frame)
+
+    path = str(tmp_path / 'online_state.json')
+    save_online_state(new_online_state(), path)
+    daily = []
+    for _, day in frame.groupby('date'):
+        # Each ingest resumes from the state the previous one saved
+        state = load_online_state(path)
+        daily.append(score_online(state, day))
+        save_online_state(state, path)
+    streamed = pd.concat(daily, ignore_index=True)
+
+    keys = ['date', 'state', 'district']
+    one_pass = one_pass.sort_values(keys).reset_index(drop=True)
+    streamed = streamed.sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(streamed[FLAG_COLUMNS], one_pass[FLAG_COLUMNS])
+
+    final = load_online_state(path)
+    assert final['last_date'] == one_pass_state['last_date']
+    for key, stats in one_pass_state['series'].items():
+        assert final['series'][key]['n'] == stats['n']
+        np.testing.assert_allclose(final['series'][key]['mean'], stats['mean'], rtol=1e-12)
+        np.testing.assert_allclose(final['series'][key]['var'], stats['var'], rtol=1e-12)
+
+
+def test_spike_is_flagged_on_its_day(district_days):
+    frame = _with_spike(district_days(total_enrolment=50, total_bio_updates=80, total_demo_updates=30))
+    scored = score_online(new_online_state(), frame)
+    flagged = scored[scored['is_anomaly']]
+    assert len(flagged) == 1
+    assert flagged[['date', 'district']].iloc[0].tolist() == [pd.Timestamp('2025-02-09'), 'Patna']
+    assert flagged['high_volume_spike'].iloc[0] and flagged['suspicious_bio_ratio'].iloc[0]
+    assert (flagged['anomaly_score'] == -1).all() and (scored.loc[~scored['is_anomaly'], 'anomaly_score'] == 1).all()
@@ -0,0 +1,111 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import run_pipeline
+from src.preprocessing.cube import load_cube
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS
+from src.preprocessing.shared_store import SNAPSHOT_NAME, open_snapshot
+
+PLACES = [('Bihar', 'Patna', '800001'), ('Bihar', 'Patna', '800002'), ('Bihar', 'Gaya', '823001'),
+          ('Kerala', 'Kollam', '691001'), ('Uttar Pradesh', 'Lucknow', '226001')]
+
+# Derived outputs that must not depend on how the store was built
+OUTPUT_FILES = ['cohort_monthly.parquet', 'cohort_forecasts.parquet', 'demand_forecasts.parquet',
+                'pincode_totals.parquet']
+
+
+def _write_month(raw_dir, source, month, seed, counts_seed=None):
+    """One raw split file per source and month, with a few pincodes missing per day."""
+    rng = np.random.default_rng(seed if counts_seed is None else counts_seed)
+    rows = [(d.strftime('%d-%m-%Y'), s, di, p) for d in pd.date_range(month, periods=pd.Timestamp(month).days_in_month)
+            for s, di, p in PLACES]
+    frame = pd.DataFrame(rows, columns=['date', 'state', 'district', 'pincode'])
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        frame[col] = rng.poisson(30, len(frame))
+    frame = frame.sample(frac=0.9, random_state=seed).sort_index()
+    path = raw_dir / source / f"{month}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def _raw_files(raw_dir, months, seed=0):
+    return {source: [_write_month(raw_dir, source, month, seed + 10 * i + j) for j, month in enumerate(months)]
+            for i, source in enumerate(SOURCE_COUNT_COLUMNS)}
+
+
+def _run(source_files, processed_dir, *flags):
+    run_pipeline.run(run_pipeline.parse_args(list(flags)), source_files, str(processed_dir))
+
+
+def _plain(df, keys):
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
+            df[col] = df[col].astype(str)
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def _assert_same_outputs(incremental_dir, full_dir):
+    inc = open_snapshot(os.path.join(incremental_dir, SNAPSHOT_NAME))
+    full = open_snapshot(os.path.join(full_dir, SNAPSHOT_NAME))
+    for name, keys in (('raw_master', ['date', 'state', 'district', 'pincode']), ('duplicates', ['date', 'pincode']),
+                       ('dist_df', ['date', 'state', 'district'])):
+        # The anomaly model and the ausi_score normalization depend on when they were fitted
+        columns = [c for c in full[name].columns if c not in run_pipeline.ANOMALY_COLUMNS + ['ausi_score']]
+        pd.testing.assert_frame_equal(_plain(inc[name][columns], keys), _plain(full[name][columns], keys),
+                                      check_dtype=False, rtol=1e-9)
+
+    for name in OUTPUT_FILES:
+        a, b = pd.read_parquet(os.path.join(incremental_dir, name)), pd.read_parquet(os.path.join(full_dir, name))
+        keys = [c for c in ('state', 'district', 'pincode', 'month', 'date') if c in b.columns]
+        pd.testing.assert_frame_equal(_plain(a, keys), _plain(b[a.columns], keys), check_dtype=False, rtol=1e-9)
+
+    cube_inc, cube_full = load_cube(os.path.join(incremental_dir, 'aggregate_cube')), load_cube(os.path.join(full_dir, 'aggregate_cube'))
+    for key, table in cube_full.items():
+        columns = [c for c in table.columns if c != 'ausi_score']
+        keys = [c for c in ('date', 'state', 'district') if c in table.columns]
+        pd.testing.assert_frame_equal(_plain(cube_inc[key][columns], keys), _plain(table[columns], keys),
+                                      check_dtype=False, rtol=1e-9)
+
+
+def _ingested(processed_dir):
+    with open(os.path.join(processed_dir, 'ingest_manifest.json'), encoding='utf-8') as fh:
+        return sorted(json.load(fh)['files'])
+
+
+@pytest.mark.parametrize('change', ['append', 'correct'])
+def test_incremental_run_matches_full_rebuild(tmp_path, change):
+    raw = tmp_path / 'raw'
+    files = _raw_files(raw, ['2025-01-01', '2025-02-01', '2025-03-01'])
+    _run(files, tmp_path / 'incremental')
+
+    if change == 'append':
+        # A new month lands for every source
+        files = _raw_files(raw, ['2025-01-01', '2025-02-01', '2025-03-01', '2025-04-01'])
+    else:
+        # February's biometric file is delivered again with corrected counts for the same keys
+        # (keys a correction drops keep their stored values, see upsert_master_store)
+        _write_month(raw, 'biometric', '2025-02-01', seed=11, counts_seed=99)
+    _run(files, tmp_path / 'incremental')
+    _run(files, tmp_path / 'full', '--full-rebuild')
+
+    _assert_same_outputs(str(tmp_path / 'incremental'), str(tmp_path / 'full'))
+    assert _ingested(tmp_path / 'incremental') == _ingested(tmp_path / 'full')
+
+
+def test_nothing_new_leaves_the_outputs_alone(tmp_path, capsys):
+    files = _raw_files(tmp_path / 'raw', ['2025-01-01'])
+    _run(files, tmp_path / 'processed')
+    snapshot = os.path.join(tmp_path, 'processed', SNAPSHOT_NAME)
+    published = sorted(os.listdir(snapshot))
+
+    # Touching a file without changing it is not a new file
+    os.utime(files['enrolment'][0], (0, 0))
+    _run(files, tmp_path / 'processed')
+    assert 'Processed store is up to date' in capsys.readouterr().out
+    assert sorted(os.listdir(snapshot)) == published
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.migration_analysis import classify_growth_patterns
+from src.models.clustering import FALLBACK_RULES
+from src.preprocessing.feature_engineering import add_total_columns
+from src.utils.rules import apply_rules, compile_rules
+
+
+def _fallback_row(row):
+    # The if/elif the clustering fallback used to apply per row
+    if row['ausi_score'] > 60 or row['total_updates'] > 10000:
+        return 'New Center Required'
+    elif row['ausi_score'] > 30:
+        return 'Mobile Van Required'
+    return 'Monitor'
+
+
+def test_fallback_rules_match_if_elif():
+    # Every combination of boundary values, NaN included
+    scores = [np.nan, 0, 30, 30.5, 60, 60.5, 100]
+    updates = [np.nan, 0, 10000, 10001]
+    df = pd.DataFrame(list(itertools.product(scores, updates)), columns=['ausi_score', 'total_updates'])
+    labels = apply_rules(df, FALLBACK_RULES, default='Monitor')
+    assert labels.tolist() == df.apply(_fallback_row, axis=1).tolist()
+    assert set(labels) == {'Monitor', 'Mobile Van Required', 'New Center Required'}
+
+
+def test_growth_quadrants_match_row_function(district_days):
+    df = district_days(days=20, age_0_5=20, age_5_17=20, age_18_greater=20,
+                       demo_age_5_17=20, demo_age_17_=20, bio_age_5_17=20, bio_age_17_=20)
+    df = pd.concat([df, df.assign(district=df['district'] + ' II', age_0_5=df['age_0_5'] * 2)], ignore_index=True)
+    df = add_total_columns(df)
+    summary = classify_growth_patterns(df)
+
+    flux_median = summary['migration_flux'].median()
+    growth_median = summary['organic_growth_rate'].median()
+
+    def get_category(row):
+        high_flux = row['migration_flux'] > flux_median
+        high_growth = row['organic_growth_rate'] > growth_median
+        if high_flux and high_growth:
+            return "Urban Boom (High Flow + High Births)"
+        elif high_flux and not high_growth:
+            return "Migration Hub (Inflow Dominant)"
+        elif not high_flux and high_growth:
+            return "Organic Growth (Birth Dominant)"
+        else:
+            return "Stable / Stagnant"
+
+    assert summary['growth_category'].nunique() > 1
+    assert summary['growth_category'].tolist() == summary.apply(get_category, axis=1).tolist()
+
+
+def test_first_matching_rule_wins():
+    df = pd.DataFrame({'a': [5, 5, 1, np.nan], 'b': [5, 0, 0, 9]})
+    rules = [('both', [('a', '>=', 5), ('b', '>', 1)]), ('a', [('a', '==', 5)]), ('any', [('a', '<', 2), ('b', '>', 8)], 'any')]
+    assert apply_rules(df, rules, default='none').tolist() == ['both', 'a', 'any', 'any']
+    # A rule without terms always matches
+    assert apply_rules(df, [('all', [])], default='none').tolist() == ['all'] * 4
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError, match='how must be'):
+        compile_rules([('x', [('a', '>', 1)], 'either')], default='y')
+    with pytest.raises(ValueError, match='Unknown rule operator'):
+        apply_rules(pd.DataFrame({'a': [1]}), [('x', [('a', '=>', 1)])], default='y')
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.data_loader import load_dataset
+from src.preprocessing.schema import (
+    COUNT_DTYPE, empty_frame, enforce_schema, non_whole_counts, parse_dates_cached, read_dtypes
+)
+
+HEADER = 'date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n'
+
+
+def _csv(tmp_path, rows, name='enrolment.csv'):
+    path = tmp_path / name
+    path.write_text(HEADER + ''.join(row + '\n' for row in rows))
+    return str(path)
+
+
+def test_whole_counts_are_int32_and_keys_categorical(tmp_path):
+    df = load_dataset(_csv(tmp_path, ['01-03-2025,Bihar,Patna,800001,1,2,3', '02-03-2025,Bihar,Gaya,823001,4,5,6']),
+                      source='enrolment')
+    assert all(df[col].dtype == COUNT_DTYPE for col in ('age_0_5', 'age_5_17', 'age_18_greater'))
+    assert all(isinstance(df[col].dtype, pd.CategoricalDtype) for col in ('state', 'district', 'pincode'))
+    # Pincodes are text even when they look numeric
+    assert list(df['pincode'].cat.categories) == ['800001', '823001']
+    assert df['date'].tolist() == [pd.Timestamp('2025-03-01'), pd.Timestamp('2025-03-02')]
+
+
+def test_blank_count_reads_as_nan(tmp_path):
+    df = load_dataset(_csv(tmp_path, ['01-03-2025,Bihar,Patna,800001,,2,3']), source='enrolment')
+    assert df['age_0_5'].dtype == 'float64' and np.isnan(df['age_0_5'].iloc[0])
+    assert df['age_5_17'].dtype == COUNT_DTYPE
+
+
+def test_fractional_count_keeps_the_file_and_is_reported(tmp_path, capsys):
+    rows = ['01-03-2025,Bihar,Patna,800001,1,2,3', '01-03-2025,Bihar,Gaya,823001,2.5,2,3']
+    path = _csv(tmp_path, rows)
+    df = load_dataset(path, source='enrolment')
+
+    assert len(df) == 2
+    assert df['age_0_5'].dtype == 'float64' and df['age_0_5'].tolist() == [1.0, 2.5]
+    assert df['age_5_17'].dtype == COUNT_DTYPE
+    out = capsys.readouterr().out
+    assert path in out and "'age_0_5'" in out and 'lines 3' in out
+    # Same values as reading the file without a declared schema
+    pd.testing.assert_series_equal(df['age_0_5'], pd.read_csv(path)['age_0_5'])
+
+
+def test_non_whole_counts_lists_the_rows():
+    df = pd.DataFrame({'age_0_5': [1.0, 0.5, np.nan, 3.25], 'age_5_17': [1.0, 2.0, 3.0, 4.0]})
+    found = non_whole_counts(df, 'enrolment')
+    assert list(found) == ['age_0_5'] and list(found['age_0_5']) == [1, 3]
+
+
+def test_enforce_schema_restores_types_after_concat():
+    a = enforce_schema(pd.DataFrame({'state': pd.Categorical(['Bihar']), 'district': pd.Categorical(['Patna']),
+                                     'pincode': pd.Categorical(['800001']), 'bio_age_5_17': [1.0],
+                                     'bio_age_17_': [2.0]}), 'biometric')
+    b = a.assign(state=pd.Categorical(['Kerala']), pincode=pd.Categorical(['691001']))
+    merged = enforce_schema(pd.concat([a, b], ignore_index=True), 'biometric')
+    assert isinstance(merged['state'].dtype, pd.CategoricalDtype)
+    assert merged['bio_age_5_17'].dtype == COUNT_DTYPE
+    assert list(merged.dtypes) == list(enforce_schema(pd.concat([empty_frame('biometric').drop(columns='date'), merged]),
+                                                      'biometric').dtypes)
+
+
+def test_parse_dates_cached_matches_to_datetime():
+    raw = pd.Series(['01-03-2025', '02-03-2025', None, 'bad', '01-03-2025'], dtype='category')
+    expected = pd.to_datetime(raw.astype(object), format='%d-%m-%Y', errors='coerce')
+    pd.testing.assert_series_equal(parse_dates_cached(raw), expected, check_dtype=False)
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError):
+        read_dtypes('payments')
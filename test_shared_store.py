@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.preprocessing.shared_store import (SNAPSHOT_MANIFEST, open_snapshot, publish_frames, snapshot_version)
+
+
+def _master(district_days, days, start='2025-01-01', seed=0):
+    df = district_days(days=days, start=start, seed=seed, total_updates=30)
+    for key in ('state', 'district'):
+        df[key] = df[key].astype('category')
+    return df
+
+
+def _arrow_files(snapshot_dir):
+    return sorted(name for name in os.listdir(snapshot_dir) if name.endswith('.arrow'))
+
+
+def test_publish_and_open(district_days, tmp_path):
+    snapshot_dir = str(tmp_path / 'snapshot')
+    assert open_snapshot(snapshot_dir) is None
+    assert snapshot_version(snapshot_dir) is None
+
+    first, second = _master(district_days, 20), _master(district_days, 20, start='2025-01-21', seed=1)
+    # Kollam only appears in the second chunk's categories
+    first = first[first['district'] != 'Kollam']
+    first['district'] = first['district'].cat.remove_unused_categories()
+    version = publish_frames({'raw_master': iter([first, second]), 'dist_df': second}, snapshot_dir)
+
+    assert snapshot_version(snapshot_dir) == version
+    frames = open_snapshot(snapshot_dir)
+    assert sorted(frames) == ['dist_df', 'raw_master']
+    expected = pd.concat([first, second], ignore_index=True)
+    for key in ('state', 'district'):
+        assert isinstance(frames['raw_master'][key].dtype, pd.CategoricalDtype)
+        expected[key] = expected[key].astype(str)
+        frames['raw_master'][key] = frames['raw_master'][key].astype(str)
+    pd.testing.assert_frame_equal(frames['raw_master'], expected, check_dtype=False)
+    pd.testing.assert_frame_equal(frames['dist_df'], second.reset_index(drop=True))
+
+    # Numeric columns are read-only views of the mapped file
+    assert not frames['dist_df']['total_updates'].to_numpy().flags.writeable
+
+
+def test_swap_reopen_and_prune(district_days, tmp_path):
+    snapshot_dir = str(tmp_path / 'snapshot')
+    old = _master(district_days, 10)
+    old_version = publish_frames({'dist_df': old}, snapshot_dir)
+    old_frames = open_snapshot(snapshot_dir)
+    old_files = _arrow_files(snapshot_dir)
+
+    new = _master(district_days, 15, seed=1)
+    new_version = publish_frames({'dist_df': new}, snapshot_dir)
+    assert new_version > old_version
+    assert snapshot_version(snapshot_dir) == new_version
+
+    # Only the new version's files are left, and no temp files
+    files = _arrow_files(snapshot_dir)
+    assert files == [f"dist_df-{new_version}.arrow"]
+    assert not set(files) & set(old_files)
+    assert not [name for name in os.listdir(snapshot_dir) if name.endswith('.tmp')]
+
+    # A reader that mapped the old version keeps its pages until it reopens
+    assert old_frames['dist_df']['total_updates'].sum() == old['total_updates'].sum()
+    reopened = open_snapshot(snapshot_dir)
+    assert len(reopened['dist_df']) == len(new)
+    np.testing.assert_array_equal(reopened['dist_df']['total_updates'].to_numpy(), new['total_updates'].to_numpy())
+
+
+def test_missing_file_of_the_current_version(district_days, tmp_path):
+    snapshot_dir = str(tmp_path / 'snapshot')
+    version = publish_frames({'dist_df': _master(district_days, 5)}, snapshot_dir)
+    os.remove(os.path.join(snapshot_dir, f"dist_df-{version}.arrow"))
+    # The manifest was not swapped in the meantime: nothing to fall back to
+    assert os.path.exists(os.path.join(snapshot_dir, SNAPSHOT_MANIFEST))
+    assert open_snapshot(snapshot_dir) is None
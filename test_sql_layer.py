@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from src.metrics.stress_index import calculate_ausi
+from src.preprocessing.feature_engineering import aggregate_by_district, create_master_table
+from src.preprocessing.integrity import INTEGRITY_NAME, SourceKeyLedger
+from src.preprocessing.schema import SOURCE_COUNT_COLUMNS
+from src.preprocessing.sql_layer import (DISTRICT_AUSI_VIEW, DISTRICT_DAILY_VIEW, MASTER_VIEW, SOURCE_DUPLICATES_VIEW,
+                                         SqlLayer)
+from src.preprocessing.storage import MASTER_STORE_NAME, read_master_store, write_master_store
+
+PLACES = [('Bihar', 'Patna', '800001'), ('Bihar', 'Gaya', '823001'), ('Kerala', 'Kollam', '691001')]
+
+
+def _source(source, seed, days=30):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame([(d, s, di, p) for d in pd.date_range('2025-01-01', periods=days) for s, di, p in PLACES],
+                         columns=['date', 'state', 'district', 'pincode'])
+    for col in SOURCE_COUNT_COLUMNS[source]:
+        frame[col] = rng.poisson(30, len(frame)).astype('float64')
+    return frame.sample(frac=0.9, random_state=seed).reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def processed_dir(tmp_path_factory):
+    processed = tmp_path_factory.mktemp('processed')
+    datasets = {source: _source(source, seed=i) for i, source in enumerate(SOURCE_COUNT_COLUMNS)}
+    write_master_store(create_master_table(datasets), str(processed / MASTER_STORE_NAME))
+
+    # The enrolment file is delivered twice under two names
+    ledger = SourceKeyLedger()
+    ledger.add_file('enrolment', '/raw/enrolment_a.csv', datasets['enrolment'])
+    ledger.add_file('enrolment', '/raw/enrolment_b.csv', datasets['enrolment'].head(5))
+    ledger.save(str(processed / INTEGRITY_NAME))
+    return str(processed)
+
+
+@pytest.fixture(scope='module')
+def layer(processed_dir):
+    layer = SqlLayer(processed_dir)
+    yield layer
+    layer.close()
+
+
+def _sorted(df, keys):
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
+            df[col] = df[col].astype(str)
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def test_views_are_registered(layer, processed_dir):
+    assert layer.views == [MASTER_VIEW, DISTRICT_DAILY_VIEW, DISTRICT_AUSI_VIEW, SOURCE_DUPLICATES_VIEW]
+    assert layer.query(f"SELECT COUNT(*) AS n FROM {MASTER_VIEW}")['n'].iloc[0] == len(
+        read_master_store(os.path.join(processed_dir, MASTER_STORE_NAME)))
+    duplicates = layer.query(f"SELECT file, first_file, scope FROM {SOURCE_DUPLICATES_VIEW}")
+    assert len(duplicates) == 5
+    assert set(duplicates['file']) == {'enrolment_b.csv'}
+    assert set(duplicates['first_file']) == {'enrolment_a.csv'}
+
+
+def test_source_duplicates_view_needs_a_report(tmp_path):
+    datasets = {source: _source(source, seed=i) for i, source in enumerate(SOURCE_COUNT_COLUMNS)}
+    write_master_store(create_master_table(datasets), str(tmp_path / MASTER_STORE_NAME))
+    layer = SqlLayer(str(tmp_path))
+    try:
+        assert layer.views == [MASTER_VIEW, DISTRICT_DAILY_VIEW, DISTRICT_AUSI_VIEW]
+    finally:
+        layer.close()
+
+
+def test_district_daily_matches_aggregate_by_district(layer, processed_dir):
+    keys = ['date', 'state', 'district']
+    eager = aggregate_by_district(read_master_store(os.path.join(processed_dir, MASTER_STORE_NAME)))
+    lazy = layer.query(f"SELECT * FROM {DISTRICT_DAILY_VIEW}")
+    pd.testing.assert_frame_equal(_sorted(lazy, keys)[list(eager.columns)], _sorted(eager, keys),
+                                  check_dtype=False, rtol=1e-9)
+
+
+def test_district_ausi_matches_calculate_ausi(layer, processed_dir):
+    keys = ['date', 'state', 'district']
+    eager = calculate_ausi(aggregate_by_district(read_master_store(os.path.join(processed_dir, MASTER_STORE_NAME))))
+    lazy = layer.query(f"SELECT * FROM {DISTRICT_AUSI_VIEW}")
+    columns = keys + ['total_enrolment', 'total_updates', 'cumulative_base', 'ausi_daily', 'ausi_smooth', 'ausi_score']
+    pd.testing.assert_frame_equal(_sorted(lazy, keys)[columns], _sorted(eager, keys)[columns],
+                                  check_dtype=False, rtol=1e-9)
+
+
+def test_query_binds_named_and_positional_params(layer):
+    named = layer.query(f"SELECT COUNT(*) AS n FROM {MASTER_VIEW} WHERE state = $state AND date >= $start",
+                        {'state': 'Bihar', 'start': pd.Timestamp('2025-01-15')})
+    positional = layer.query(f"SELECT COUNT(*) AS n FROM {MASTER_VIEW} WHERE state = $1 AND date >= $2",
+                             ['Bihar', pd.Timestamp('2025-01-15')])
+    expected = layer.query(f"SELECT COUNT(*) AS n FROM {MASTER_VIEW} "
+                           "WHERE state = 'Bihar' AND date >= TIMESTAMP '2025-01-15'")
+    assert named['n'].iloc[0] == positional['n'].iloc[0] == expected['n'].iloc[0] > 0
+
+    # Values are bound, never spliced into the SQL text
+    assert layer.query(f"SELECT COUNT(*) AS n FROM {MASTER_VIEW} WHERE state = $state",
+                       {'state': "Bihar' OR '1'='1"})['n'].iloc[0] == 0
+    bound = layer.query("SELECT $a IS NULL AS a_null, isnan($b) AS b_nan", {'a': None, 'b': float('nan')})
+    assert bound['a_null'].iloc[0] and bound['b_nan'].iloc[0]
+
+
+def test_frame_filters(layer, processed_dir):
+    filters = {'start_date': '2025-01-10', 'end_date': '2025-01-20', 'states': ['Bihar'], 'districts': 'Gaya'}
+    keys = ['date', 'pincode']
+    eager = read_master_store(os.path.join(processed_dir, MASTER_STORE_NAME), **filters)
+    lazy = layer.frame(MASTER_VIEW, **filters).to_pandas()
+    assert len(eager) > 0
+    pd.testing.assert_frame_equal(_sorted(lazy, keys)[list(eager.columns)], _sorted(eager, keys), check_dtype=False)
+
+    daily = layer.frame(DISTRICT_DAILY_VIEW, states='Kerala').to_pandas()
+    assert set(daily['district'].astype(str)) == {'Kollam'}
@@ -8,22 +8,18 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from src.metrics import stress_index
 from src.models import anomaly_detection, clustering, forecasting
 from src.analytics import migration_analysis
+from src.preprocessing.storage import load_master_table
 
 def main():
     print("Running Full Source Test...")
     
     # 1. Load Data
-    data_path = os.path.join('data', 'processed', 'merged_master_table.csv')
-    if not os.path.exists(data_path):
-        print(f"Error: Processed data not found at {data_path}. Please run run_pipeline.py first.")
+    processed_dir = os.path.join('data', 'processed')
+    print(f"Loading data from {processed_dir}...")
+    df = load_master_table(processed_dir)
+    if df is None:
+        print(f"Error: Processed data not found in {processed_dir}. Please run run_pipeline.py first.")
         return
-
-    print(f"Loading data from {data_path}...")
-    df = pd.read_csv(data_path)
-    
-    # Ensure date is datetime
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
     
     # 2. Test Stress Index (AUSI)
     print("\n--- Testing Metrics: AUSI ---")
@@ -76,6 +72,18 @@ def main():
     except Exception as e:
         print(f"FAILED Forecasting: {e}")
 
+    # 7. Test the out-of-core backend against the in-memory results
+    print("\n--- Testing Out-of-Core Backend (DuckDB) ---")
+    try:
+        from src.preprocessing.lazy_store import StoreFrame
+        from src.analytics.demographic_update_analysis import rank_districts_by_updates
+        store = StoreFrame(os.path.join(processed_dir, 'master_store'))
+        lazy = rank_districts_by_updates(store)
+        eager = rank_districts_by_updates(load_master_table(processed_dir))
+        print(f"Top districts match: {lazy['district'].astype(str).tolist() == eager['district'].astype(str).tolist()}")
+    except Exception as e:
+        print(f"FAILED Out-of-Core Backend: {e}")
+
     print("\nAll tests completed.")
 
 if __name__ == "__main__":
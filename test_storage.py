@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.feature_engineering import MERGE_KEYS, add_total_columns
+from src.preprocessing.storage import read_master_store, upsert_master_store, write_master_store
+
+pytest.importorskip('pyarrow')
+
+SOURCE_COLUMNS = ['age_0_5', 'age_5_17', 'age_18_greater', 'bio_age_5_17', 'bio_age_17_',
+                  'demo_age_5_17', 'demo_age_17_']
+
+
+def _rows(state, district, pincodes, day, **values):
+    frame = pd.DataFrame({
+        'date': pd.Timestamp(day),
+        'state': state,
+        'district': district,
+        'pincode': [str(p) for p in pincodes],
+    })
+    for col, value in values.items():
+        frame[col] = np.asarray(value, dtype='float64') if np.ndim(value) else float(value)
+    return frame
+
+
+def _master(frame):
+    # Store layout: every source column, then the totals
+    frame = frame.reindex(columns=MERGE_KEYS + SOURCE_COLUMNS, fill_value=0.0)
+    return add_total_columns(frame)
+
+
+def _files(store):
+    found = {}
+    for root, _, names in os.walk(store):
+        for name in names:
+            path = os.path.join(root, name)
+            found[os.path.relpath(path, store)] = os.stat(path).st_mtime_ns
+    return found
+
+
+def _sorted(df):
+    return df.assign(pincode=df['pincode'].astype(str)).sort_values(['date', 'pincode']).reset_index(drop=True)
+
+
+def test_delta_without_a_source_keeps_stored_values(tmp_path):
+    store = str(tmp_path / 'store')
+    write_master_store(_master(_rows('Bihar', 'Patna', [1, 2], '2025-01-05', age_0_5=[1, 2], age_5_17=[3, 4],
+                                     bio_age_5_17=[5, 6])), store)
+
+    # Enrolment corrected for pincode 1 (no biometric columns), biometric only for 2 (enrolment NaN), a new key 3
+    delta = pd.concat([
+        _rows('Bihar', 'Patna', [1], '2025-01-05', age_0_5=10, age_5_17=20),
+        _rows('Bihar', 'Patna', [2], '2025-01-05', age_0_5=np.nan, age_5_17=np.nan, bio_age_5_17=60),
+        _rows('Bihar', 'Patna', [3], '2025-01-05', age_0_5=7, age_5_17=0, bio_age_5_17=1),
+    ], ignore_index=True)
+    assert upsert_master_store(delta, store) == 3
+
+    stored = _sorted(read_master_store(store))
+    assert stored['pincode'].tolist() == ['1', '2', '3']
+    assert stored['age_0_5'].tolist() == [10, 2, 7]
+    assert stored['age_5_17'].tolist() == [20, 4, 0]
+    assert stored['bio_age_5_17'].tolist() == [5, 60, 1]
+    # Totals are recomputed from the coalesced values
+    assert stored['total_enrolment'].tolist() == [30, 6, 7]
+    assert stored['total_bio_updates'].tolist() == [5, 60, 1]
+
+
+def test_only_the_delta_partitions_are_rewritten(tmp_path):
+    store = str(tmp_path / 'store')
+    base = pd.concat([
+        _rows('Bihar', 'Patna', [1], '2025-01-05', age_0_5=1, age_5_17=1, bio_age_5_17=1),
+        _rows('Bihar', 'Patna', [1], '2025-02-05', age_0_5=2, age_5_17=2, bio_age_5_17=2),
+        _rows('Kerala', 'Kollam', [9], '2025-01-05', age_0_5=3, age_5_17=3, bio_age_5_17=3),
+        _rows('Kerala', 'Kollam', [9], '2025-02-05', age_0_5=4, age_5_17=4, bio_age_5_17=4),
+    ], ignore_index=True)
+    write_master_store(_master(base), store)
+    before = _files(store)
+
+    # (Bihar, 2025-01) and (Kerala, 2025-02): the read covers all four partitions, the rewrite only these two
+    delta = pd.concat([
+        _rows('Bihar', 'Patna', [1], '2025-01-05', age_0_5=10, age_5_17=10, bio_age_5_17=10),
+        _rows('Kerala', 'Kollam', [9], '2025-02-05', age_0_5=40, age_5_17=40, bio_age_5_17=40),
+    ], ignore_index=True)
+    upsert_master_store(delta, store)
+    after = _files(store)
+
+    untouched = [path for path in before if 'state=Bihar/month=2025-02' in path or 'state=Kerala/month=2025-01' in path]
+    assert len(untouched) == 2
+    assert all(after.get(path) == before[path] for path in untouched)
+
+    stored = read_master_store(store).sort_values(['state', 'date'])
+    assert stored['age_0_5'].tolist() == [10, 2, 3, 40]
+    assert len(stored) == 4